@@ -4,14 +4,14 @@ Web4AI Orchestrator-Node Integration Test Script
 This script verifies that the orchestrator and nodes are working together correctly.
 """
 
-import requests
+import aiohttp
+import asyncio
 import json
 import time
 import sys
 import argparse
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
-import threading
 import logging
 
 # Configure logging
@@ -27,130 +27,169 @@ class IntegrationTester:
         self.node_urls = node_urls or ["http://localhost:5000"]
         self.test_results = []
         self.test_start_time = time.time()
+        self.session = None
+    
+    async def _run(self) -> bool:
+        """Run the suite on one shared HTTP session"""
+        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=5)) as session:
+            self.session = session
+            try:
+                return await self.run_all_tests()
+            finally:
+                self.session = None
+    
+    async def _request(self, method: str, url: str, **kwargs) -> Tuple[int, Any]:
+        """Send a request on the shared session and return (status code, decoded JSON or None)"""
+        async with self.session.request(method, url, **kwargs) as response:
+            try:
+                data = await response.json(content_type=None)
+            except ValueError:
+                data = None
+            return response.status, data
         
-    def run_all_tests(self) -> bool:
+    async def run_all_tests(self) -> bool:
         """Run complete integration test suite"""
         print("🧪 Starting Web4AI Orchestrator-Node Integration Tests")
         print("=" * 60)
         
+        # (name, test, parallel): read-only tests run concurrently, stateful ones afterwards in order
         tests = [
-            ("Orchestrator Health Check", self.test_orchestrator_health),
-            ("Node Health Checks", self.test_nodes_health),
-            ("Node Registration", self.test_node_registration),
-            ("Heartbeat Monitoring", self.test_heartbeat_monitoring),
-            ("Task Submission", self.test_task_submission),
-            ("Load Balancing", self.test_load_balancing),
-            ("Network Topology", self.test_network_topology),
-            ("Performance Metrics", self.test_performance_metrics),
-            ("Error Handling", self.test_error_handling),
-            ("Concurrent Operations", self.test_concurrent_operations)
+            ("Orchestrator Health Check", self.test_orchestrator_health, True),
+            ("Node Health Checks", self.test_nodes_health, True),
+            ("Node Registration", self.test_node_registration, True),
+            ("Heartbeat Monitoring", self.test_heartbeat_monitoring, False),
+            ("Task Submission", self.test_task_submission, False),
+            ("Load Balancing", self.test_load_balancing, True),
+            ("Network Topology", self.test_network_topology, True),
+            ("Performance Metrics", self.test_performance_metrics, True),
+            ("Error Handling", self.test_error_handling, True),
+            ("Concurrent Operations", self.test_concurrent_operations, True)
         ]
         
-        passed_tests = 0
-        total_tests = len(tests)
+        self._results_lock = asyncio.Lock()
+        first_result = len(self.test_results)
         
-        for test_name, test_func in tests:
-            print(f"\n🔍 Running: {test_name}")
-            print("-" * 40)
-            
-            try:
-                result = test_func()
-                if result:
-                    print(f"✅ PASSED: {test_name}")
-                    passed_tests += 1
-                else:
-                    print(f"❌ FAILED: {test_name}")
-                    
-                self.test_results.append({
-                    'test_name': test_name,
-                    'passed': result,
-                    'timestamp': datetime.now().isoformat()
-                })
-                
-            except Exception as e:
-                print(f"💥 ERROR: {test_name} - {str(e)}")
-                self.test_results.append({
-                    'test_name': test_name,
-                    'passed': False,
-                    'error': str(e),
-                    'timestamp': datetime.now().isoformat()
-                })
+        await asyncio.gather(*[self._run_one(name, func) for name, func, parallel in tests if parallel])
+        for test_name, test_func, parallel in tests:
+            if not parallel:
+                await self._run_one(test_name, test_func)
+        
+        passed_tests = sum(1 for result in self.test_results[first_result:] if result['passed'])
+        total_tests = len(tests)
         
         # Print final results
         self.print_final_results(passed_tests, total_tests)
         
         return passed_tests == total_tests
     
-    def test_orchestrator_health(self) -> bool:
+    async def _run_one(self, test_name: str, test_func) -> bool:
+        """Run one test, report it and record its result"""
+        print(f"\n🔍 Running: {test_name}")
+        print("-" * 40)
+        
+        try:
+            result = await test_func()
+            if result:
+                print(f"✅ PASSED: {test_name}")
+            else:
+                print(f"❌ FAILED: {test_name}")
+            entry = {
+                'test_name': test_name,
+                'passed': result,
+                'timestamp': datetime.now().isoformat()
+            }
+            
+        except Exception as e:
+            print(f"💥 ERROR: {test_name} - {str(e)}")
+            result = False
+            entry = {
+                'test_name': test_name,
+                'passed': False,
+                'error': str(e),
+                'timestamp': datetime.now().isoformat()
+            }
+        
+        async with self._results_lock:
+            self.test_results.append(entry)
+        return bool(result)
+    
+    async def test_orchestrator_health(self) -> bool:
         """Test orchestrator health and basic functionality"""
         try:
             # Test health endpoint
-            response = requests.get(f"{self.orchestrator_url}/api/v1/health", timeout=5)
-            if response.status_code != 200:
-                print(f"❌ Health check failed: {response.status_code}")
+            status_code, health_data = await self._request('GET', f"{self.orchestrator_url}/api/v1/health")
+            if status_code != 200:
+                print(f"❌ Health check failed: {status_code}")
                 return False
             
-            health_data = response.json()
-            if health_data.get('status') != 'healthy':
+            if (health_data or {}).get('status') != 'healthy':
                 print(f"❌ Orchestrator not healthy: {health_data}")
                 return False
             
             print(f"✅ Orchestrator healthy: {health_data.get('orchestrator_id')}")
             
             # Test status endpoint
-            response = requests.get(f"{self.orchestrator_url}/api/v1/status", timeout=5)
-            if response.status_code == 200:
-                status_data = response.json()
-                print(f"✅ Status endpoint working: {status_data.get('success', False)}")
+            status_code, status_data = await self._request('GET', f"{self.orchestrator_url}/api/v1/status")
+            if status_code == 200:
+                print(f"✅ Status endpoint working: {(status_data or {}).get('success', False)}")
                 return True
             else:
-                print(f"⚠️ Status endpoint issues: {response.status_code}")
+                print(f"⚠️ Status endpoint issues: {status_code}")
                 return True  # Health is more important than status
                 
-        except requests.exceptions.ConnectionError:
+        except aiohttp.ClientConnectionError:
             print(f"❌ Cannot connect to orchestrator at {self.orchestrator_url}")
             return False
         except Exception as e:
             print(f"❌ Orchestrator health test error: {e}")
             return False
     
-    def test_nodes_health(self) -> bool:
+    async def test_nodes_health(self) -> bool:
         """Test all nodes for health and basic functionality"""
-        healthy_nodes = 0
-        
-        for i, node_url in enumerate(self.node_urls):
-            try:
-                print(f"  Testing node {i+1}: {node_url}")
-                
-                # Test basic health
-                response = requests.get(f"{node_url}/api/v3/agents", timeout=5)
-                if response.status_code == 200:
-                    print(f"  ✅ Node {i+1} responding")
-                    healthy_nodes += 1
-                else:
-                    print(f"  ❌ Node {i+1} health check failed: {response.status_code}")
-                    
-            except requests.exceptions.ConnectionError:
-                print(f"  ❌ Cannot connect to node {i+1} at {node_url}")
-            except Exception as e:
-                print(f"  ❌ Node {i+1} test error: {e}")
+        # Probe every node at once; wall time is the slowest node, not the sum
+        results = await asyncio.gather(
+            *[self._probe_node(i, node_url) for i, node_url in enumerate(self.node_urls)],
+            return_exceptions=True
+        )
+        healthy_nodes = sum(1 for result in results if result is True)
         
         success_rate = healthy_nodes / len(self.node_urls)
         print(f"✅ Healthy nodes: {healthy_nodes}/{len(self.node_urls)} ({success_rate:.1%})")
         
         return success_rate >= 0.5  # At least 50% of nodes should be healthy
     
-    def test_node_registration(self) -> bool:
+    async def _probe_node(self, i: int, node_url: str) -> bool:
+        """Check that a single node responds"""
+        try:
+            print(f"  Testing node {i+1}: {node_url}")
+            
+            # Test basic health
+            status_code, _ = await self._request('GET', f"{node_url}/api/v3/agents")
+            if status_code == 200:
+                print(f"  ✅ Node {i+1} responding")
+                return True
+            
+            print(f"  ❌ Node {i+1} health check failed: {status_code}")
+                
+        except aiohttp.ClientConnectionError:
+            print(f"  ❌ Cannot connect to node {i+1} at {node_url}")
+        except Exception as e:
+            print(f"  ❌ Node {i+1} test error: {e}")
+        
+        return False
+    
+    async def test_node_registration(self) -> bool:
         """Test node registration with orchestrator"""
         try:
             # Get registered nodes
-            response = requests.get(f"{self.orchestrator_url}/api/v1/nodes", timeout=10)
-            if response.status_code != 200:
-                print(f"❌ Cannot get nodes list: {response.status_code}")
+            status_code, nodes_data = await self._request(
+                'GET', f"{self.orchestrator_url}/api/v1/nodes", timeout=aiohttp.ClientTimeout(total=10)
+            )
+            if status_code != 200:
+                print(f"❌ Cannot get nodes list: {status_code}")
                 return False
             
-            nodes_data = response.json()
-            if not nodes_data.get('success', False):
+            if not nodes_data or not nodes_data.get('success', False):
                 print(f"❌ Nodes request failed: {nodes_data.get('error')}")
                 return False
             
@@ -171,32 +210,38 @@ class IntegrationTester:
             print(f"❌ Node registration test error: {e}")
             return False
     
-    def test_heartbeat_monitoring(self) -> bool:
+    async def test_heartbeat_monitoring(self) -> bool:
         """Test heartbeat functionality"""
         try:
             print("  🔄 Testing heartbeat monitoring...")
             
             # Get initial status
-            response = requests.get(f"{self.orchestrator_url}/api/v1/status", timeout=5)
-            if response.status_code != 200:
-                print(f"❌ Cannot get orchestrator status: {response.status_code}")
+            status_code, initial_status = await self._request('GET', f"{self.orchestrator_url}/api/v1/status")
+            if status_code != 200:
+                print(f"❌ Cannot get orchestrator status: {status_code}")
                 return False
             
-            initial_status = response.json()
-            initial_nodes = initial_status.get('data', {}).get('nodes', {})
+            initial_nodes = (initial_status or {}).get('data', {}).get('nodes', {})
             
             if not initial_nodes:
                 print("⚠️ No nodes found for heartbeat test")
                 return False
             
-            # Wait for heartbeat cycle
-            print("  ⏳ Waiting for heartbeat cycle (35 seconds)...")
-            time.sleep(35)
+            # Poll until any node's heartbeat advances, for at most one 35 second heartbeat cycle
+            print("  ⏳ Waiting for heartbeat cycle (up to 35 seconds)...")
+            initial_heartbeats = {node_id: node.get('last_heartbeat') for node_id, node in initial_nodes.items()}
+            updated_nodes = initial_nodes
             
-            # Check updated status
-            response = requests.get(f"{self.orchestrator_url}/api/v1/status", timeout=5)
-            updated_status = response.json()
-            updated_nodes = updated_status.get('data', {}).get('nodes', {})
+            for _ in range(35):
+                await asyncio.sleep(1)
+                status_code, updated_status = await self._request('GET', f"{self.orchestrator_url}/api/v1/status")
+                if status_code != 200:
+                    continue
+                
+                updated_nodes = (updated_status or {}).get('data', {}).get('nodes', {})
+                if any(updated_nodes.get(node_id, {}).get('last_heartbeat') != heartbeat
+                       for node_id, heartbeat in initial_heartbeats.items()):
+                    break
             
             # Verify heartbeats are working
             active_nodes = sum(1 for node in updated_nodes.values() 
@@ -210,7 +255,7 @@ class IntegrationTester:
             print(f"❌ Heartbeat test error: {e}")
             return False
     
-    def test_task_submission(self) -> bool:
+    async def test_task_submission(self) -> bool:
         """Test task submission and routing"""
         try:
             print("  📋 Testing task submission...")
@@ -229,14 +274,15 @@ class IntegrationTester:
                 "timeout": 30.0
             }
             
-            response = requests.post(
+            status_code, result = await self._request(
+                'POST',
                 f"{self.orchestrator_url}/api/v1/tasks",
                 json=test_task,
-                timeout=10
+                timeout=aiohttp.ClientTimeout(total=10)
             )
             
-            if response.status_code == 200:
-                result = response.json()
+            if status_code == 200:
+                result = result or {}
                 if result.get('success', False):
                     task_id = result.get('task_id')
                     print(f"✅ Task submitted successfully: {task_id}")
@@ -245,26 +291,25 @@ class IntegrationTester:
                     print(f"❌ Task submission failed: {result.get('error')}")
                     return False
             else:
-                print(f"❌ Task submission HTTP error: {response.status_code}")
+                print(f"❌ Task submission HTTP error: {status_code}")
                 return False
                 
         except Exception as e:
             print(f"❌ Task submission test error: {e}")
             return False
     
-    def test_load_balancing(self) -> bool:
+    async def test_load_balancing(self) -> bool:
         """Test load balancing functionality"""
         try:
             print("  ⚖️ Testing load balancing...")
             
             # Get node load information
-            response = requests.get(f"{self.orchestrator_url}/api/v1/nodes", timeout=5)
-            if response.status_code != 200:
+            status_code, nodes_data = await self._request('GET', f"{self.orchestrator_url}/api/v1/nodes")
+            if status_code != 200:
                 print(f"❌ Cannot get nodes for load balancing test")
                 return False
             
-            nodes_data = response.json()
-            nodes = nodes_data.get('nodes', {})
+            nodes = (nodes_data or {}).get('nodes', {})
             
             if len(nodes) < 2:
                 print("⚠️ Need at least 2 nodes for load balancing test")
@@ -287,18 +332,17 @@ class IntegrationTester:
             print(f"❌ Load balancing test error: {e}")
             return False
     
-    def test_network_topology(self) -> bool:
+    async def test_network_topology(self) -> bool:
         """Test network topology and node connectivity"""
         try:
             print("  🌐 Testing network topology...")
             
             # Get network status
-            response = requests.get(f"{self.orchestrator_url}/api/v1/status", timeout=5)
-            if response.status_code != 200:
+            status_code, status_data = await self._request('GET', f"{self.orchestrator_url}/api/v1/status")
+            if status_code != 200:
                 return False
             
-            status_data = response.json()
-            network_data = status_data.get('data', {})
+            network_data = (status_data or {}).get('data', {})
             
             # Check network metrics
             network_metrics = network_data.get('network_metrics', {})
@@ -321,16 +365,16 @@ class IntegrationTester:
             print(f"❌ Network topology test error: {e}")
             return False
     
-    def test_performance_metrics(self) -> bool:
+    async def test_performance_metrics(self) -> bool:
         """Test performance metrics collection"""
         try:
             print("  📈 Testing performance metrics...")
             
             # Try to get performance metrics
-            response = requests.get(f"{self.orchestrator_url}/api/v1/metrics/performance", timeout=5)
+            status_code, metrics = await self._request('GET', f"{self.orchestrator_url}/api/v1/metrics/performance")
             
-            if response.status_code == 200:
-                metrics = response.json()
+            if status_code == 200:
+                metrics = metrics or {}
                 if metrics.get('success', False):
                     perf_data = metrics.get('performance', {})
                     
@@ -354,56 +398,48 @@ class IntegrationTester:
             print(f"⚠️ Performance metrics test warning: {e}")
             return True  # Not critical for basic functionality
     
-    def test_error_handling(self) -> bool:
+    async def test_error_handling(self) -> bool:
         """Test error handling and recovery"""
         try:
             print("  🛡️ Testing error handling...")
             
             # Test invalid task submission
             invalid_task = {"invalid": "task"}
-            response = requests.post(
+            status_code, _ = await self._request(
+                'POST',
                 f"{self.orchestrator_url}/api/v1/tasks",
-                json=invalid_task,
-                timeout=5
+                json=invalid_task
             )
             
             # Should return error but not crash
-            if response.status_code in [400, 422]:
+            if status_code in [400, 422]:
                 print("✅ Invalid task properly rejected")
                 return True
-            elif response.status_code == 500:
+            elif status_code == 500:
                 print("⚠️ Server error on invalid task (not ideal but not critical)")
                 return True
             else:
-                print(f"❌ Unexpected response to invalid task: {response.status_code}")
+                print(f"❌ Unexpected response to invalid task: {status_code}")
                 return False
                 
         except Exception as e:
             print(f"❌ Error handling test error: {e}")
             return False
     
-    def test_concurrent_operations(self) -> bool:
+    async def test_concurrent_operations(self) -> bool:
         """Test concurrent operations"""
         try:
             print("  🔀 Testing concurrent operations...")
             
-            # Create multiple threads for concurrent requests
-            def make_request():
+            # Issue several requests concurrently on the shared session
+            async def make_request():
                 try:
-                    response = requests.get(f"{self.orchestrator_url}/api/v1/health", timeout=5)
-                    return response.status_code == 200
-                except:
+                    status_code, _ = await self._request('GET', f"{self.orchestrator_url}/api/v1/health")
+                    return status_code == 200
+                except Exception:
                     return False
             
-            threads = []
-            for i in range(5):
-                thread = threading.Thread(target=make_request)
-                threads.append(thread)
-                thread.start()
-            
-            # Wait for all threads
-            for thread in threads:
-                thread.join(timeout=10)
+            await asyncio.gather(*[make_request() for _ in range(5)])
             
             print("✅ Concurrent operations completed")
             return True
@@ -479,7 +515,7 @@ def main():
     tester = IntegrationTester(args.orchestrator, args.nodes)
     
     try:
-        success = tester.run_all_tests()
+        success = asyncio.run(tester._run())
         exit_code = 0 if success else 1
         sys.exit(exit_code)
     except KeyboardInterrupt:
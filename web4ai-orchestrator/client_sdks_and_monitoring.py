@@ -8,8 +8,11 @@ import requests
 import json
 import time
 import asyncio
+import threading
+import concurrent.futures
 import websockets
 from typing import Dict, Any, List, Optional, Callable, Union
+from collections import Counter
 from dataclasses import dataclass
 from enum import Enum
 import logging
@@ -87,6 +90,53 @@ class Web4AIClient:
         
         if api_key:
             self.session.headers['Authorization'] = f'Bearer {api_key}'
+        
+        # Shared background event loop for async work, started on first use
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        self._loop_lock = threading.Lock()
+    
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """Start the client's background event loop if it isn't running yet"""
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._loop_thread = threading.Thread(
+                    target=self._loop.run_forever,
+                    name="web4ai-client-loop",
+                    daemon=True
+                )
+                self._loop_thread.start()
+            return self._loop
+    
+    def _submit_coro(self, coro) -> concurrent.futures.Future:
+        """Schedule a coroutine on the background loop without waiting"""
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+    
+    def _run_coro(self, coro, timeout: Optional[float] = None) -> Any:
+        """Run a coroutine on the background loop and wait for its result"""
+        return self._submit_coro(coro).result(timeout)
+    
+    def close(self):
+        """Stop the background event loop and close the HTTP session"""
+        with self._loop_lock:
+            loop, thread = self._loop, self._loop_thread
+            self._loop, self._loop_thread = None, None
+        
+        if loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
+            if thread is not threading.current_thread():
+                thread.join(timeout=5)
+            if not loop.is_running():
+                loop.close()
+        
+        self.session.close()
+    
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
     
     def _request(self, method: str, endpoint: str, data: Dict = None, 
                 params: Dict = None) -> Dict[str, Any]:
@@ -265,6 +315,30 @@ class Web4AIClient:
             
             time.sleep(poll_interval)
     
+    async def wait_for_task_async(self, task_id: str,
+                                  timeout: Optional[int] = None,
+                                  poll_interval: float = 2.0) -> TaskResult:
+        """
+        Async variant of wait_for_task that doesn't block the event loop
+        
+        Status polls run in the loop's default executor so the shared
+        background loop stays free for WebSocket traffic.
+        """
+        loop = asyncio.get_running_loop()
+        start_time = time.time()
+        
+        while True:
+            task = await loop.run_in_executor(None, self.get_task, task_id)
+            
+            if task.status in [TaskStatus.COMPLETED, TaskStatus.FAILED, 
+                              TaskStatus.CANCELLED, TaskStatus.TIMEOUT]:
+                return task
+            
+            if timeout and (time.time() - start_time) > timeout:
+                raise TimeoutError(f"Task {task_id} did not complete within {timeout} seconds")
+            
+            await asyncio.sleep(poll_interval)
+    
     def submit_and_wait(self, task_type: str, input_data: Any, 
                        **kwargs) -> TaskResult:
         """Submit task and wait for completion"""
@@ -279,6 +353,10 @@ class Web4AIClient:
         """Get performance analysis and recommendations"""
         return self._request('GET', '/metrics/performance')
     
+    def get_dashboard_snapshot(self) -> Dict[str, Any]:
+        """Get status, metrics, nodes and tasks in a single request"""
+        return self._request('GET', '/dashboard/snapshot')
+    
     def get_config(self) -> Dict[str, Any]:
         """Get orchestrator configuration"""
         return self._request('GET', '/config')
@@ -300,7 +378,8 @@ class Web4AIClient:
         """
         if not websocket_url:
             # Get WebSocket URL from API
-            ws_info = self._request('GET', '/websocket/info')
+            loop = asyncio.get_running_loop()
+            ws_info = await loop.run_in_executor(None, self._request, 'GET', '/websocket/info')
             websocket_url = ws_info['websocket']['url']
         
         async with websockets.connect(websocket_url) as websocket:
@@ -312,6 +391,18 @@ class Web4AIClient:
                     event_handler(event)
                 except Exception as e:
                     logger.error(f"Error handling WebSocket event: {e}")
+    
+    def subscribe_in_background(self,
+                                event_handler: Callable[[Dict], None],
+                                websocket_url: Optional[str] = None) -> concurrent.futures.Future:
+        """
+        Subscribe to events from synchronous code
+        
+        Runs subscribe_to_events on the client's shared background loop
+        instead of spinning up a fresh loop per call. Cancel the returned
+        future to unsubscribe.
+        """
+        return self._submit_coro(self.subscribe_to_events(event_handler, websocket_url))
 
 # Batch operations helper
 class BatchTaskManager:
@@ -345,14 +436,9 @@ class BatchTaskManager:
     
     def get_status_summary(self) -> Dict[str, int]:
         """Get summary of task statuses"""
-        summary = {}
-        
-        for task_id in self.tasks:
-            task = self.client.get_task(task_id)
-            status = task.status.value
-            summary[status] = summary.get(status, 0) + 1
-        
-        return summary
+        return dict(Counter(
+            self.client.get_task(task_id).status.value for task_id in self.tasks
+        ))
 
 # Example usage and testing
 def example_usage():
@@ -425,6 +511,12 @@ def example_usage():
     
     # Run WebSocket listener (in async context)
     # asyncio.run(handle_events())
+    
+    # Or from synchronous code, on the client's shared background loop
+    # subscription = client.subscribe_in_background(lambda e: print(e['type']))
+    # subscription.cancel()
+    
+    client.close()
 
 if __name__ == "__main__":
     example_usage()
@@ -460,6 +552,8 @@ class OrchestratorMonitor:
         self.metrics_history = []
         self.event_queue = queue.Queue()
         self.ws_thread = None
+        self.ws_future = None
+        self._loop = None
         self.running = False
     
     def get_status(self) -> Dict[str, Any]:
@@ -502,39 +596,66 @@ class OrchestratorMonitor:
             st.error(f"Failed to get tasks: {e}")
             return {}
     
+    def get_dashboard_snapshot(self) -> Dict[str, Any]:
+        """Get status, metrics, nodes and tasks in one round trip"""
+        try:
+            response = requests.get(f"{self.api_url}/dashboard/snapshot", timeout=5)
+            if response.status_code == 404:
+                # Older orchestrators don't serve the snapshot endpoint
+                return {
+                    'status': self.get_status(),
+                    'metrics': self.get_metrics(),
+                    'nodes': self.get_nodes(),
+                    'tasks': self.get_tasks()
+                }
+            response.raise_for_status()
+            return response.json()
+        except requests.RequestException as e:
+            st.error(f"Failed to get dashboard snapshot: {e}")
+            return {}
+    
     def start_websocket_monitoring(self):
-        """Start WebSocket monitoring in background thread"""
-        if self.ws_thread and self.ws_thread.is_alive():
+        """Start WebSocket monitoring on the background event loop"""
+        if self.ws_future and not self.ws_future.done():
             return
         
+        # One loop thread per monitor; reconnects reuse it
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+            self.ws_thread = threading.Thread(
+                target=self._loop.run_forever,
+                name="orchestrator-monitor-loop",
+                daemon=True
+            )
+            self.ws_thread.start()
+        
         self.running = True
-        self.ws_thread = threading.Thread(target=self._websocket_worker, daemon=True)
-        self.ws_thread.start()
+        self.ws_future = asyncio.run_coroutine_threadsafe(self._websocket_handler(), self._loop)
     
-    def _websocket_worker(self):
-        """WebSocket worker thread"""
-        async def websocket_handler():
-            try:
-                # Get WebSocket URL
-                ws_info = requests.get(f"{self.api_url}/websocket/info").json()
-                ws_url = ws_info['websocket']['url']
-                
-                async with websockets.connect(ws_url) as websocket:
-                    while self.running:
-                        message = await websocket.recv()
-                        event = json.loads(message)
-                        self.event_queue.put(event)
-                        
-            except Exception as e:
-                print(f"WebSocket error: {e}")
-        
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        loop.run_until_complete(websocket_handler())
+    async def _websocket_handler(self):
+        """Receive WebSocket events into the event queue"""
+        try:
+            # Get WebSocket URL
+            loop = asyncio.get_running_loop()
+            ws_info = await loop.run_in_executor(
+                None, lambda: requests.get(f"{self.api_url}/websocket/info").json()
+            )
+            ws_url = ws_info['websocket']['url']
+            
+            async with websockets.connect(ws_url) as websocket:
+                while self.running:
+                    message = await websocket.recv()
+                    event = json.loads(message)
+                    self.event_queue.put(event)
+                    
+        except Exception as e:
+            print(f"WebSocket error: {e}")
     
     def stop_monitoring(self):
         """Stop WebSocket monitoring"""
         self.running = False
+        if self.ws_future:
+            self.ws_future.cancel()
 
 def create_dashboard():
     """Create Streamlit dashboard"""
@@ -567,10 +688,11 @@ def create_dashboard():
     col1, col2, col3, col4 = st.columns(4)
     
     # Get current data
-    status_data = st.session_state.monitor.get_status()
-    metrics_data = st.session_state.monitor.get_metrics()
-    nodes_data = st.session_state.monitor.get_nodes()
-    tasks_data = st.session_state.monitor.get_tasks()
+    snapshot = st.session_state.monitor.get_dashboard_snapshot()
+    status_data = snapshot.get('status', {})
+    metrics_data = snapshot.get('metrics', {})
+    nodes_data = snapshot.get('nodes', {})
+    tasks_data = snapshot.get('tasks', {})
     
     if not status_data.get('success'):
         st.error("⚠️ Unable to connect to orchestrator")
@@ -682,18 +804,26 @@ def create_dashboard():
     st.header("🖥️ Node Status")
     
     if nodes_data.get('success') and nodes_data.get('nodes'):
-        nodes = []
-        for node_id, node_info in nodes_data['nodes'].items():
-            nodes.append({
-                'Node ID': node_id,
-                'Status': node_info['status'],
-                'CPU %': f"{node_info['cpu_usage']:.1f}%",
-                'Memory %': f"{node_info['memory_usage']:.1f}%",
-                'Load Score': f"{node_info['load_score']:.2f}",
-                'Agents': node_info['agents_count']
-            })
+        node_ids = list(nodes_data['nodes'])
+        node_infos = nodes_data['nodes'].values()
+        columns = {
+            'Status': [n['status'] for n in node_infos],
+            'CPU %': [f"{n['cpu_usage']:.1f}%" for n in node_infos],
+            'Memory %': [f"{n['memory_usage']:.1f}%" for n in node_infos],
+            'Load Score': [f"{n['load_score']:.2f}" for n in node_infos],
+            'Agents': [n['agents_count'] for n in node_infos]
+        }
+        
+        # Build the node table once and refresh its columns in place
+        # while the node set is unchanged
+        df_nodes = st.session_state.get('df_nodes')
+        if df_nodes is None or df_nodes['Node ID'].tolist() != node_ids:
+            df_nodes = pd.DataFrame({'Node ID': node_ids, **columns})
+            st.session_state.df_nodes = df_nodes
+        else:
+            for column, values in columns.items():
+                df_nodes[column] = values
         
-        df_nodes = pd.DataFrame(nodes)
         st.dataframe(df_nodes, use_container_width=True)
         
         # Node resource utilization chart
@@ -760,19 +890,17 @@ def create_dashboard():
     
     # Performance recommendations
     if metrics_data.get('success'):
-        perf_data = st.session_state.monitor.get_metrics()
-        if perf_data.get('success'):
-            # This would typically come from /metrics/performance endpoint
-            st.header("💡 Performance Recommendations")
-            
-            recommendations = [
-                "Network utilization is optimal",
-                "All nodes are healthy",
-                "Task distribution is balanced"
-            ]
-            
-            for rec in recommendations:
-                st.success(f"✅ {rec}")
+        # This would typically come from /metrics/performance endpoint
+        st.header("💡 Performance Recommendations")
+        
+        recommendations = [
+            "Network utilization is optimal",
+            "All nodes are healthy",
+            "Task distribution is balanced"
+        ]
+        
+        for rec in recommendations:
+            st.success(f"✅ {rec}")
     
     # Auto refresh
     if auto_refresh:
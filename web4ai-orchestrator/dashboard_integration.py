@@ -1,9 +1,320 @@
 # dashboard_integration.py - Dashboard Integration for Web4AI Orchestrator
 
-from flask import Flask, render_template, send_from_directory, jsonify, request
+from flask import Flask, send_from_directory, request, Response
+from flask.json.provider import DefaultJSONProvider
 import os
-import json
-from datetime import datetime
+import io
+import asyncio
+import csv
+import gzip
+import time
+import logging
+import platform
+import threading
+from enum import Enum
+from functools import wraps
+from itertools import islice
+from datetime import datetime, timezone
+from collections import deque
+from cachetools import TTLCache
+import numpy as np
+import orjson
+import psutil
+from websockets.exceptions import ConnectionClosed
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Export payloads above this size are compressed when the client allows it
+COMPRESS_MIN_BYTES = 1024
+_zstd_compressor = zstandard.ZstdCompressor(level=3) if ZSTD_AVAILABLE else None
+
+# orjson handles dataclasses, datetimes, enums and numpy arrays natively;
+# any naive datetimes are emitted as UTC.
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS
+
+# Pre-encoded responses for routes served before an orchestrator is attached
+_EMPTY_ALERTS = orjson.dumps({'success': True, 'alerts': [], 'total_alerts': 0})
+_EMPTY_NODES = orjson.dumps({'success': True, 'nodes': [], 'total_nodes': 0})
+_EMPTY_TASK_QUEUE = orjson.dumps({
+    'success': True,
+    'queue': {'pending': [], 'active': [], 'recent_completed': [], 'recent_failed': []},
+    'summary': {'pending_count': 0, 'active_count': 0, 'completed_count': 0, 'failed_count': 0}
+})
+
+# UTC timestamps for dashboard series, formatted on a whole-second grid
+_ISO_TEMPLATE = '%Y-%m-%dT%H:%M:%S+00:00'
+_history_timestamps = (None, [])
+
+def history_timestamps(points, step_seconds):
+    """Return oldest-first ISO timestamps ending now, reused within the same second"""
+    global _history_timestamps
+    now = int(time.time())
+    key = (now, points, step_seconds)
+    cached_key, timestamps = _history_timestamps
+    if cached_key != key:
+        timestamps = [
+            time.strftime(_ISO_TEMPLATE, time.gmtime(now - i * step_seconds))
+            for i in range(points - 1, -1, -1)
+        ]
+        _history_timestamps = (key, timestamps)
+    return timestamps
+
+def _json_default(obj):
+    """Fallback for types orjson does not serialize natively"""
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, (set, frozenset, deque)):
+        return list(obj)
+    if hasattr(obj, '__dict__'):
+        return obj.__dict__
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def json_response(payload, status=200):
+    """Build a JSON response from already-assembled payload with orjson"""
+    return Response(
+        orjson.dumps(payload, default=_json_default, option=ORJSON_OPTIONS),
+        status=status,
+        mimetype='application/json'
+    )
+
+def stream_csv(header, rows):
+    """Yield CSV text row by row so large exports are never buffered whole"""
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator='\n')
+    writer.writerow(header)
+    yield buf.getvalue()
+    for row in rows:
+        buf.seek(0)
+        buf.truncate()
+        writer.writerow(row)
+        yield buf.getvalue()
+
+# Short-lived cache of encoded dashboard payloads, shared by all pollers
+RESPONSE_CACHE_TTL = 2.0
+_response_cache = TTLCache(maxsize=16, ttl=RESPONSE_CACHE_TTL)
+_response_cache_lock = threading.Lock()
+_response_compute_locks = {}
+_response_cache_generation = 0
+
+def cached_response(key, ttl=RESPONSE_CACHE_TTL):
+    """Cache a route's orjson-encoded payload under key for ttl seconds
+    
+    The wrapped view returns a plain payload dict (or already-encoded bytes);
+    concurrent polls inside the TTL window are served the same bytes without
+    recomputing it. A miss is computed under a per-key lock, so other routes'
+    cache hits and invalidations never wait on it.
+    """
+    def lookup():
+        with _response_cache_lock:
+            entry = _response_cache.get(key)
+            generation = _response_cache_generation
+        if entry is None or entry[0] <= time.monotonic():
+            return None, generation
+        return entry, generation
+    
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            entry, _ = lookup()
+            if entry is None:
+                with _response_compute_locks.setdefault(key, threading.Lock()):
+                    # Another poller may have filled the entry while we waited
+                    entry, generation = lookup()
+                    if entry is None:
+                        payload = func(*args, **kwargs)
+                        if isinstance(payload, Response):
+                            # Pre-built responses (e.g. early exits) bypass the cache
+                            return payload
+                        if not isinstance(payload, bytes):
+                            payload = orjson.dumps(payload, default=_json_default, option=ORJSON_OPTIONS)
+                        entry = (time.monotonic() + ttl, payload)
+                        with _response_cache_lock:
+                            # Don't store a payload computed before an invalidation
+                            if generation == _response_cache_generation:
+                                _response_cache[key] = entry
+            return Response(entry[1], mimetype='application/json')
+        return wrapper
+    return decorator
+
+def invalidate(key=None):
+    """Drop a cached dashboard payload, or all of them when key is None"""
+    global _response_cache_generation
+    with _response_cache_lock:
+        _response_cache_generation += 1
+        if key is None:
+            _response_cache.clear()
+        else:
+            _response_cache.pop(key, None)
+
+# Node fields fixed at registration, encoded once per NodeInfo instance
+NODE_STATIC_FIELDS = ('node_id', 'host', 'port', 'node_type', 'version', 'location', 'capabilities', 'metadata')
+_node_static_json = {}
+
+# NodeInfo fields included in dashboard exports, in output order
+NODE_EXPORT_FIELDS = (
+    'node_id', 'host', 'port', 'node_type', 'status', 'capabilities', 'agents_count',
+    'cpu_usage', 'memory_usage', 'gpu_usage', 'network_latency', 'last_heartbeat',
+    'version', 'location', 'load_score', 'reliability_score', 'tasks_completed',
+    'tasks_failed', 'uptime', 'metadata'
+)
+
+def export_node(node):
+    """Project a node onto NODE_EXPORT_FIELDS with the status as its plain value"""
+    exported = {field: getattr(node, field) for field in NODE_EXPORT_FIELDS}
+    exported['status'] = node.status_value
+    return exported
+
+def node_static_prefix(node):
+    """Return the node's static fields as an open JSON object ending in a comma
+    
+    Re-registration replaces the NodeInfo instance, which is what triggers a
+    rebuild; the mutable fields are appended per request.
+    """
+    entry = _node_static_json.get(node.node_id)
+    if entry is None or entry[0] is not node:
+        static = orjson.dumps(
+            {field: getattr(node, field) for field in NODE_STATIC_FIELDS},
+            default=_json_default, option=ORJSON_OPTIONS
+        )
+        entry = (node, static[:-1] + b',')
+        _node_static_json[node.node_id] = entry
+    return entry[1]
+
+# Node fields that change after registration, encoded on every request
+NODE_DYNAMIC_FIELDS = tuple(field for field in NODE_EXPORT_FIELDS if field not in NODE_STATIC_FIELDS)
+
+def encode_node(node):
+    """Encode a full node export, reusing the cached static prefix"""
+    dynamic = {field: getattr(node, field) for field in NODE_DYNAMIC_FIELDS}
+    dynamic['status'] = node.status_value
+    return node_static_prefix(node) + orjson.dumps(dynamic, default=_json_default, option=ORJSON_OPTIONS)[1:]
+
+# Pre-built WebSocket envelopes; only the dynamic pieces are appended per message
+_INITIAL_DATA_PREFIX = b'{"type":"initial_data","data":'
+_NODE_DETAILS_PREFIX = b'{"type":"node_details","node_id":'
+_SUBSCRIPTION_CONFIRMED_PREFIX = b'{"type":"subscription_confirmed","subscription":"alerts","timestamp":'
+_INVALID_JSON_PREFIX = b'{"type":"error","message":"Invalid JSON message","timestamp":'
+
+def compress_export_response(response):
+    """Compress large dashboard export bodies with zstd or gzip per Accept-Encoding"""
+    if (not request.path.startswith('/api/v1/dashboard/export')
+            or response.direct_passthrough or response.is_streamed
+            or 'Content-Encoding' in response.headers):
+        return response
+    
+    body = response.get_data()
+    if len(body) < COMPRESS_MIN_BYTES:
+        return response
+    
+    accepted = request.accept_encodings
+    if ZSTD_AVAILABLE and accepted['zstd']:
+        response.set_data(_zstd_compressor.compress(body))
+        response.headers['Content-Encoding'] = 'zstd'
+    elif accepted['gzip']:
+        response.set_data(gzip.compress(body, compresslevel=6))
+        response.headers['Content-Encoding'] = 'gzip'
+    else:
+        return response
+    
+    response.vary.add('Accept-Encoding')
+    return response
+
+def ws_dumps(payload):
+    """Encode a WebSocket message with orjson, as text for browser clients"""
+    return orjson.dumps(payload, default=_json_default, option=ORJSON_OPTIONS).decode()
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson so plain jsonify() calls are fast too"""
+    
+    compact = True
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=_json_default, option=ORJSON_OPTIONS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=_json_default, option=ORJSON_OPTIONS),
+            mimetype=self.mimetype
+        )
+
+class SystemResourceSampler:
+    """Samples host resource usage on a background thread for the dashboard
+    
+    Static platform details are read once; CPU, memory, disk and connection
+    counts are refreshed every interval seconds so requests never block on
+    psutil.
+    """
+    
+    def __init__(self, interval=5.0):
+        self.interval = interval
+        self.static_info = {
+            'platform': platform.system(),
+            'platform_version': platform.version(),
+            'python_version': platform.python_version(),
+            'cpu_count': psutil.cpu_count(),
+            'memory_total': psutil.virtual_memory().total,
+            'disk_total': psutil.disk_usage('/').total,
+            'hostname': platform.node()
+        }
+        self.resources = {
+            'cpu_percent': 0.0,
+            'memory_percent': 0.0,
+            'disk_percent': 0.0,
+            'network_connections': 0
+        }
+        self._lock = threading.Lock()
+        self._thread = None
+    
+    def start(self):
+        """Start the sampling thread if it is not already running"""
+        with self._lock:
+            if self._thread is not None:
+                return
+            # Prime cpu_percent so the first non-blocking reading is meaningful
+            psutil.cpu_percent(interval=None)
+            self._thread = threading.Thread(target=self._run, name='dashboard-system-sampler', daemon=True)
+            self._thread.start()
+    
+    def _run(self):
+        while True:
+            self.sample()
+            time.sleep(self.interval)
+    
+    def sample(self):
+        """Take one resource reading and publish it"""
+        try:
+            try:
+                connections = len(psutil.net_connections())
+            except psutil.AccessDenied:
+                connections = 0
+            
+            resources = {
+                'cpu_percent': psutil.cpu_percent(interval=None),
+                'memory_percent': psutil.virtual_memory().percent,
+                'disk_percent': psutil.disk_usage('/').percent,
+                'network_connections': connections
+            }
+            with self._lock:
+                self.resources = resources
+        except Exception as e:
+            logger.error(f"System resource sampling failed: {e}")
+    
+    def snapshot(self):
+        """Return the static info and the latest resource sample"""
+        with self._lock:
+            return self.static_info, self.resources
+
+_system_sampler = SystemResourceSampler()
 
 def setup_dashboard_routes(app, orchestrator_instance):
     """
@@ -11,6 +322,28 @@ def setup_dashboard_routes(app, orchestrator_instance):
     Add this to your orchestrator_api.py file
     """
     
+    # Route any remaining jsonify() calls through orjson, always compact
+    # (no OPT_INDENT_2) regardless of debug mode
+    app.config['JSONIFY_PRETTYPRINT_REGULAR'] = False
+    app.json_provider_class = OrjsonProvider
+    app.json = OrjsonProvider(app)
+    
+    # Drop cached node payloads whenever the network topology changes; plain
+    # heartbeats don't notify and are picked up when the short TTL expires
+    if orchestrator_instance is not None:
+        def on_state_change(event_type, data):
+            if event_type == 'node_unregistered':
+                _node_static_json.pop(data.get('node_id'), None)
+            invalidate()
+        
+        orchestrator_instance.add_state_listener(on_state_change)
+    
+    # Large exports go out compressed
+    app.after_request(compress_export_response)
+    
+    # Host metrics for /system/info are sampled in the background
+    _system_sampler.start()
+    
     # Configure template directory
     template_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')
     app.template_folder = template_dir
@@ -19,12 +352,15 @@ def setup_dashboard_routes(app, orchestrator_instance):
     @app.route('/dashboard')
     def dashboard():
         """Serve the advanced dashboard"""
-        return render_template('web4ai_advanced_dashboard.html')
+        # The dashboard is static HTML: serve it with ETag/Last-Modified
+        # so browser refreshes get a 304 instead of a re-render
+        return send_from_directory(template_dir, 'web4ai_advanced_dashboard.html',
+                                   conditional=True, max_age=300)
     
     @app.route('/api/v1/dashboard/config')
     def dashboard_config():
         """Provide dashboard configuration"""
-        return jsonify({
+        return json_response({
             'success': True,
             'config': {
                 'orchestrator_url': request.host_url.rstrip('/'),
@@ -38,164 +374,123 @@ def setup_dashboard_routes(app, orchestrator_instance):
     @app.route('/api/v1/dashboard/alerts')
     def dashboard_alerts():
         """Get active alerts for dashboard"""
-        alerts = []
-        
-        if orchestrator_instance:
-            # Check for system alerts
-            network_metrics = orchestrator_instance.network_metrics
-            
-            # No active nodes alert
-            if network_metrics.get('active_nodes', 0) == 0:
-                alerts.append({
-                    'id': 'no_nodes',
-                    'type': 'critical',
-                    'title': 'No Active Nodes',
-                    'message': 'No nodes are currently active in the network',
-                    'timestamp': datetime.utcnow().isoformat(),
-                    'severity': 'critical'
-                })
-            
-            # Low success rate alert
-            success_rate = network_metrics.get('success_rate', 1.0)
-            if success_rate < 0.9:
-                alerts.append({
-                    'id': 'low_success_rate',
-                    'type': 'warning',
-                    'title': 'Low Success Rate',
-                    'message': f'Task success rate is {success_rate:.1%}',
-                    'timestamp': datetime.utcnow().isoformat(),
-                    'severity': 'warning'
-                })
-            
-            # High response time alert
-            avg_response_time = network_metrics.get('average_response_time', 0)
-            if avg_response_time > 5000:  # 5 seconds
-                alerts.append({
-                    'id': 'high_response_time',
-                    'type': 'warning',
-                    'title': 'High Response Time',
-                    'message': f'Average response time is {avg_response_time:.0f}ms',
-                    'timestamp': datetime.utcnow().isoformat(),
-                    'severity': 'warning'
-                })
-            
-            # High utilization alert
-            utilization = network_metrics.get('network_utilization', 0)
-            if utilization > 0.85:
-                alerts.append({
-                    'id': 'high_utilization',
-                    'type': 'warning',
-                    'title': 'High Network Utilization',
-                    'message': f'Network utilization is {utilization:.1%}',
-                    'timestamp': datetime.utcnow().isoformat(),
-                    'severity': 'warning'
-                })
+        if orchestrator_instance is None:
+            return Response(_EMPTY_ALERTS, mimetype='application/json')
         
-        return jsonify({
-            'success': True,
-            'alerts': alerts,
-            'total_alerts': len(alerts)
-        })
+        # Alerts are evaluated by the orchestrator whenever its metrics update
+        return Response(orchestrator_instance.alerts_payload, mimetype='application/json')
     
     @app.route('/api/v1/dashboard/nodes/detailed')
+    @cached_response('nodes_detailed')
     def dashboard_nodes_detailed():
         """Get detailed node information for dashboard"""
-        nodes_data = []
+        if orchestrator_instance is None:
+            return Response(_EMPTY_NODES, mimetype='application/json')
         
-        if orchestrator_instance:
-            for node_id, node in orchestrator_instance.nodes.items():
-                # Get agents for this node
-                agents = []
-                for agent_id in orchestrator_instance.node_agents.get(node_id, []):
-                    if agent_id in orchestrator_instance.agents:
-                        agent = orchestrator_instance.agents[agent_id]
-                        agents.append({
-                            'agent_id': agent.agent_id,
-                            'agent_type': agent.agent_type,
-                            'status': agent.status,
-                            'capabilities': agent.capabilities,
-                            'tasks_running': agent.tasks_running,
-                            'tasks_completed': agent.tasks_completed,
-                            'efficiency_score': agent.efficiency_score,
-                            'last_activity': agent.last_activity
-                        })
-                
-                # Calculate uptime
-                current_time = time.time()
-                uptime_hours = (current_time - node.last_heartbeat) / 3600 if node.last_heartbeat else 0
-                
-                nodes_data.append({
-                    'node_id': node.node_id,
-                    'host': node.host,
-                    'port': node.port,
-                    'node_type': node.node_type,
-                    'status': node.status.value,
-                    'capabilities': node.capabilities,
-                    'agents_count': node.agents_count,
-                    'cpu_usage': node.cpu_usage,
-                    'memory_usage': node.memory_usage,
-                    'gpu_usage': node.gpu_usage,
-                    'network_latency': node.network_latency,
-                    'load_score': node.load_score,
-                    'reliability_score': node.reliability_score,
-                    'last_heartbeat': node.last_heartbeat,
-                    'uptime_hours': max(0, uptime_hours),
-                    'version': node.version,
-                    'location': node.location,
-                    'tasks_completed': node.tasks_completed,
-                    'tasks_failed': node.tasks_failed,
-                    'agents': agents,
-                    'metadata': node.metadata
-                })
+        agents_map = orchestrator_instance.agents
+        node_agents = orchestrator_instance.node_agents
+        nodes_data = []
+        for node_id, node in list(orchestrator_instance.nodes.items()):
+            # Get agents for this node
+            agents = [
+                {
+                    'agent_id': agent.agent_id,
+                    'agent_type': agent.agent_type,
+                    'status': agent.status,
+                    'capabilities': agent.capabilities,
+                    'tasks_running': agent.tasks_running,
+                    'tasks_completed': agent.tasks_completed,
+                    'efficiency_score': agent.efficiency_score,
+                    'last_activity': agent.last_activity
+                }
+                for agent_id in node_agents.get(node_id, ())
+                if (agent := agents_map.get(agent_id)) is not None
+            ]
+            
+            # Calculate uptime
+            current_time = time.time()
+            uptime_hours = (current_time - node.last_heartbeat) / 3600 if node.last_heartbeat else 0
+            
+            # Only the mutable fields are encoded per request
+            dynamic = orjson.dumps({
+                'status': node.status_value,
+                'agents_count': node.agents_count,
+                'cpu_usage': node.cpu_usage,
+                'memory_usage': node.memory_usage,
+                'gpu_usage': node.gpu_usage,
+                'network_latency': node.network_latency,
+                'load_score': node.load_score,
+                'reliability_score': node.reliability_score,
+                'last_heartbeat': node.last_heartbeat,
+                'uptime_hours': max(0, uptime_hours),
+                'tasks_completed': node.tasks_completed,
+                'tasks_failed': node.tasks_failed,
+                'agents': agents
+            }, default=_json_default, option=ORJSON_OPTIONS)
+            nodes_data.append(node_static_prefix(node) + dynamic[1:])
         
-        return jsonify({
-            'success': True,
-            'nodes': nodes_data,
-            'total_nodes': len(nodes_data)
-        })
+        return b''.join((
+            b'{"success":true,"nodes":[',
+            b','.join(nodes_data),
+            b'],"total_nodes":',
+            str(len(nodes_data)).encode(),
+            b'}'
+        ))
     
     @app.route('/api/v1/dashboard/performance/history')
     def dashboard_performance_history():
         """Get performance history for charts"""
         # Generate sample performance history
         # In production, this would come from your monitoring system
-        import random
-        from datetime import datetime, timedelta
+        points = 20  # Last 20 data points
         
-        history = []
-        current_time = datetime.utcnow()
+        if orchestrator_instance:
+            metrics = orchestrator_instance.network_metrics
+            base_success_rate = metrics.get('success_rate', 0.95)
+            base_response_time = metrics.get('average_response_time', 1000)
+            base_utilization = metrics.get('network_utilization', 0.6)
+            active_nodes = metrics.get('active_nodes', 0)
+        else:
+            base_success_rate = 0.95
+            base_response_time = 1000
+            base_utilization = 0.6
+            active_nodes = 0
         
-        for i in range(20):  # Last 20 data points
-            timestamp = current_time - timedelta(minutes=i * 5)  # Every 5 minutes
-            
-            if orchestrator_instance:
-                metrics = orchestrator_instance.network_metrics
-                base_success_rate = metrics.get('success_rate', 0.95)
-                base_response_time = metrics.get('average_response_time', 1000)
-                base_utilization = metrics.get('network_utilization', 0.6)
-            else:
-                base_success_rate = 0.95
-                base_response_time = 1000
-                base_utilization = 0.6
-            
-            # Add some realistic variation
-            history.append({
-                'timestamp': timestamp.isoformat(),
-                'success_rate': min(1.0, max(0.8, base_success_rate + random.uniform(-0.05, 0.05))),
-                'response_time': max(100, base_response_time + random.uniform(-200, 300)),
-                'network_utilization': min(1.0, max(0.1, base_utilization + random.uniform(-0.1, 0.1))),
-                'throughput': random.uniform(40, 60),
-                'active_nodes': orchestrator_instance.network_metrics.get('active_nodes', 0) if orchestrator_instance else 0,
-                'tasks_completed': random.randint(80, 120),
-                'cpu_avg': random.uniform(30, 70),
-                'memory_avg': random.uniform(40, 80),
-                'gpu_avg': random.uniform(20, 60)
-            })
+        # Oldest first, every 5 minutes
+        timestamps = history_timestamps(points, 300)
+        
+        # Add some realistic variation, drawing every series in one go
+        rng = np.random.default_rng()
+        success_rate = np.clip(base_success_rate + rng.uniform(-0.05, 0.05, points), 0.8, 1.0)
+        response_time = np.maximum(100, base_response_time + rng.uniform(-200, 300, points))
+        utilization = np.clip(base_utilization + rng.uniform(-0.1, 0.1, points), 0.1, 1.0)
+        throughput = rng.uniform(40, 60, points)
+        tasks_completed = rng.integers(80, 121, points)
+        cpu_avg = rng.uniform(30, 70, points)
+        memory_avg = rng.uniform(40, 80, points)
+        gpu_avg = rng.uniform(20, 60, points)
         
-        # Reverse to get chronological order
-        history.reverse()
+        history = [
+            {
+                'timestamp': ts,
+                'success_rate': sr,
+                'response_time': rt,
+                'network_utilization': nu,
+                'throughput': tp,
+                'active_nodes': active_nodes,
+                'tasks_completed': tc,
+                'cpu_avg': cpu,
+                'memory_avg': mem,
+                'gpu_avg': gpu
+            }
+            for ts, sr, rt, nu, tp, tc, cpu, mem, gpu in zip(
+                timestamps, success_rate.tolist(), response_time.tolist(), utilization.tolist(),
+                throughput.tolist(), tasks_completed.tolist(), cpu_avg.tolist(),
+                memory_avg.tolist(), gpu_avg.tolist()
+            )
+        ]
         
-        return jsonify({
+        return json_response({
             'success': True,
             'history': history,
             'total_points': len(history)
@@ -204,6 +499,9 @@ def setup_dashboard_routes(app, orchestrator_instance):
     @app.route('/api/v1/dashboard/tasks/queue')
     def dashboard_task_queue():
         """Get task queue information for dashboard"""
+        if orchestrator_instance is None:
+            return Response(_EMPTY_TASK_QUEUE, mimetype='application/json')
+        
         queue_data = {
             'pending': [],
             'active': [],
@@ -211,53 +509,33 @@ def setup_dashboard_routes(app, orchestrator_instance):
             'recent_failed': []
         }
         
-        if orchestrator_instance:
-            # Pending tasks
-            for task in list(orchestrator_instance.pending_tasks)[:10]:  # Last 10
-                queue_data['pending'].append({
-                    'task_id': task.task_id,
-                    'task_type': task.task_type,
-                    'priority': task.priority.name,
-                    'created_at': task.created_at,
-                    'timeout': task.timeout,
-                    'requirements': task.requirements
-                })
-            
-            # Active tasks
-            for task_id, task in list(orchestrator_instance.active_tasks.items())[:10]:
-                queue_data['active'].append({
-                    'task_id': task.task_id,
-                    'task_type': task.task_type,
-                    'priority': task.priority.name,
-                    'assigned_nodes': task.assigned_nodes,
-                    'created_at': task.created_at,
-                    'timeout': task.timeout
-                })
-            
-            # Recent completed (last 10)
-            completed_tasks = list(orchestrator_instance.completed_tasks.values())[-10:]
-            for result in completed_tasks:
-                queue_data['recent_completed'].append({
-                    'task_id': result.task_id,
-                    'status': result.status.value,
-                    'execution_time': result.execution_time,
-                    'node_id': result.node_id,
-                    'agent_id': result.agent_id,
-                    'completed_at': result.completed_at
-                })
-            
-            # Recent failed (last 10)
-            failed_tasks = list(orchestrator_instance.failed_tasks.values())[-10:]
-            for result in failed_tasks:
-                queue_data['recent_failed'].append({
-                    'task_id': result.task_id,
-                    'status': result.status.value,
-                    'error_message': result.error_message,
-                    'node_id': result.node_id,
-                    'completed_at': result.completed_at
-                })
+        # Pending tasks
+        for task in list(islice(orchestrator_instance.pending_tasks, 10)):
+            queue_data['pending'].append({
+                'task_id': task.task_id,
+                'task_type': task.task_type,
+                'priority': task.priority_name,
+                'created_at': task.created_at,
+                'timeout': task.timeout,
+                'requirements': task.requirements
+            })
+        
+        # Active tasks
+        for task in list(islice(orchestrator_instance.active_tasks.values(), 10)):
+            queue_data['active'].append({
+                'task_id': task.task_id,
+                'task_type': task.task_type,
+                'priority': task.priority_name,
+                'assigned_nodes': task.assigned_nodes,
+                'created_at': task.created_at,
+                'timeout': task.timeout
+            })
         
-        return jsonify({
+        # Recent completed/failed (last 10), already projected by the orchestrator
+        queue_data['recent_completed'] = list(orchestrator_instance.recent_completed)
+        queue_data['recent_failed'] = list(orchestrator_instance.recent_failed)
+        
+        return json_response({
             'success': True,
             'queue': queue_data,
             'summary': {
@@ -271,8 +549,7 @@ def setup_dashboard_routes(app, orchestrator_instance):
     @app.route('/api/v1/dashboard/system/info')
     def dashboard_system_info():
         """Get system information for dashboard"""
-        import psutil
-        import platform
+        static_info, resources = _system_sampler.snapshot()
         
         system_info = {
             'orchestrator': {
@@ -281,40 +558,45 @@ def setup_dashboard_routes(app, orchestrator_instance):
                 'uptime': time.time() - orchestrator_instance.network_metrics.get('uptime', time.time()) if orchestrator_instance else 0,
                 'running': orchestrator_instance.running if orchestrator_instance else False
             },
-            'system': {
-                'platform': platform.system(),
-                'platform_version': platform.version(),
-                'python_version': platform.python_version(),
-                'cpu_count': psutil.cpu_count(),
-                'memory_total': psutil.virtual_memory().total,
-                'disk_total': psutil.disk_usage('/').total,
-                'hostname': platform.node()
-            },
-            'resources': {
-                'cpu_percent': psutil.cpu_percent(interval=1),
-                'memory_percent': psutil.virtual_memory().percent,
-                'disk_percent': psutil.disk_usage('/').percent,
-                'network_connections': len(psutil.net_connections())
-            }
+            'system': static_info,
+            'resources': resources
         }
         
-        return jsonify({
+        return json_response({
             'success': True,
             'system_info': system_info
         })
     
+    @app.route('/api/v1/dashboard/overview')
+    def dashboard_overview():
+        """Get alerts, nodes, history, task queue and system info in one response
+        
+        Distinct from the API server's /api/v1/dashboard/snapshot, which bundles
+        the /status, /metrics, /nodes and /tasks bodies instead.
+        """
+        # Each section is the already-encoded body of the matching endpoint
+        sections = (
+            (b'"alerts":', dashboard_alerts),
+            (b'"nodes":', dashboard_nodes_detailed),
+            (b'"history":', dashboard_performance_history),
+            (b'"queue":', dashboard_task_queue),
+            (b'"system":', dashboard_system_info)
+        )
+        body = b','.join(key + view().get_data() for key, view in sections)
+        return Response(b'{"success":true,' + body + b'}', mimetype='application/json')
+    
     @app.route('/api/v1/dashboard/export/<format>')
     def dashboard_export(format):
         """Export dashboard data in various formats"""
         if format not in ['json', 'csv', 'xml']:
-            return jsonify({'success': False, 'error': 'Unsupported format'}), 400
+            return json_response({'success': False, 'error': 'Unsupported format'}, 400)
         
         # Collect all dashboard data
         data = {
-            'timestamp': datetime.utcnow().isoformat(),
+            'timestamp': datetime.now(timezone.utc).isoformat(),
             'orchestrator_id': orchestrator_instance.orchestrator_id if orchestrator_instance else 'unknown',
             'network_metrics': orchestrator_instance.network_metrics if orchestrator_instance else {},
-            'nodes': [node.__dict__ for node in orchestrator_instance.nodes.values()] if orchestrator_instance else [],
+            'nodes': [export_node(node) for node in list(orchestrator_instance.nodes.values())] if orchestrator_instance else [],
             'tasks_summary': {
                 'pending': len(orchestrator_instance.pending_tasks) if orchestrator_instance else 0,
                 'active': len(orchestrator_instance.active_tasks) if orchestrator_instance else 0,
@@ -324,21 +606,23 @@ def setup_dashboard_routes(app, orchestrator_instance):
         }
         
         if format == 'json':
-            return jsonify({
+            return json_response({
                 'success': True,
                 'data': data,
                 'export_format': 'json'
             })
         elif format == 'csv':
             # Convert to CSV format (simplified)
-            csv_data = "metric,value\n"
-            csv_data += f"active_nodes,{data['network_metrics'].get('active_nodes', 0)}\n"
-            csv_data += f"tasks_completed,{data['network_metrics'].get('tasks_completed', 0)}\n"
-            csv_data += f"success_rate,{data['network_metrics'].get('success_rate', 0)}\n"
+            network_metrics = data['network_metrics']
+            rows = (
+                ('active_nodes', network_metrics.get('active_nodes', 0)),
+                ('tasks_completed', network_metrics.get('tasks_completed', 0)),
+                ('success_rate', network_metrics.get('success_rate', 0))
+            )
             
-            return csv_data, 200, {'Content-Type': 'text/csv'}
+            return Response(stream_csv(('metric', 'value'), rows), mimetype='text/csv')
         
-        return jsonify({'success': False, 'error': 'Format implementation pending'}), 501
+        return json_response({'success': False, 'error': 'Format implementation pending'}, 501)
 
 # WebSocket Enhancement for Dashboard
 class DashboardWebSocketHandler:
@@ -361,7 +645,7 @@ class DashboardWebSocketHandler:
             async for message in websocket:
                 await self.handle_dashboard_message(websocket, message)
                 
-        except websockets.exceptions.ConnectionClosed:
+        except ConnectionClosed:
             pass
         finally:
             self.dashboard_clients.discard(websocket)
@@ -371,61 +655,61 @@ class DashboardWebSocketHandler:
         """Send initial dashboard data to new client"""
         if self.orchestrator:
             status = await self.orchestrator.get_network_status()
-            await websocket.send(json.dumps({
-                'type': 'initial_data',
-                'data': status,
-                'timestamp': time.time()
-            }))
+            await websocket.send(b''.join((
+                _INITIAL_DATA_PREFIX, orjson.dumps(status, default=_json_default, option=ORJSON_OPTIONS),
+                b',"timestamp":', orjson.dumps(time.time()), b'}'
+            )).decode())
     
     async def handle_dashboard_message(self, websocket, message):
         """Handle incoming dashboard messages"""
         try:
-            data = json.loads(message)
+            data = orjson.loads(message)
             message_type = data.get('type')
             
             if message_type == 'subscribe_to_alerts':
                 # Handle alert subscription
-                await websocket.send(json.dumps({
-                    'type': 'subscription_confirmed',
-                    'subscription': 'alerts',
-                    'timestamp': time.time()
-                }))
+                await websocket.send(
+                    (_SUBSCRIPTION_CONFIRMED_PREFIX + orjson.dumps(time.time()) + b'}').decode()
+                )
             
             elif message_type == 'request_node_details':
                 node_id = data.get('node_id')
                 if node_id in self.orchestrator.nodes:
                     node = self.orchestrator.nodes[node_id]
-                    await websocket.send(json.dumps({
-                        'type': 'node_details',
-                        'node_id': node_id,
-                        'data': node.__dict__,
-                        'timestamp': time.time()
-                    }))
+                    await websocket.send(b''.join((
+                        _NODE_DETAILS_PREFIX, orjson.dumps(node_id),
+                        b',"data":', encode_node(node),
+                        b',"timestamp":', orjson.dumps(time.time()), b'}'
+                    )).decode())
             
-        except json.JSONDecodeError:
-            await websocket.send(json.dumps({
-                'type': 'error',
-                'message': 'Invalid JSON message',
-                'timestamp': time.time()
-            }))
+        except orjson.JSONDecodeError:
+            await websocket.send((_INVALID_JSON_PREFIX + orjson.dumps(time.time()) + b'}').decode())
     
     async def broadcast_to_dashboard(self, message_type, data):
         """Broadcast updates to all dashboard clients"""
         if not self.dashboard_clients:
             return
         
-        message = json.dumps({
+        # Encode once and send as a text frame so browsers can JSON.parse it
+        message = ws_dumps({
             'type': message_type,
             'data': data,
             'timestamp': time.time()
         })
         
+        # Fan out concurrently so one slow client does not hold up the rest
+        clients = list(self.dashboard_clients)
+        results = await asyncio.gather(
+            *(client.send(message) for client in clients),
+            return_exceptions=True
+        )
+        
         disconnected_clients = set()
-        for client in self.dashboard_clients:
-            try:
-                await client.send(message)
-            except websockets.exceptions.ConnectionClosed:
+        for client, result in zip(clients, results):
+            if isinstance(result, ConnectionClosed):
                 disconnected_clients.add(client)
+            elif isinstance(result, Exception):
+                logger.error(f"Dashboard broadcast to {client.remote_address} failed: {result}")
         
         # Remove disconnected clients
-        self.dashboard_clients -= disconnected_clients
\ No newline at end of file
+        self.dashboard_clients -= disconnected_clients
@@ -4,21 +4,34 @@ Database schema definitions and migrations for Web4AI Orchestrator
 Supports PostgreSQL, MongoDB, and Redis storage backends
 """
 
+import io
+import csv
 import json
 import time
 import logging
-from typing import Dict, List, Any, Optional, Union
-from datetime import datetime, timedelta
+import threading
+import queue
+import bisect
+from typing import Dict, List, Any, Optional, Union, Iterator
+from datetime import datetime, timedelta, timezone
 from dataclasses import dataclass, asdict
 from enum import Enum
+from collections import deque, defaultdict
+from itertools import islice
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 import uuid
+import hashlib
+import orjson
+from cachetools import TTLCache
 
 # SQLAlchemy for PostgreSQL
 try:
-    from sqlalchemy import create_engine, Column, String, Integer, Float, DateTime, Text, Boolean, JSON
+    from sqlalchemy import create_engine, Column, String, Integer, Float, DateTime, Text, Boolean, JSON, Index, ForeignKey
     from sqlalchemy.ext.declarative import declarative_base
-    from sqlalchemy.orm import sessionmaker, relationship
-    from sqlalchemy.dialects.postgresql import UUID
+    from sqlalchemy.orm import sessionmaker, scoped_session, relationship, selectinload
+    from sqlalchemy.dialects.postgresql import UUID, insert as pg_insert
+    from sqlalchemy import select, bindparam
     import sqlalchemy as sa
     SQLALCHEMY_AVAILABLE = True
 except ImportError:
@@ -27,11 +40,21 @@ except ImportError:
 # MongoDB
 try:
     import pymongo
-    from pymongo import MongoClient
+    from pymongo import MongoClient, ReplaceOne, DeleteOne
+    from pymongo.write_concern import WriteConcern
+    from pymongo.errors import BulkWriteError
     PYMONGO_AVAILABLE = True
 except ImportError:
     PYMONGO_AVAILABLE = False
 
+# pandas, for vectorized client-side task analysis
+try:
+    import numpy as np
+    import pandas as pd
+    PANDAS_AVAILABLE = True
+except ImportError:
+    PANDAS_AVAILABLE = False
+
 # Redis
 try:
     import redis
@@ -39,6 +62,13 @@ try:
 except ImportError:
     REDIS_AVAILABLE = False
 
+# psutil (host health probes)
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 # PostgreSQL Schema Definitions
@@ -85,6 +115,12 @@ if SQLALCHEMY_AVAILABLE:
         last_heartbeat = Column(DateTime, default=datetime.utcnow)
         tasks_completed = Column(Integer, default=0)
         tasks_failed = Column(Integer, default=0)
+        
+        agents = relationship(
+            'AgentModel',
+            primaryjoin='NodeModel.node_id == foreign(AgentModel.node_id)',
+            viewonly=True
+        )
     
     class AgentModel(Base):
         """Agent information"""
@@ -104,11 +140,25 @@ if SQLALCHEMY_AVAILABLE:
         updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
         last_activity = Column(DateTime, default=datetime.utcnow)
     
+    class ErrorCodeModel(Base):
+        """Distinct task errors, keyed by a fingerprint of the message"""
+        __tablename__ = 'error_codes'
+        
+        id = Column(Integer, primary_key=True)
+        fingerprint = Column(String(32), nullable=False, unique=True)
+        sample_message = Column(Text)
+    
     class TaskModel(Base):
         """Task information"""
         __tablename__ = 'tasks'
+        __table_args__ = (
+            Index('ix_task_status_created', 'status', sa.desc('created_at'), sa.desc('task_id')),
+            Index('ix_task_node_status', 'node_id', 'status'),
+            Index('ix_task_active', 'status', postgresql_where=sa.text("status IN ('pending', 'running')")),
+            Index('ix_task_updated', 'updated_at'),
+        )
         
-        task_id = Column(String(64), primary_key=True)
+        task_id = Column(String(64), primary_key=True, server_default=sa.text("gen_random_uuid()::text"))
         task_type = Column(String(64), nullable=False)
         status = Column(String(32), nullable=False)
         priority = Column(Integer, default=3)
@@ -116,6 +166,7 @@ if SQLALCHEMY_AVAILABLE:
         input_data = Column(JSON)
         result_data = Column(JSON)
         error_message = Column(Text)
+        error_code_id = Column(Integer, ForeignKey('error_codes.id'))
         assigned_nodes = Column(JSON)
         node_id = Column(String(64))
         agent_id = Column(String(64))
@@ -129,17 +180,30 @@ if SQLALCHEMY_AVAILABLE:
         execution_time = Column(Float)
         callback_url = Column(String(512))
         metadata = Column(JSON)
+        updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+        
+        node = relationship(
+            'NodeModel',
+            primaryjoin='TaskModel.node_id == foreign(NodeModel.node_id)',
+            uselist=False,
+            viewonly=True
+        )
     
     class MetricModel(Base):
         """Metrics storage"""
         __tablename__ = 'metrics'
+        __table_args__ = (
+            Index('ix_metric_name_ts', 'metric_name', sa.desc('timestamp')),
+            {'postgresql_partition_by': 'RANGE (timestamp)'},
+        )
         
+        # Partition key must be part of the primary key
         id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-        metric_name = Column(String(128), nullable=False, index=True)
+        metric_name = Column(String(128), nullable=False)
         metric_value = Column(Float, nullable=False)
         tags = Column(JSON)
         source = Column(String(64))
-        timestamp = Column(DateTime, default=datetime.utcnow, index=True)
+        timestamp = Column(DateTime, primary_key=True, default=datetime.utcnow, index=True)
     
     class AlertModel(Base):
         """Alert information"""
@@ -159,6 +223,126 @@ if SQLALCHEMY_AVAILABLE:
         updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
         resolved_at = Column(DateTime)
         acknowledged_by = Column(String(64))
+    
+    class OptimizationAuditModel(Base):
+        """Audit trail of optimizer DDL runs"""
+        __tablename__ = 'optimization_audit'
+        
+        id = Column(Integer, primary_key=True)
+        ts = Column(DateTime, default=datetime.utcnow, index=True)
+        op = Column(String(32), nullable=False)
+        sql = Column(Text)
+
+# Allocate a task id and store the record in one round-trip; ARGV[1] is the JSON record
+REDIS_ENQUEUE_TASK_LUA = """
+local id = 'task_' .. redis.call('INCR', KEYS[1])
+local body = ARGV[1]
+if body == '{}' then
+    body = '{"task_id":"' .. id .. '"}'
+else
+    body = '{"task_id":"' .. id .. '",' .. string.sub(body, 2)
+end
+redis.call('SET', 'task:' .. id, body)
+return id
+"""
+
+METRICS_COPY_SQL = (
+    "COPY metrics (id, metric_name, metric_value, tags, source, timestamp) "
+    "FROM STDIN WITH (FORMAT csv, FORCE_NULL (tags, source))"
+)
+
+# Hourly task rollup read by PerformanceOptimizer; the unique index allows REFRESH ... CONCURRENTLY
+TASK_PERF_VIEW_SQL = [
+    """CREATE MATERIALIZED VIEW IF NOT EXISTS mv_task_perf AS
+       SELECT task_type, status, COALESCE(node_id, '') AS node_id,
+              date_trunc('hour', created_at) AS hour,
+              COUNT(*) AS task_count,
+              COUNT(execution_time) AS timed_count,
+              SUM(execution_time) AS total_time
+       FROM tasks GROUP BY 1, 2, 3, 4""",
+    "CREATE UNIQUE INDEX IF NOT EXISTS ux_mv_task_perf ON mv_task_perf(task_type, status, node_id, hour)"
+]
+
+# Execution-time histogram boundaries in seconds; bucket i counts [bounds[i-1], bounds[i]), the last is open-ended
+EXECUTION_TIME_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300, 1800)
+
+def _to_epoch_ms(value: Any) -> Optional[int]:
+    """Normalize epoch seconds/millis, datetimes and ISO strings to UTC epoch millis"""
+    if value is None or value == '':
+        return None
+    if isinstance(value, (int, float)):
+        return int(value if value > 1e11 else value * 1000)
+    if isinstance(value, str):
+        return _iso_to_epoch_ms(value)
+    try:
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return int(value.timestamp() * 1000)
+    except AttributeError:
+        return None
+
+@lru_cache(maxsize=4096)
+def _iso_to_epoch_ms(value: str) -> Optional[int]:
+    """Parse an ISO timestamp string once; rows often share the same timestamp"""
+    try:
+        return _to_epoch_ms(datetime.fromisoformat(value))
+    except ValueError:
+        return None
+
+def _utc_hour(value: Any) -> Optional[int]:
+    """UTC hour of day for any value _to_epoch_ms accepts"""
+    if isinstance(value, datetime) and value.tzinfo is None:
+        return value.hour
+    epoch_ms = _to_epoch_ms(value)
+    return None if epoch_ms is None else epoch_ms // 3600000 % 24
+
+def _json_serializer(value: Any) -> str:
+    """orjson-backed serializer for JSON columns"""
+    return orjson.dumps(value, default=str).decode()
+
+# Per-model (column name, is_datetime) pairs for _model_to_dict
+_COLS_CACHE = {}
+
+def _cols(cls) -> List[tuple]:
+    """Column names and datetime flags for a model class, computed once"""
+    cols = _COLS_CACHE.get(cls)
+    if cols is None:
+        cols = [(c.name, isinstance(c.type, DateTime)) for c in cls.__table__.columns]
+        _COLS_CACHE[cls] = cols
+    return cols
+
+class _WriteShard:
+    """A writer thread's queue, with submit/apply counters so reads can wait for earlier saves"""
+    
+    def __init__(self, maxsize: int):
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.cond = threading.Condition()
+        self.submitted = 0
+        self.applied = 0
+    
+    def put(self, item):
+        with self.cond:
+            self.submitted += 1
+        self.queue.put(item)
+    
+    def mark_applied(self, count: int):
+        with self.cond:
+            self.applied += count
+            self.cond.notify_all()
+    
+    def wait_for(self, seq: int):
+        with self.cond:
+            self.cond.wait_for(lambda: self.applied >= seq)
+
+class _PendingWrites:
+    """One thread's write session and its uncommitted saves; any thread may commit it under lock"""
+    
+    def __init__(self, session):
+        self.session = session
+        self.thread = threading.current_thread()
+        self.lock = threading.Lock()
+        self.writes = []  # (write, data) applied since the last commit
+        self.since = None  # time.monotonic() of the oldest uncommitted save
 
 class DatabaseManager:
     """Unified database manager supporting multiple backends"""
@@ -168,6 +352,44 @@ class DatabaseManager:
         self.storage_type = config.get('storage', {}).get('type', 'memory')
         self.connection = None
         self.session = None
+        self._local = threading.local()  # per-thread _PendingWrites
+        self._pending_writes = []  # every thread's _PendingWrites, so close() can commit them all
+        self._pending_writes_lock = threading.Lock()
+        self.commit_batch_size = config.get('storage', {}).get('postgresql', {}).get('commit_batch_size', 100)
+        self.commit_interval = config.get('storage', {}).get('postgresql', {}).get('commit_interval_ms', 200) / 1000.0
+        self.lost_writes = 0  # saves that returned True but could not be committed, even on replay
+        self.read_batch_size = config.get('storage', {}).get('postgresql', {}).get('read_batch_size', 500)
+        self.delete_batch_size = config.get('storage', {}).get('postgresql', {}).get('delete_batch_size', 10000)
+        
+        # Metric write batching
+        metrics_config = config.get('storage', {}).get('metrics', {})
+        self.metric_batch_size = metrics_config.get('batch_size', 500)
+        self.metric_flush_interval = metrics_config.get('flush_interval_ms', 1000) / 1000.0
+        self.metric_stream_maxlen = metrics_config.get('stream_maxlen', 100000)
+        self._metric_queue = deque()
+        self._metric_flush_lock = threading.Lock()
+        self._flush_wakeup = threading.Event()
+        self._flush_thread = None
+        self._running = False
+        self._partitions_checked_at = 0.0
+        
+        # MongoDB node/task writes, coalesced per document: collection -> {id: op}
+        self._mongo_ops = defaultdict(dict)
+        self._mongo_ops_lock = threading.RLock()
+        self._mongo_op_failures = defaultdict(int)  # (collection, id) -> failed bulk writes so far
+        self.mongo_max_write_attempts = config.get('storage', {}).get('mongodb', {}).get('max_write_attempts', 3)
+        
+        # PostgreSQL writer threads, sharded by entity id to keep per-entity ordering
+        self._write_shards = []
+        
+        # error_codes fingerprint -> id, filled as failed tasks are saved
+        self._error_code_ids = {}
+        
+        # Short-TTL read cache for hot node/task ids (not used for the memory backend)
+        cache_config = config.get('storage', {}).get('cache', {})
+        self._node_cache = TTLCache(maxsize=cache_config.get('maxsize', 10000), ttl=cache_config.get('ttl', 1.0))
+        self._task_cache = TTLCache(maxsize=cache_config.get('maxsize', 10000), ttl=cache_config.get('ttl', 1.0))
+        self._cache_lock = threading.Lock()
         
         if self.storage_type == 'postgresql' and SQLALCHEMY_AVAILABLE:
             self._setup_postgresql()
@@ -178,21 +400,53 @@ class DatabaseManager:
         else:
             logger.info("Using in-memory storage")
             self._setup_memory()
+        
+        pg_config = config.get('storage', {}).get('postgresql', {})
+        if self.storage_type == 'postgresql' and pg_config.get('async_writes', True):
+            self._start_writers(pg_config.get('writer_threads', 4), pg_config.get('write_queue_size', 10000))
+        
+        self._bind_backend()
+        if self.storage_type != 'memory':
+            self._start_metric_flusher()
+        if self.storage_type == 'postgresql':
+            threading.Thread(target=self._commit_timer_loop, daemon=True).start()
     
     def _setup_postgresql(self):
         """Setup PostgreSQL connection"""
         try:
             db_config = self.config['storage']['postgresql']
+            driver = f"+{db_config['driver']}" if db_config.get('driver') else ''
             connection_string = (
-                f"postgresql://{db_config['username']}:{db_config['password']}"
+                f"postgresql{driver}://{db_config['username']}:{db_config['password']}"
                 f"@{db_config['host']}:{db_config.get('port', 5432)}"
                 f"/{db_config['database']}"
             )
             
-            self.engine = create_engine(connection_string, pool_size=20, max_overflow=30)
+            engine_options = {
+                'pool_size': db_config.get('pool_size', 20),
+                'max_overflow': db_config.get('max_overflow', 30),
+                'pool_pre_ping': True,
+                'pool_recycle': db_config.get('pool_recycle', 1800),
+                'insertmanyvalues_page_size': 1000,
+                'json_serializer': _json_serializer,
+                'json_deserializer': orjson.loads,
+            }
+            if sa.engine.make_url(connection_string).get_dialect().driver == 'psycopg2':
+                engine_options.update(executemany_mode='values_plus_batch', executemany_batch_page_size=500)
+            
+            self.engine = create_engine(connection_string, **engine_options)
             Base.metadata.create_all(self.engine)
-            Session = sessionmaker(bind=self.engine)
-            self.session = Session()
+            self.partition_days_ahead = db_config.get('partition_days_ahead', 7)
+            self.partition_check_interval = db_config.get('partition_check_interval', 3600)
+            self.ensure_metric_partitions()
+            self.Session = sessionmaker(bind=self.engine, autoflush=False, expire_on_commit=False)
+            # Thread-local sessions so concurrent callers don't serialize on one connection
+            self.session = scoped_session(self.Session)
+            
+            # Built once; psycopg 3 server-side prepares them after repeated use
+            nodes, tasks = NodeModel.__table__, TaskModel.__table__
+            self._get_node_stmt = select(nodes).where(nodes.c.node_id == bindparam('node_id'))
+            self._get_task_stmt = select(tasks).where(tasks.c.task_id == bindparam('task_id'))
             
             logger.info("PostgreSQL database connected")
             
@@ -208,10 +462,17 @@ class DatabaseManager:
                 host=db_config['host'],
                 port=db_config.get('port', 27017),
                 username=db_config.get('username'),
-                password=db_config.get('password')
+                password=db_config.get('password'),
+                maxPoolSize=db_config.get('max_pool_size', 100),
+                minPoolSize=db_config.get('min_pool_size', 5)
             )
             
             self.connection = client[db_config['database']]
+            self.metrics_collection = self.connection.metrics
+            if db_config.get('unacknowledged_metrics', False):
+                self.metrics_collection = self.connection.metrics.with_options(
+                    write_concern=WriteConcern(w=0)
+                )
             
             # Create indexes
             self._create_mongodb_indexes()
@@ -236,6 +497,7 @@ class DatabaseManager:
             
             # Test connection
             self.connection.ping()
+            self._enqueue_script = self.connection.register_script(REDIS_ENQUEUE_TASK_LUA)
             
             logger.info("Redis database connected")
             
@@ -250,9 +512,15 @@ class DatabaseManager:
             'nodes': {},
             'agents': {},
             'tasks': {},
-            'metrics': [],
+            'metrics': {},  # metric_name -> deque in arrival order
             'alerts': {}
         }
+        self.max_in_memory_metrics = self.config.get('storage', {}).get('metrics', {}).get('max_in_memory', 100000)
+        
+        # Secondary indexes: status -> sorted [(created_at key, task_id)], task_id -> its entry
+        self._tasks_by_status = {}
+        self._task_index_entries = {}
+        self._task_writes = 0
         logger.info("Using in-memory storage")
     
     def _create_mongodb_indexes(self):
@@ -274,72 +542,220 @@ class DatabaseManager:
         self.connection.alerts.create_index([("status", 1), ("severity", 1)])
         self.connection.alerts.create_index([("created_at", -1)])
     
+    def _bind_backend(self):
+        """Bind hot-path operations to the selected backend once"""
+        suffix = {'postgresql': 'pg', 'mongodb': 'mongo', 'redis': 'redis', 'memory': 'mem'}[self.storage_type]
+        for op in ('save_node', 'get_node', 'save_task', 'get_task'):
+            setattr(self, f'_{op}', getattr(self, f'_{op}_{suffix}'))
+        self._save_metric = self._save_metric_mem if self.storage_type == 'memory' else self._save_metric_queued
+        
+        if self._write_shards:
+            self._save_node = lambda data: self._submit_write(data['node_id'], self._save_node_pg, data)
+            self._save_task = lambda data: self._submit_write(data['task_id'], self._save_task_pg, data)
+        elif self.storage_type == 'postgresql':
+            self._save_node = lambda data: self._pg_save(self._save_node_pg, data)
+            self._save_task = lambda data: self._pg_save(self._save_task_pg, data)
+    
+    def _start_writers(self, threads: int, queue_size: int):
+        """Start writer threads that apply and group-commit queued saves"""
+        self._write_shards = [_WriteShard(max(1, queue_size // threads)) for _ in range(threads)]
+        for shard in self._write_shards:
+            threading.Thread(target=self._writer_loop, args=(shard,), daemon=True).start()
+    
+    def _shard(self, key: str) -> _WriteShard:
+        return self._write_shards[hash(key) % len(self._write_shards)]
+    
+    def _submit_write(self, key: str, write, data: Dict[str, Any]):
+        """Queue a save on its shard; blocks when the shard is full (backpressure)"""
+        self._shard(key).put((write, data))
+    
+    def _writer_loop(self, shard: _WriteShard):
+        """Apply queued saves and commit once per drained batch"""
+        while True:
+            batch = [shard.queue.get()]
+            while len(batch) < self.commit_batch_size:
+                try:
+                    batch.append(shard.queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            for write, data in batch:
+                try:
+                    self._pg_save(write, data)
+                except Exception as e:
+                    logger.error(f"Failed to apply queued write: {e}")
+            
+            pending = self._thread_pending()
+            with pending.lock:
+                self._commit_pending(pending)
+            
+            shard.mark_applied(len(batch))
+            for _ in batch:
+                shard.queue.task_done()
+    
+    def _thread_pending(self) -> _PendingWrites:
+        """This thread's write session, created and registered on first use"""
+        pending = getattr(self._local, 'pending', None)
+        if pending is None:
+            pending = self._local.pending = _PendingWrites(self.Session())
+            with self._pending_writes_lock:
+                self._pending_writes.append(pending)
+        return pending
+    
+    def _pg_save(self, write, data: Dict[str, Any]):
+        """Apply a save on this thread's write session, committing every commit_batch_size saves"""
+        pending = self._thread_pending()
+        with pending.lock:
+            # SAVEPOINT per save: a failure rolls back only this save, not the open batch
+            with pending.session.begin_nested():
+                write(data, pending.session)
+            pending.writes.append((write, data))
+            if pending.since is None:
+                pending.since = time.monotonic()
+            if len(pending.writes) >= self.commit_batch_size:
+                self._commit_pending(pending)
+    
+    def _commit_pending(self, pending: _PendingWrites):
+        """Commit a thread's pending saves, replaying them once if the commit fails; caller holds pending.lock"""
+        if not pending.writes:
+            return
+        writes, pending.writes, pending.since = pending.writes, [], None
+        try:
+            pending.session.commit()
+            return
+        except Exception as e:
+            logger.warning(f"Failed to commit {len(writes)} pending writes, replaying: {e}")
+            pending.session.rollback()
+        
+        # The callers were already told these saves succeeded, so apply them again in a fresh transaction
+        failed = 0
+        for write, data in writes:
+            try:
+                with pending.session.begin_nested():
+                    write(data, pending.session)
+            except Exception as e:
+                failed += 1
+                logger.error(f"Failed to replay write: {e}")
+        try:
+            pending.session.commit()
+        except Exception as e:
+            logger.error(f"Failed to commit replayed writes: {e}")
+            pending.session.rollback()
+            failed = len(writes)
+        
+        if failed:
+            self.lost_writes += failed
+            logger.error(f"Lost {failed} of {len(writes)} acknowledged writes ({self.lost_writes} total)")
+    
+    def _commit_timer_loop(self):
+        """Commit pending saves older than commit_interval, so sparse writes don't linger uncommitted"""
+        while self._running:
+            time.sleep(self.commit_interval / 2)
+            self.flush_writes(max_age=self.commit_interval)
+    
+    def _drain_writes(self, key: Optional[str] = None):
+        """Wait until saves queued before this call are committed; only key's shard when given"""
+        # Reads use the thread's read session, so commit this thread's own pending saves first
+        pending = getattr(self._local, 'pending', None)
+        if pending is not None and pending.writes:
+            with pending.lock:
+                self._commit_pending(pending)
+        
+        if not self._write_shards:
+            return
+        shards = [self._shard(key)] if key is not None else self._write_shards
+        # Targets are fixed up front, so sustained write traffic can't keep a reader waiting
+        targets = [(shard, shard.submitted) for shard in shards]
+        for shard, seq in targets:
+            shard.wait_for(seq)
+    
+    def _cached_get(self, cache: TTLCache, key: str, fetch) -> Optional[Dict[str, Any]]:
+        """Serve a by-id read from the TTL cache, falling back to the backend"""
+        if self.storage_type == 'memory':
+            return fetch(key)
+        
+        with self._cache_lock:
+            value = cache.get(key)
+        if value is not None:
+            return value
+        
+        self._drain_writes(key)
+        value = fetch(key)
+        if value is not None:
+            with self._cache_lock:
+                cache[key] = value
+        return value
+    
+    def _invalidate(self, cache: TTLCache, key: str):
+        """Drop a cached record after a write"""
+        with self._cache_lock:
+            cache.pop(key, None)
+    
     # Node operations
     def save_node(self, node_data: Dict[str, Any]) -> bool:
         """Save node information"""
         try:
-            if self.storage_type == 'postgresql':
-                node = NodeModel(**node_data)
-                self.session.merge(node)
-                self.session.commit()
-                
-            elif self.storage_type == 'mongodb':
-                self.connection.nodes.replace_one(
-                    {"node_id": node_data["node_id"]},
-                    node_data,
-                    upsert=True
-                )
-                
-            elif self.storage_type == 'redis':
-                self.connection.hset(
-                    f"node:{node_data['node_id']}",
-                    mapping=node_data
-                )
-                
-            else:  # memory
-                self.memory_store['nodes'][node_data['node_id']] = node_data
-            
+            self._invalidate(self._node_cache, node_data['node_id'])
+            self._save_node(node_data)
             return True
             
         except Exception as e:
             logger.error(f"Failed to save node: {e}")
             return False
     
+    def _save_node_pg(self, node_data: Dict[str, Any], session=None):
+        self._pg_upsert(NodeModel, node_data, 'node_id', session)
+    
+    def _save_node_mongo(self, node_data: Dict[str, Any]):
+        self._queue_mongo_op('nodes', node_data['node_id'],
+                             ReplaceOne({"node_id": node_data["node_id"]}, node_data, upsert=True))
+    
+    def _save_node_redis(self, node_data: Dict[str, Any]):
+        self.connection.set(f"node:{node_data['node_id']}", self._redis_dumps(node_data))
+    
+    def _save_node_mem(self, node_data: Dict[str, Any]):
+        self.memory_store['nodes'][node_data['node_id']] = node_data
+    
     def get_node(self, node_id: str) -> Optional[Dict[str, Any]]:
         """Get node information"""
         try:
-            if self.storage_type == 'postgresql':
-                node = self.session.query(NodeModel).filter_by(node_id=node_id).first()
-                return self._model_to_dict(node) if node else None
-                
-            elif self.storage_type == 'mongodb':
-                node = self.connection.nodes.find_one({"node_id": node_id})
-                if node:
-                    node.pop('_id', None)  # Remove MongoDB ID
-                return node
-                
-            elif self.storage_type == 'redis':
-                node_data = self.connection.hgetall(f"node:{node_id}")
-                return dict(node_data) if node_data else None
-                
-            else:  # memory
-                return self.memory_store['nodes'].get(node_id)
+            return self._cached_get(self._node_cache, node_id, self._get_node)
                 
         except Exception as e:
             logger.error(f"Failed to get node: {e}")
             return None
     
+    def _get_node_pg(self, node_id: str) -> Optional[Dict[str, Any]]:
+        row = self.session.execute(self._get_node_stmt, {'node_id': node_id}).mappings().first()
+        return self._row_to_dict(row) if row else None
+    
+    def _get_node_mongo(self, node_id: str) -> Optional[Dict[str, Any]]:
+        self._flush_mongo_ops()
+        node = self.connection.nodes.find_one({"node_id": node_id})
+        if node:
+            node.pop('_id', None)  # Remove MongoDB ID
+        return node
+    
+    def _get_node_redis(self, node_id: str) -> Optional[Dict[str, Any]]:
+        raw = self.connection.get(f"node:{node_id}")
+        return orjson.loads(raw) if raw else None
+    
+    def _get_node_mem(self, node_id: str) -> Optional[Dict[str, Any]]:
+        return self.memory_store['nodes'].get(node_id)
+    
     def get_all_nodes(self, orchestrator_id: Optional[str] = None) -> List[Dict[str, Any]]:
         """Get all nodes"""
         try:
             if self.storage_type == 'postgresql':
-                query = self.session.query(NodeModel)
+                self._drain_writes()
+                nodes = NodeModel.__table__
+                stmt = select(nodes)
                 if orchestrator_id:
-                    query = query.filter_by(orchestrator_id=orchestrator_id)
-                nodes = query.all()
-                return [self._model_to_dict(node) for node in nodes]
+                    stmt = stmt.where(nodes.c.orchestrator_id == orchestrator_id)
+                return self._select_rows(stmt)
                 
             elif self.storage_type == 'mongodb':
+                self._flush_mongo_ops()
                 filter_dict = {"orchestrator_id": orchestrator_id} if orchestrator_id else {}
                 nodes = list(self.connection.nodes.find(filter_dict))
                 for node in nodes:
@@ -348,10 +764,9 @@ class DatabaseManager:
                 
             elif self.storage_type == 'redis':
                 nodes = []
-                for key in self.connection.scan_iter(match="node:*"):
-                    node_data = self.connection.hgetall(key)
+                for _, node_data in self._redis_scan_records("node:*"):
                     if not orchestrator_id or node_data.get('orchestrator_id') == orchestrator_id:
-                        nodes.append(dict(node_data))
+                        nodes.append(node_data)
                 return nodes
                 
             else:  # memory
@@ -367,12 +782,14 @@ class DatabaseManager:
     def delete_node(self, node_id: str) -> bool:
         """Delete node"""
         try:
+            self._invalidate(self._node_cache, node_id)
             if self.storage_type == 'postgresql':
+                self._drain_writes(node_id)
                 self.session.query(NodeModel).filter_by(node_id=node_id).delete()
                 self.session.commit()
                 
             elif self.storage_type == 'mongodb':
-                self.connection.nodes.delete_one({"node_id": node_id})
+                self._queue_mongo_op('nodes', node_id, DeleteOne({"node_id": node_id}))
                 
             elif self.storage_type == 'redis':
                 self.connection.delete(f"node:{node_id}")
@@ -386,151 +803,665 @@ class DatabaseManager:
             logger.error(f"Failed to delete node: {e}")
             return False
     
+    def _pg_upsert(self, model, data: Dict[str, Any], pk: str, session=None):
+        """Upsert a row on the given (default: this thread's) session; the caller decides when to commit"""
+        stmt = pg_insert(model.__table__).values(**data)
+        set_ = {k: stmt.excluded[k] for k in data if k != pk}
+        if 'updated_at' in model.__table__.c and 'updated_at' not in data:
+            set_['updated_at'] = datetime.utcnow()
+        stmt = stmt.on_conflict_do_update(index_elements=[pk], set_=set_)
+        (session or self.session).execute(stmt)
+    
+    def flush_writes(self, max_age: Optional[float] = None):
+        """Commit pending PostgreSQL node/task writes on every thread (only those older than max_age seconds)"""
+        with self._pending_writes_lock:
+            pending_writes = list(self._pending_writes)
+        now = time.monotonic()
+        for pending in pending_writes:
+            if max_age is None or (pending.since is not None and now - pending.since >= max_age):
+                with pending.lock:
+                    self._commit_pending(pending)
+            
+            # Forget sessions of threads that have exited once they have nothing left to commit
+            if not pending.thread.is_alive():
+                with self._pending_writes_lock:
+                    if not pending.writes and pending in self._pending_writes:
+                        self._pending_writes.remove(pending)
+                        pending.session.close()
+    
     # Task operations
     def save_task(self, task_data: Dict[str, Any]) -> bool:
         """Save task information"""
         try:
-            if self.storage_type == 'postgresql':
-                task = TaskModel(**task_data)
-                self.session.merge(task)
-                self.session.commit()
-                
-            elif self.storage_type == 'mongodb':
-                self.connection.tasks.replace_one(
-                    {"task_id": task_data["task_id"]},
-                    task_data,
-                    upsert=True
-                )
-                
-            elif self.storage_type == 'redis':
-                self.connection.hset(
-                    f"task:{task_data['task_id']}",
-                    mapping=task_data
-                )
-                
-            else:  # memory
-                self.memory_store['tasks'][task_data['task_id']] = task_data
-            
+            self._invalidate(self._task_cache, task_data['task_id'])
+            self._save_task(task_data)
             return True
             
         except Exception as e:
             logger.error(f"Failed to save task: {e}")
             return False
     
-    def get_task(self, task_id: str) -> Optional[Dict[str, Any]]:
-        """Get task information"""
+    def _save_task_pg(self, task_data: Dict[str, Any], session=None):
+        if task_data.get('error_message') and 'error_code_id' not in task_data:
+            task_data = {**task_data, 'error_code_id': self._error_code_id(task_data['error_message'])}
+        self._pg_upsert(TaskModel, task_data, 'task_id', session)
+    
+    @staticmethod
+    def _error_fingerprint(error_message: str) -> str:
+        """md5 of the line that identifies an error; the exception line for tracebacks"""
+        lines = [line for line in error_message.strip().splitlines() if line.strip()]
+        if not lines:
+            key = error_message.strip()
+        else:
+            key = lines[-1] if lines[0].startswith('Traceback') else lines[0]
+        return hashlib.md5(key.strip().encode()).hexdigest()
+    
+    def _error_code_id(self, error_message: str) -> int:
+        """Look up or register the error_codes row for a message"""
+        fingerprint = self._error_fingerprint(error_message)
+        code_id = self._error_code_ids.get(fingerprint)
+        if code_id is None:
+            error_codes = ErrorCodeModel.__table__
+            stmt = pg_insert(error_codes).values(fingerprint=fingerprint, sample_message=error_message)
+            # No-op update so RETURNING also yields the id of an existing row
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['fingerprint'], set_={'fingerprint': stmt.excluded.fingerprint}
+            ).returning(error_codes.c.id)
+            # Own transaction: the id must stay valid even if the task batch rolls back
+            with self.engine.begin() as conn:
+                code_id = conn.execute(stmt).scalar_one()
+            self._error_code_ids[fingerprint] = code_id
+        return code_id
+    
+    def _save_task_mongo(self, task_data: Dict[str, Any]):
+        self._queue_mongo_op('tasks', task_data['task_id'],
+                             ReplaceOne({"task_id": task_data["task_id"]}, task_data, upsert=True))
+    
+    def _save_task_redis(self, task_data: Dict[str, Any]):
+        self.connection.set(f"task:{task_data['task_id']}", self._redis_dumps(task_data))
+    
+    def _save_task_mem(self, task_data: Dict[str, Any]):
+        self._index_task(task_data)
+        self.memory_store['tasks'][task_data['task_id']] = task_data
+        self._task_writes += 1
+    
+    def get_tasks_version(self) -> Optional[tuple]:
+        """Cheap token that changes whenever tasks are written or deleted; None if unknown"""
         try:
             if self.storage_type == 'postgresql':
-                task = self.session.query(TaskModel).filter_by(task_id=task_id).first()
-                return self._model_to_dict(task) if task else None
-                
-            elif self.storage_type == 'mongodb':
-                task = self.connection.tasks.find_one({"task_id": task_id})
-                if task:
-                    task.pop('_id', None)
-                return task
+                self._drain_writes()
+                # MAX(updated_at) is one backward step on ix_task_updated; n_tup_del catches deletions
+                with self.engine.connect() as conn:
+                    return tuple(conn.execute(sa.text(
+                        "SELECT (SELECT MAX(updated_at) FROM tasks), "
+                        "(SELECT n_tup_del FROM pg_stat_user_tables WHERE relname = 'tasks')"
+                    )).one())
+            elif self.storage_type == 'memory':
+                return (self._task_writes, len(self.memory_store['tasks']))
+            return None
+        except Exception as e:
+            logger.error(f"Failed to get tasks version: {e}")
+            return None
+    
+    def create_task(self, task_data: Dict[str, Any]) -> Optional[str]:
+        """Persist a new task, allocating task_id in the same round-trip when missing"""
+        try:
+            if 'task_id' in task_data:
+                return task_data['task_id'] if self.save_task(task_data) else None
+            
+            if self.storage_type == 'redis':
+                task_id = self._enqueue_script(keys=['tasks:next_id'], args=[self._redis_dumps(task_data)])
                 
-            elif self.storage_type == 'redis':
-                task_data = self.connection.hgetall(f"task:{task_id}")
-                return dict(task_data) if task_data else None
+            elif self.storage_type == 'postgresql':
+                tasks = TaskModel.__table__
+                task_id = self.session.execute(
+                    sa.insert(tasks).values(**task_data).returning(tasks.c.task_id)
+                ).scalar_one()
+                self.session.commit()
                 
-            else:  # memory
-                return self.memory_store['tasks'].get(task_id)
+            else:
+                task_id = str(uuid.uuid4())
+                self._save_task({**task_data, 'task_id': task_id})
+            
+            task_data['task_id'] = task_id
+            return task_id
+            
+        except Exception as e:
+            logger.error(f"Failed to create task: {e}")
+            return None
+    
+    def get_task(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Get task information"""
+        try:
+            return self._cached_get(self._task_cache, task_id, self._get_task)
                 
         except Exception as e:
             logger.error(f"Failed to get task: {e}")
             return None
     
-    def get_tasks_by_status(self, status: str, limit: int = 100) -> List[Dict[str, Any]]:
-        """Get tasks by status"""
+    def _get_task_pg(self, task_id: str) -> Optional[Dict[str, Any]]:
+        row = self.session.execute(self._get_task_stmt, {'task_id': task_id}).mappings().first()
+        return self._row_to_dict(row) if row else None
+    
+    def _get_task_mongo(self, task_id: str) -> Optional[Dict[str, Any]]:
+        self._flush_mongo_ops()
+        task = self.connection.tasks.find_one({"task_id": task_id})
+        if task:
+            task.pop('_id', None)
+        return task
+    
+    def _get_task_redis(self, task_id: str) -> Optional[Dict[str, Any]]:
+        raw = self.connection.get(f"task:{task_id}")
+        return orjson.loads(raw) if raw else None
+    
+    def _get_task_mem(self, task_id: str) -> Optional[Dict[str, Any]]:
+        return self.memory_store['tasks'].get(task_id)
+    
+    def get_tasks_by_status(self, status: str, limit: int = 100, include_node: bool = False,
+                            before: Optional[tuple] = None) -> List[Dict[str, Any]]:
+        """Get tasks by status, newest first, optionally with each task's node under 'node'
+        
+        `before` is the (created_at, task_id) of the last task on the previous page.
+        """
         try:
             if self.storage_type == 'postgresql':
-                tasks = (self.session.query(TaskModel)
-                        .filter_by(status=status)
-                        .order_by(TaskModel.created_at.desc())
-                        .limit(limit)
-                        .all())
-                return [self._model_to_dict(task) for task in tasks]
+                self._drain_writes()
+                tasks = TaskModel.__table__
+                conditions = [tasks.c.status == status]
+                if before:
+                    # Row-constructor comparison stays an index range scan, unlike OR-expanded keysets
+                    created_at, task_id = before
+                    if isinstance(created_at, str):
+                        created_at = datetime.fromisoformat(created_at)
+                    conditions.append(sa.tuple_(tasks.c.created_at, tasks.c.task_id) < sa.tuple_(created_at, task_id))
+                order = (tasks.c.created_at.desc(), tasks.c.task_id.desc())
+                
+                if not include_node:
+                    return self._select_rows(select(tasks).where(*conditions).order_by(*order).limit(limit))
+                
+                query = (self.session.query(TaskModel)
+                        .filter(*conditions)
+                        .order_by(*order)
+                        .limit(limit))
+                
+                # One extra SELECT ... WHERE node_id IN (...) instead of N+1
+                tasks = []
+                for task in query.options(selectinload(TaskModel.node)).all():
+                    task_dict = self._model_to_dict(task)
+                    task_dict['node'] = self._model_to_dict(task.node)
+                    tasks.append(task_dict)
+                return tasks
                 
             elif self.storage_type == 'mongodb':
+                self._flush_mongo_ops()
+                filter_dict = {"status": status}
+                if before:
+                    created_at, task_id = before
+                    filter_dict["$or"] = [
+                        {"created_at": {"$lt": created_at}},
+                        {"created_at": created_at, "task_id": {"$lt": task_id}}
+                    ]
                 tasks = list(self.connection.tasks
-                           .find({"status": status})
-                           .sort("created_at", -1)
+                           .find(filter_dict)
+                           .sort([("created_at", -1), ("task_id", -1)])
                            .limit(limit))
                 for task in tasks:
                     task.pop('_id', None)
-                return tasks
                 
             elif self.storage_type == 'redis':
                 # Redis doesn't have efficient querying, so we scan all tasks
-                tasks = []
-                for key in self.connection.scan_iter(match="task:*"):
-                    task_data = self.connection.hgetall(key)
-                    if task_data.get('status') == status:
-                        tasks.append(dict(task_data))
+                tasks = [task_data for _, task_data in self._redis_scan_records("task:*")
+                         if task_data.get('status') == status]
                 
                 # Sort and limit
-                tasks.sort(key=lambda x: x.get('created_at', ''), reverse=True)
-                return tasks[:limit]
+                sort_key = lambda x: (self._created_key(x), x.get('task_id', ''))
+                if before:
+                    cursor = (self._created_key({'created_at': before[0]}), before[1])
+                    tasks = [t for t in tasks if sort_key(t) < cursor]
+                tasks.sort(key=sort_key, reverse=True)
+                tasks = tasks[:limit]
                 
             else:  # memory
-                tasks = [t for t in self.memory_store['tasks'].values() if t.get('status') == status]
-                tasks.sort(key=lambda x: x.get('created_at', ''), reverse=True)
-                return tasks[:limit]
+                bucket = self._tasks_by_status.get(status, [])
+                end = len(bucket)
+                if before:
+                    end = bisect.bisect_left(bucket, (self._created_key({'created_at': before[0]}), before[1]))
+                tasks = [self.memory_store['tasks'][task_id]
+                         for _, task_id in reversed(bucket[max(0, end - limit):end] if limit > 0 else [])]
+            
+            return self._attach_nodes(tasks) if include_node else tasks
                 
         except Exception as e:
             logger.error(f"Failed to get tasks by status: {e}")
             return []
     
-    # Metrics operations
-    def save_metric(self, metric_data: Dict[str, Any]) -> bool:
-        """Save metric data"""
+    def iter_tasks_by_status(self, status: str, limit: int = 10000,
+                             columns: Optional[List[str]] = None) -> Iterator[Union[Dict[str, Any], tuple]]:
+        """Stream tasks by status, newest first, without materializing the result set
+        
+        With `columns`, each row is a plain tuple in that order; otherwise a dict.
+        Values are the backend's native ones (datetimes stay datetimes).
+        """
         try:
             if self.storage_type == 'postgresql':
-                metric = MetricModel(**metric_data)
-                self.session.add(metric)
-                self.session.commit()
-                
-            elif self.storage_type == 'mongodb':
-                self.connection.metrics.insert_one(metric_data)
-                
-            elif self.storage_type == 'redis':
-                # Store metrics with timestamp-based keys for time series
-                timestamp = int(time.time())
-                key = f"metric:{metric_data['metric_name']}:{timestamp}"
-                self.connection.hset(key, mapping=metric_data)
-                self.connection.expire(key, 86400 * 7)  # 7 days TTL
+                self._drain_writes()
+                tasks = TaskModel.__table__
+                selected = [tasks.c[name] for name in columns] if columns else [tasks]
+                stmt = (select(*selected)
+                        .where(tasks.c.status == status)
+                        .order_by(tasks.c.created_at.desc())
+                        .limit(limit))
+                # Server-side cursor: rows arrive in yield_per chunks, so RSS stays flat
+                with self.engine.connect().execution_options(stream_results=True, yield_per=5000) as conn:
+                    result = conn.execute(stmt)
+                    if columns:
+                        yield from result.tuples()
+                    else:
+                        for row in result.mappings():
+                            yield dict(row)
+                return
                 
-            else:  # memory
-                self.memory_store['metrics'].append(metric_data)
+            if self.storage_type == 'mongodb':
+                self._flush_mongo_ops()
+                projection = dict.fromkeys(columns, 1) if columns else {}
+                projection['_id'] = 0
+                tasks = (self.connection.tasks
+                         .find({"status": status}, projection)
+                         .sort("created_at", -1)
+                         .limit(limit)
+                         .batch_size(5000))
+            else:
+                tasks = self.get_tasks_by_status(status, limit=limit)
+            
+            if columns:
+                for task in tasks:
+                    yield tuple([task.get(name) for name in columns])
+            else:
+                yield from tasks
                 
-                # Keep only recent metrics in memory
-                cutoff_time = time.time() - (24 * 3600)  # 24 hours
-                self.memory_store['metrics'] = [
-                    m for m in self.memory_store['metrics']
-                    if m.get('timestamp', 0) > cutoff_time
-                ]
+        except Exception as e:
+            logger.error(f"Failed to stream tasks by status: {e}")
+    
+    @staticmethod
+    def _created_key(task_data: Dict[str, Any]) -> str:
+        """Sortable created_at key for the in-memory status index"""
+        created_at = task_data.get('created_at')
+        if isinstance(created_at, datetime):
+            return created_at.isoformat()
+        return str(created_at) if created_at else ''
+    
+    def _index_task(self, task_data: Dict[str, Any]):
+        """Move a task into its status bucket in the in-memory index"""
+        task_id = task_data['task_id']
+        self._unindex_task(task_id)
+        
+        entry = (self._created_key(task_data), task_id)
+        status = task_data.get('status')
+        bisect.insort(self._tasks_by_status.setdefault(status, []), entry)
+        self._task_index_entries[task_id] = (status, entry)
+    
+    def _unindex_task(self, task_id: str):
+        """Remove a task from the in-memory status index"""
+        indexed = self._task_index_entries.pop(task_id, None)
+        if indexed:
+            status, entry = indexed
+            bucket = self._tasks_by_status[status]
+            i = bisect.bisect_left(bucket, entry)
+            if i < len(bucket) and bucket[i] == entry:
+                del bucket[i]
+    
+    def _attach_nodes(self, tasks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Attach node records to tasks with one batched node lookup"""
+        node_ids = list({t['node_id'] for t in tasks if t.get('node_id')})
+        nodes = {}
+        
+        if node_ids and self.storage_type == 'mongodb':
+            nodes = {n['node_id']: n for n in
+                     self.connection.nodes.find({"node_id": {"$in": node_ids}}, {"_id": 0})}
+            
+        elif node_ids and self.storage_type == 'redis':
+            raws = self.connection.mget([f"node:{node_id}" for node_id in node_ids])
+            nodes = {nid: orjson.loads(raw) for nid, raw in zip(node_ids, raws) if raw}
             
+        elif self.storage_type == 'memory':
+            nodes = self.memory_store['nodes']
+        
+        return [{**task, 'node': nodes.get(task.get('node_id'))} for task in tasks]
+    
+    # Metrics operations
+    def save_metric(self, metric_data: Dict[str, Any]) -> bool:
+        """Save metric data"""
+        try:
+            self._save_metric(metric_data)
             return True
             
         except Exception as e:
             logger.error(f"Failed to save metric: {e}")
             return False
     
+    def _save_metric_queued(self, metric_data: Dict[str, Any]):
+        # Queue for the background flusher
+        self._metric_queue.append(metric_data)
+        if len(self._metric_queue) >= self.metric_batch_size:
+            self._flush_wakeup.set()
+    
+    def _save_metric_mem(self, metric_data: Dict[str, Any]):
+        # Bounded deque evicts the oldest sample; age-based retention runs in cleanup_old_data
+        name = metric_data.get('metric_name')
+        series = self.memory_store['metrics'].get(name)
+        if series is None:
+            series = self.memory_store['metrics'][name] = deque(maxlen=self.max_in_memory_metrics)
+        # Parse the timestamp once here so range queries compare integers; store a copy
+        # so the caller's dict is untouched and the parsed time never leaks into results
+        series.append((_to_epoch_ms(metric_data.get('timestamp')), dict(metric_data)))
+    
+    def _start_metric_flusher(self):
+        """Start background thread that drains queued metrics"""
+        self._running = True
+        self._flush_thread = threading.Thread(target=self._metric_flush_loop, daemon=True)
+        self._flush_thread.start()
+    
+    def _metric_flush_loop(self):
+        """Flush queued metrics on size or time thresholds"""
+        while self._running:
+            self._flush_wakeup.wait(self.metric_flush_interval)
+            self._flush_wakeup.clear()
+            self.flush()
+            
+            # Keep partitions created ahead of time, independent of startup and cleanup
+            if (self.storage_type == 'postgresql'
+                    and time.monotonic() - self._partitions_checked_at >= self.partition_check_interval):
+                self.ensure_metric_partitions()
+    
+    def _queue_mongo_op(self, collection: str, doc_id: str, op):
+        """Queue a MongoDB write; a later op for the same document replaces it"""
+        with self._mongo_ops_lock:
+            ops = self._mongo_ops[collection]
+            ops[doc_id] = op
+            if len(ops) >= self.metric_batch_size:
+                self._flush_wakeup.set()
+    
+    def _flush_mongo_ops(self):
+        """Send queued MongoDB node/task writes as unordered bulk writes; failed ops stay queued for retry"""
+        with self._mongo_ops_lock:
+            for collection, ops in self._mongo_ops.items():
+                if not ops:
+                    continue
+                doc_ids = list(ops)
+                try:
+                    self.connection[collection].bulk_write([ops[doc_id] for doc_id in doc_ids], ordered=False)
+                    failed = set()
+                except BulkWriteError as e:
+                    # Unordered: every op not listed in writeErrors was applied
+                    failed = {doc_ids[error['index']] for error in e.details.get('writeErrors', [])}
+                    if e.details.get('writeConcernErrors'):
+                        failed = set(doc_ids)  # Unacknowledged; ops are idempotent, so resend them all
+                    logger.error(f"Failed to bulk write {len(failed)} of {len(doc_ids)} {collection}, will retry: {e}")
+                except Exception as e:
+                    failed = set(doc_ids)
+                    logger.error(f"Failed to bulk write {len(doc_ids)} {collection}, will retry: {e}")
+                
+                for doc_id in doc_ids:
+                    key = (collection, doc_id)
+                    if doc_id not in failed:
+                        del ops[doc_id]
+                        self._mongo_op_failures.pop(key, None)
+                        continue
+                    
+                    self._mongo_op_failures[key] += 1
+                    if self._mongo_op_failures[key] >= self.mongo_max_write_attempts:
+                        logger.error(f"Dropping {collection} write for {doc_id} after {self._mongo_op_failures[key]} attempts")
+                        del ops[doc_id]
+                        del self._mongo_op_failures[key]
+    
+    def flush(self) -> int:
+        """Write all queued metrics (and MongoDB node/task writes) to the backend"""
+        if self.storage_type == 'mongodb':
+            self._flush_mongo_ops()
+        
+        flushed = 0
+        with self._metric_flush_lock:
+            while self._metric_queue:
+                batch = []
+                while self._metric_queue and len(batch) < self.metric_batch_size:
+                    batch.append(self._metric_queue.popleft())
+                
+                try:
+                    self._write_metric_batch(batch)
+                    flushed += len(batch)
+                except Exception as e:
+                    # Put the batch back at the front, in order, so the next flush retries it
+                    self._metric_queue.extendleft(reversed(batch))
+                    logger.error(f"Failed to flush {len(batch)} metrics, will retry: {e}")
+                    break
+        
+        return flushed
+    
+    def _write_metric_batch(self, batch: List[Dict[str, Any]]):
+        """Write a batch of queued metrics in one round-trip"""
+        if self.storage_type == 'postgresql' and self.engine.dialect.driver in ('psycopg2', 'psycopg'):
+            self._copy_metric_batch(batch)
+            
+        elif self.storage_type == 'postgresql':
+            session = self.Session()
+            try:
+                session.bulk_insert_mappings(MetricModel, batch)
+                session.commit()
+            except Exception:
+                session.rollback()
+                raise
+            finally:
+                session.close()
+            
+        elif self.storage_type == 'mongodb':
+            self.metrics_collection.insert_many(batch, ordered=False)
+            
+        elif self.storage_type == 'redis':
+            # One stream per metric name, with entry IDs taken from the metric's own timestamp so
+            # range queries and MINID trims follow metric time; approximate MAXLEN bounds retention
+            entries = []
+            for metric_data in batch:
+                timestamp_ms = _to_epoch_ms(metric_data.get('timestamp'))
+                entries.append((timestamp_ms is None, timestamp_ms or 0,
+                                f"stream:metric:{metric_data['metric_name']}",
+                                {'data': self._redis_dumps(metric_data)}))
+            # Stream IDs must increase, so add each stream's samples oldest first
+            entries.sort(key=lambda entry: entry[:2])
+            
+            pipe = self.connection.pipeline(transaction=False)
+            for untimed, timestamp_ms, key, fields in entries:
+                pipe.xadd(key, fields, id='*' if untimed else f"{timestamp_ms}-*",
+                          maxlen=self.metric_stream_maxlen, approximate=True)
+            results = pipe.execute(raise_on_error=False)
+            
+            # A sample older than its stream's newest entry can't take its own time as ID;
+            # keep it under its arrival time rather than dropping it
+            late = [(key, fields) for (_, _, key, fields), result in zip(entries, results)
+                    if isinstance(result, Exception)]
+            if late:
+                pipe = self.connection.pipeline(transaction=False)
+                for key, fields in late:
+                    pipe.xadd(key, fields, maxlen=self.metric_stream_maxlen, approximate=True)
+                pipe.execute()
+                logger.warning(f"Stored {len(late)} out-of-order metrics under their arrival time")
+    
+    def _copy_metric_batch(self, batch: List[Dict[str, Any]]):
+        """Append metrics with COPY FROM STDIN instead of parameterized INSERTs"""
+        buffer = io.StringIO()
+        # None is written as an empty field; FORCE_NULL maps it back to NULL
+        writer = csv.writer(buffer, quoting=csv.QUOTE_NONNUMERIC, lineterminator='\n')
+        now = datetime.utcnow()
+        
+        for metric in batch:
+            timestamp = metric.get('timestamp') or now
+            if isinstance(timestamp, (int, float)):
+                timestamp = datetime.utcfromtimestamp(timestamp)
+            tags = metric.get('tags')
+            writer.writerow((
+                str(metric.get('id') or uuid.uuid4()),
+                metric['metric_name'],
+                float(metric['metric_value']),
+                orjson.dumps(tags).decode() if tags is not None else None,
+                metric.get('source'),
+                timestamp.isoformat() if isinstance(timestamp, datetime) else timestamp
+            ))
+        buffer.seek(0)
+        
+        raw = self.engine.raw_connection()
+        try:
+            with raw.cursor() as cursor:
+                if hasattr(cursor, 'copy_expert'):  # psycopg2
+                    cursor.copy_expert(METRICS_COPY_SQL, buffer)
+                else:  # psycopg 3
+                    with cursor.copy(METRICS_COPY_SQL) as copy:
+                        copy.write(buffer.getvalue())
+            raw.commit()
+        except Exception:
+            raw.rollback()
+            raise
+        finally:
+            raw.close()
+    
+    def create_indexes_concurrently(self, statements: List[str]) -> List[str]:
+        """Run index DDL in autocommit mode so CONCURRENTLY builds don't lock out writers"""
+        applied = []
+        # PostgreSQL can't build an index concurrently on a partitioned parent table
+        partitioned = self._metrics_partitioned()
+        
+        with self.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            for index_sql in statements:
+                if partitioned and ' ON metrics' in index_sql:
+                    index_sql = index_sql.replace(' CONCURRENTLY', '')
+                try:
+                    conn.execute(sa.text(index_sql))
+                    applied.append(index_sql)
+                except Exception as e:
+                    logger.error(f"Failed to run index DDL '{index_sql}': {e}")
+            
+            # A failed concurrent build leaves an invalid index that IF NOT EXISTS will skip over
+            invalid = conn.execute(sa.text(
+                "SELECT indexrelid::regclass::text, pg_relation_size(indexrelid) FROM pg_index WHERE NOT indisvalid"
+            )).all()
+        
+        for index_name, size in invalid:
+            logger.warning(f"Index {index_name} ({size} bytes) is invalid after a failed concurrent build; drop and recreate it")
+        
+        return applied
+    
+    def _metrics_partitioned(self) -> bool:
+        """Whether the metrics table was created as a partitioned table"""
+        with self.engine.connect() as conn:
+            return conn.execute(sa.text(
+                "SELECT 1 FROM pg_partitioned_table WHERE partrelid = 'metrics'::regclass"
+            )).first() is not None
+    
+    def ensure_metric_partitions(self):
+        """Create daily metric partitions from today through partition_days_ahead"""
+        try:
+            if not self._metrics_partitioned():
+                return
+            
+            with self.engine.begin() as conn:
+                conn.execute(sa.text("CREATE TABLE IF NOT EXISTS metrics_default PARTITION OF metrics DEFAULT"))
+            
+            today = datetime.utcnow().date()
+            for offset in range(self.partition_days_ahead + 1):
+                # One transaction per day, so a failing day doesn't undo the others
+                try:
+                    self._create_metric_partition(today + timedelta(days=offset))
+                except Exception as e:
+                    logger.error(f"Failed to create metric partition for {today + timedelta(days=offset)}: {e}")
+        except Exception as e:
+            logger.error(f"Failed to create metric partitions: {e}")
+        finally:
+            self._partitions_checked_at = time.monotonic()
+    
+    def _create_metric_partition(self, day):
+        """Create one day's partition, moving rows that already landed in metrics_default into it"""
+        name = f"metrics_{day:%Y_%m_%d}"
+        bounds = {'lo': day.isoformat(), 'hi': (day + timedelta(days=1)).isoformat()}
+        with self.engine.begin() as conn:
+            if conn.execute(sa.text("SELECT to_regclass(:name)"), {'name': name}).scalar() is not None:
+                return
+            
+            stray = conn.execute(sa.text(
+                "SELECT EXISTS (SELECT 1 FROM metrics_default WHERE timestamp >= :lo AND timestamp < :hi)"
+            ), bounds).scalar()
+            if not stray:
+                conn.execute(sa.text(
+                    f"CREATE TABLE {name} PARTITION OF metrics "
+                    f"FOR VALUES FROM ('{bounds['lo']}') TO ('{bounds['hi']}')"
+                ))
+                return
+            
+            # PostgreSQL rejects a new partition whose range the default partition already holds rows for
+            conn.execute(sa.text(f"CREATE TABLE {name} (LIKE metrics INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+            conn.execute(sa.text(
+                f"WITH moved AS (DELETE FROM metrics_default WHERE timestamp >= :lo AND timestamp < :hi RETURNING *) "
+                f"INSERT INTO {name} SELECT * FROM moved"
+            ), bounds)
+            conn.execute(sa.text(
+                f"ALTER TABLE metrics ATTACH PARTITION {name} "
+                f"FOR VALUES FROM ('{bounds['lo']}') TO ('{bounds['hi']}')"
+            ))
+            logger.info(f"Moved default-partition metrics into {name}")
+    
+    def _delete_in_batches(self, table: str, key: str, condition: str, order_by: str,
+                           cutoff_date: datetime) -> int:
+        """Delete matching rows delete_batch_size at a time, committing after each batch"""
+        sql = sa.text(
+            f"DELETE FROM {table} WHERE {key} IN "
+            f"(SELECT {key} FROM {table} WHERE {condition} ORDER BY {order_by} LIMIT :batch_size)"
+        )
+        total = 0
+        while True:
+            started = time.perf_counter()
+            with self.engine.begin() as conn:
+                deleted = conn.execute(sql, {'cutoff': cutoff_date, 'batch_size': self.delete_batch_size}).rowcount
+            total += deleted
+            logger.debug(f"Cleanup of {table}: rows_deleted={deleted} "
+                         f"elapsed_ms={(time.perf_counter() - started) * 1000:.1f}")
+            if deleted < self.delete_batch_size:
+                break
+        
+        if total:
+            logger.info(f"Deleted {total} old rows from {table}")
+        return total
+    
+    def _drop_metric_partitions(self, cutoff_date: datetime):
+        """Drop daily metric partitions that end before cutoff_date"""
+        with self.engine.begin() as conn:
+            partitions = conn.execute(sa.text(
+                "SELECT c.relname FROM pg_inherits i "
+                "JOIN pg_class c ON c.oid = i.inhrelid "
+                "WHERE i.inhparent = 'metrics'::regclass"
+            )).scalars().all()
+            
+            for name in partitions:
+                try:
+                    day = datetime.strptime(name, 'metrics_%Y_%m_%d')
+                except ValueError:
+                    continue  # default partition
+                if day + timedelta(days=1) <= cutoff_date:
+                    conn.execute(sa.text(f'DROP TABLE IF EXISTS "{name}"'))
+    
     def get_metrics(self, metric_name: str, since: Optional[datetime] = None,
                    until: Optional[datetime] = None, limit: int = 1000) -> List[Dict[str, Any]]:
         """Get metrics within time range"""
         try:
+            if self._metric_queue:
+                self.flush()
+            
             if self.storage_type == 'postgresql':
-                query = self.session.query(MetricModel).filter_by(metric_name=metric_name)
+                metrics = MetricModel.__table__
+                stmt = select(metrics).where(metrics.c.metric_name == metric_name)
                 
                 if since:
-                    query = query.filter(MetricModel.timestamp >= since)
+                    stmt = stmt.where(metrics.c.timestamp >= since)
                 if until:
-                    query = query.filter(MetricModel.timestamp <= until)
+                    stmt = stmt.where(metrics.c.timestamp <= until)
                 
-                metrics = query.order_by(MetricModel.timestamp.desc()).limit(limit).all()
-                return [self._model_to_dict(metric) for metric in metrics]
+                return self._select_rows(stmt.order_by(metrics.c.timestamp.desc()).limit(limit))
                 
             elif self.storage_type == 'mongodb':
                 filter_dict = {"metric_name": metric_name}
@@ -552,57 +1483,40 @@ class DatabaseManager:
                 return metrics
                 
             elif self.storage_type == 'redis':
-                metrics = []
-                pattern = f"metric:{metric_name}:*"
+                # Stream IDs carry each metric's millisecond timestamp, so Redis filters the range
+                entries = self.connection.xrevrange(
+                    f"stream:metric:{metric_name}",
+                    max=_to_epoch_ms(until) if until else '+',
+                    min=_to_epoch_ms(since) if since else '-',
+                    count=limit
+                )
+                return [orjson.loads(fields['data']) for _, fields in entries]
                 
-                for key in self.connection.scan_iter(match=pattern):
-                    metric_data = self.connection.hgetall(key)
-                    
-                    # Filter by time range if specified
-                    metric_time = metric_data.get('timestamp')
-                    if metric_time:
-                        try:
-                            metric_timestamp = datetime.fromisoformat(metric_time)
-                            if since and metric_timestamp < since:
-                                continue
-                            if until and metric_timestamp > until:
-                                continue
-                        except:
-                            continue
-                    
-                    metrics.append(dict(metric_data))
+            else:  # memory
+                # Per-name series of (timestamp_ms, metric) in arrival order; walk newest first and stop at limit
+                series = self.memory_store['metrics'].get(metric_name, ())
                 
-                # Sort and limit
-                metrics.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
-                return metrics[:limit]
+                if not (since or until):
+                    return [metric for _, metric in islice(reversed(series), limit)]
                 
-            else:  # memory
-                metrics = [m for m in self.memory_store['metrics'] 
-                          if m.get('metric_name') == metric_name]
+                since_ms = _to_epoch_ms(since) if since else None
+                until_ms = _to_epoch_ms(until) if until else None
                 
-                if since or until:
-                    filtered_metrics = []
-                    for metric in metrics:
-                        metric_time = metric.get('timestamp')
-                        if isinstance(metric_time, str):
-                            try:
-                                metric_timestamp = datetime.fromisoformat(metric_time)
-                            except:
-                                continue
-                        else:
-                            metric_timestamp = metric_time
-                        
-                        if since and metric_timestamp < since:
-                            continue
-                        if until and metric_timestamp > until:
-                            continue
-                        
-                        filtered_metrics.append(metric)
+                filtered_metrics = []
+                for timestamp_ms, metric in reversed(series):
+                    if timestamp_ms is None:
+                        continue
+                    # Arrival order isn't time order (backfills, late batches), so check every sample
+                    if until_ms is not None and timestamp_ms > until_ms:
+                        continue
+                    if since_ms is not None and timestamp_ms < since_ms:
+                        continue
                     
-                    metrics = filtered_metrics
+                    filtered_metrics.append(metric)
+                    if len(filtered_metrics) >= limit:
+                        break
                 
-                metrics.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
-                return metrics[:limit]
+                return filtered_metrics
                 
         except Exception as e:
             logger.error(f"Failed to get metrics: {e}")
@@ -611,23 +1525,29 @@ class DatabaseManager:
     def cleanup_old_data(self, retention_days: int = 7):
         """Clean up old data"""
         try:
+            with self._cache_lock:
+                self._task_cache.clear()
             cutoff_date = datetime.utcnow() - timedelta(days=retention_days)
             
             if self.storage_type == 'postgresql':
-                # Clean old metrics
-                self.session.query(MetricModel).filter(
-                    MetricModel.timestamp < cutoff_date
-                ).delete()
+                self._drain_writes()
+                # Clean old metrics: drop whole daily partitions, delete only the remainder
+                if self._metrics_partitioned():
+                    self._drop_metric_partitions(cutoff_date)
+                    self.ensure_metric_partitions()
                 
-                # Clean old completed tasks
-                self.session.query(TaskModel).filter(
-                    TaskModel.completed_at < cutoff_date,
-                    TaskModel.status.in_(['completed', 'failed', 'cancelled'])
-                ).delete()
+                self._delete_in_batches(
+                    'metrics', 'id', "timestamp < :cutoff", 'timestamp', cutoff_date)
                 
-                self.session.commit()
+                # Clean old completed tasks
+                self._delete_in_batches(
+                    'tasks', 'task_id',
+                    "completed_at < :cutoff AND status IN ('completed', 'failed', 'cancelled')",
+                    'completed_at', cutoff_date)
                 
             elif self.storage_type == 'mongodb':
+                self._flush_mongo_ops()
+                
                 # Clean old metrics
                 self.connection.metrics.delete_many({
                     "timestamp": {"$lt": cutoff_date}
@@ -640,46 +1560,47 @@ class DatabaseManager:
                 })
                 
             elif self.storage_type == 'redis':
-                # Redis handles TTL automatically for metrics
+                # Trim metric streams by entry ID (the metric's millisecond timestamp)
+                cutoff_ms = int((time.time() - retention_days * 86400) * 1000)
+                pipe = self.connection.pipeline(transaction=False)
+                for key in self.connection.scan_iter(match="stream:metric:*", count=500):
+                    pipe.xtrim(key, minid=cutoff_ms, approximate=True)
+                pipe.execute()
+                
                 # Clean old tasks
-                for key in self.connection.scan_iter(match="task:*"):
-                    task_data = self.connection.hgetall(key)
-                    completed_at = task_data.get('completed_at')
-                    if completed_at:
-                        try:
-                            completed_time = datetime.fromisoformat(completed_at)
-                            if completed_time < cutoff_date:
-                                self.connection.delete(key)
-                        except:
-                            pass
+                expired = []
+                cutoff_ms = _to_epoch_ms(cutoff_date)
+                for key, task_data in self._redis_scan_records("task:*"):
+                    completed_ms = _to_epoch_ms(task_data.get('completed_at'))
+                    if completed_ms is not None and completed_ms < cutoff_ms:
+                        expired.append(key)
+                
+                if expired:
+                    self.connection.delete(*expired)
                 
             else:  # memory
-                cutoff_timestamp = cutoff_date.timestamp()
+                cutoff_ms = _to_epoch_ms(cutoff_date)
                 
-                # Clean old metrics
-                self.memory_store['metrics'] = [
-                    m for m in self.memory_store['metrics']
-                    if m.get('timestamp', cutoff_timestamp + 1) > cutoff_timestamp
-                ]
+                # Clean old metrics (samples without a parseable timestamp are kept)
+                for name, series in list(self.memory_store['metrics'].items()):
+                    kept = deque(
+                        (sample for sample in series if (sample[0] or cutoff_ms) >= cutoff_ms),
+                        maxlen=series.maxlen
+                    )
+                    if kept:
+                        self.memory_store['metrics'][name] = kept
+                    else:
+                        del self.memory_store['metrics'][name]
                 
                 # Clean old tasks
                 tasks_to_keep = {}
                 for task_id, task in self.memory_store['tasks'].items():
-                    completed_at = task.get('completed_at')
-                    if completed_at:
-                        try:
-                            if isinstance(completed_at, str):
-                                completed_time = datetime.fromisoformat(completed_at)
-                            else:
-                                completed_time = completed_at
-                            
-                            if completed_time >= cutoff_date:
-                                tasks_to_keep[task_id] = task
-                        except:
-                            tasks_to_keep[task_id] = task
-                    else:
+                    completed_ms = _to_epoch_ms(task.get('completed_at'))
+                    if completed_ms is None or completed_ms >= cutoff_ms:
                         tasks_to_keep[task_id] = task
                 
+                for task_id in self.memory_store['tasks'].keys() - tasks_to_keep.keys():
+                    self._unindex_task(task_id)
                 self.memory_store['tasks'] = tasks_to_keep
             
             logger.info(f"Cleaned up data older than {retention_days} days")
@@ -687,25 +1608,56 @@ class DatabaseManager:
         except Exception as e:
             logger.error(f"Failed to cleanup old data: {e}")
     
+    @staticmethod
+    def _redis_dumps(record: Dict[str, Any]) -> bytes:
+        """Serialize a whole record once; hash fields can't hold nested values"""
+        return orjson.dumps(record, default=str)
+    
+    def _redis_scan_records(self, pattern: str, count: int = 500) -> List[tuple]:
+        """Fetch all records matching pattern with a single MGET"""
+        keys = list(self.connection.scan_iter(match=pattern, count=count))
+        if not keys:
+            return []
+        
+        return [(key, orjson.loads(raw)) for key, raw in zip(keys, self.connection.mget(keys)) if raw]
+    
+    def _select_rows(self, stmt) -> List[Dict[str, Any]]:
+        """Stream a Core SELECT into plain dicts, skipping ORM hydration"""
+        result = self.session.execute(stmt.execution_options(yield_per=self.read_batch_size))
+        return [self._row_to_dict(row) for row in result.mappings()]
+    
+    @staticmethod
+    def _row_to_dict(row) -> Dict[str, Any]:
+        """Convert a Core row mapping to a plain dict with ISO datetimes"""
+        return {k: v.isoformat() if isinstance(v, datetime) else v for k, v in row.items()}
+    
     def _model_to_dict(self, model) -> Dict[str, Any]:
         """Convert SQLAlchemy model to dictionary"""
         if not model:
             return None
         
         result = {}
-        for column in model.__table__.columns:
-            value = getattr(model, column.name)
-            if isinstance(value, datetime):
-                value = value.isoformat()
-            result[column.name] = value
+        for name, is_datetime in _cols(type(model)):
+            value = getattr(model, name)
+            result[name] = value.isoformat() if is_datetime and value else value
         
         return result
     
     def close(self):
         """Close database connections"""
         try:
+            self._running = False
+            self._flush_wakeup.set()
+            self.flush()
+            self._drain_writes()
+            self.flush_writes()
+            
             if self.storage_type == 'postgresql' and self.session:
-                self.session.close()
+                with self._pending_writes_lock:
+                    for pending in self._pending_writes:
+                        pending.session.close()
+                    self._pending_writes.clear()
+                self.session.remove()
             elif self.storage_type == 'redis' and self.connection:
                 self.connection.close()
             elif self.storage_type == 'mongodb' and self.connection:
@@ -720,86 +1672,232 @@ class PerformanceOptimizer:
     def __init__(self, database_manager: DatabaseManager):
         self.db = database_manager
         self.optimization_rules = []
+        self._health_cache = TTLCache(maxsize=1, ttl=5)
+        # Scanning every socket is by far the slowest probe, so its count is kept longer
+        self._connections_cache = TTLCache(maxsize=1, ttl=60)
+        self._report_cache = None  # (tasks version, task analysis)
+        self.maintenance_interval = database_manager.config.get('storage', {}).get('maintenance_interval', 3600)
+        self._maintained_at = None
+        self._last_optimization = None
+        self.view_refresh_interval = database_manager.config.get('storage', {}).get('postgresql', {}).get(
+            'view_refresh_interval', 300)
+        self._view_refreshed_at = None
+        if PSUTIL_AVAILABLE:
+            # cpu_percent(interval=None) reports usage since the previous call; prime it here
+            psutil.cpu_percent(interval=None)
         
     def analyze_task_patterns(self, days: int = 7) -> Dict[str, Any]:
         """Analyze task execution patterns for optimization"""
         since = datetime.utcnow() - timedelta(days=days)
         
-        # Get recent tasks
-        completed_tasks = self.db.get_tasks_by_status('completed', limit=10000)
-        failed_tasks = self.db.get_tasks_by_status('failed', limit=1000)
-        
         analysis = {
             'task_types': defaultdict(int),
-            'execution_times': defaultdict(list),
+            'avg_execution_times': {},
+            'execution_time_histograms': defaultdict(lambda: [0] * (len(EXECUTION_TIME_BUCKETS) + 1)),
             'failure_patterns': defaultdict(int),
             'node_performance': defaultdict(lambda: {'completed': 0, 'failed': 0, 'total_time': 0}),
             'peak_hours': defaultdict(int),
+            'total_completed': 0,
+            'total_failed': 0,
             'recommendations': []
         }
         
-        # Analyze completed tasks
-        for task in completed_tasks:
-            task_type = task.get('task_type', 'unknown')
-            execution_time = task.get('execution_time', 0)
-            node_id = task.get('node_id')
+        if self.db.storage_type == 'postgresql':
+            self._aggregate_tasks_sql(analysis, since)
+        elif PANDAS_AVAILABLE:
+            self._aggregate_tasks_pandas(analysis)
+        else:
+            self._aggregate_tasks_python(analysis)
+        
+        # Generate recommendations
+        analysis['recommendations'] = self._generate_performance_recommendations(analysis)
+        
+        return analysis
+    
+    def _aggregate_tasks_sql(self, analysis: Dict[str, Any], since: datetime):
+        """Aggregate task statistics inside PostgreSQL, from the hourly mv_task_perf rollup"""
+        self.db._drain_writes()
+        self.refresh_task_perf_view()
+        params = {'since': since.replace(minute=0, second=0, microsecond=0)}
+        
+        queries = {
+            'task_types': ((
+                "SELECT task_type, SUM(task_count), SUM(total_time) / NULLIF(SUM(timed_count), 0) FROM mv_task_perf "
+                "WHERE status = 'completed' AND hour >= :since GROUP BY task_type"
+            ), params),
+            'node_performance': ((
+                "SELECT node_id, status, SUM(task_count), COALESCE(SUM(total_time), 0) FROM mv_task_perf "
+                "WHERE status IN ('completed', 'failed') AND node_id <> '' AND hour >= :since "
+                "GROUP BY node_id, status"
+            ), params),
+            'peak_hours': ((
+                "SELECT EXTRACT(hour FROM hour)::int AS hour_of_day, SUM(task_count) FROM mv_task_perf "
+                "WHERE status = 'completed' AND hour >= :since GROUP BY hour_of_day"
+            ), params),
+            # width_bucket over the same bounds matches bisect_right on the Python path
+            'histograms': ((
+                "SELECT task_type, width_bucket(execution_time, CAST(:bounds AS double precision[])) AS bucket, "
+                "COUNT(*) FROM tasks WHERE status = 'completed' AND execution_time IS NOT NULL "
+                "AND created_at >= :since GROUP BY task_type, bucket"
+            ), {'since': since, 'bounds': list(EXECUTION_TIME_BUCKETS)}),
+            # Group on the integer error code; the window sum still counts failures past the top K.
+            # The hour-aligned bound matches the rollup's window, so failure rates compare like with like
+            'failure_patterns': ((
+                "SELECT COALESCE(e.sample_message, t.error_message) AS message, COUNT(*) AS n, SUM(COUNT(*)) OVER () "
+                "FROM tasks t LEFT JOIN error_codes e ON e.id = t.error_code_id "
+                "WHERE t.status = 'failed' AND t.created_at >= :since "
+                "GROUP BY t.error_code_id, COALESCE(e.sample_message, t.error_message) ORDER BY n DESC LIMIT :top"
+            ), {**params, 'top': 50}),
+        }
+        
+        # The queries are independent, so run them on separate pooled connections at once
+        with ThreadPoolExecutor(max_workers=len(queries)) as executor:
+            futures = {name: executor.submit(self._fetch_rows, sql, query_params)
+                       for name, (sql, query_params) in queries.items()}
+            results = {name: future.result() for name, future in futures.items()}
+        
+        for task_type, count, avg_time in results['task_types']:
+            task_type = task_type or 'unknown'
+            analysis['task_types'][task_type] = int(count)
+            analysis['total_completed'] += int(count)
+            if avg_time is not None:
+                analysis['avg_execution_times'][task_type] = float(avg_time)
+        
+        for node_id, status, count, total_time in results['node_performance']:
+            stats = analysis['node_performance'][node_id]
+            stats[status] = int(count)
+            if status == 'completed':
+                stats['total_time'] = float(total_time)
+        
+        for hour, count in results['peak_hours']:
+            analysis['peak_hours'][hour] = int(count)
+        
+        for task_type, bucket, count in results['histograms']:
+            analysis['execution_time_histograms'][task_type or 'unknown'][bucket] = count
+        
+        for error_message, count, total_failed in results['failure_patterns']:
+            analysis['failure_patterns'][error_message or 'unknown error'] += count
+            analysis['total_failed'] = int(total_failed)
+    
+    def _fetch_rows(self, sql: str, params: Dict[str, Any]) -> List[tuple]:
+        """Run one read-only query on its own pooled connection"""
+        with self.db.engine.connect() as conn:
+            return conn.execute(sa.text(sql), params).all()
+    
+    def refresh_task_perf_view(self, force: bool = False):
+        """Create mv_task_perf if needed and refresh it once view_refresh_interval has passed"""
+        now = time.monotonic()
+        if not force and self._view_refreshed_at is not None and \
+                now - self._view_refreshed_at < self.view_refresh_interval:
+            return
+        
+        try:
+            # CONCURRENTLY keeps the view readable during refresh but can't run inside a transaction
+            with self.db.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+                for view_sql in TASK_PERF_VIEW_SQL:
+                    conn.execute(sa.text(view_sql))
+                conn.execute(sa.text("REFRESH MATERIALIZED VIEW CONCURRENTLY mv_task_perf"))
+            self._view_refreshed_at = now
+        except Exception as e:
+            logger.error(f"Failed to refresh task performance view: {e}")
+    
+    def _aggregate_tasks_pandas(self, analysis: Dict[str, Any]):
+        """Aggregate task statistics client-side with columnar groupbys instead of per-row loops"""
+        completed = pd.DataFrame.from_records(
+            self.db.iter_tasks_by_status('completed', limit=10000,
+                                         columns=['task_type', 'execution_time', 'node_id', 'created_at']),
+            columns=['task_type', 'execution_time', 'node_id', 'created_at'])
+        failed = pd.DataFrame.from_records(
+            self.db.iter_tasks_by_status('failed', limit=1000, columns=['error_message', 'node_id']),
+            columns=['error_message', 'node_id'])
+        
+        completed['task_type'] = completed['task_type'].fillna('unknown')
+        completed['execution_time'] = pd.to_numeric(completed['execution_time'], errors='coerce').fillna(0)
+        analysis['total_completed'] = len(completed)
+        analysis['task_types'].update({k: int(v) for k, v in completed.groupby('task_type').size().items()})
+        
+        timed = completed[completed['execution_time'] != 0]
+        analysis['avg_execution_times'].update(
+            {k: float(v) for k, v in timed.groupby('task_type')['execution_time'].mean().items()})
+        buckets = np.searchsorted(EXECUTION_TIME_BUCKETS, timed['execution_time'].to_numpy(), side='right')
+        for (task_type, bucket), count in timed.groupby([timed['task_type'], buckets]).size().items():
+            analysis['execution_time_histograms'][task_type][int(bucket)] = int(count)
+        
+        with_node = completed[completed['node_id'].notna() & (completed['node_id'] != '')]
+        for node_id, row in with_node.groupby('node_id')['execution_time'].agg(['count', 'sum']).iterrows():
+            analysis['node_performance'][node_id]['completed'] = int(row['count'])
+            analysis['node_performance'][node_id]['total_time'] = float(row['sum'])
+        
+        # created_at mixes epoch numbers, datetimes and ISO strings; normalize like the loop path does
+        hours = completed['created_at'].map(_utc_hour, na_action='ignore')
+        analysis['peak_hours'].update({int(k): int(v) for k, v in hours.dropna().value_counts().items()})
+        
+        analysis['total_failed'] = len(failed)
+        analysis['failure_patterns'].update(
+            {k: int(v) for k, v in failed['error_message'].fillna('unknown error').value_counts().items()})
+        failed_nodes = failed['node_id'][failed['node_id'].notna() & (failed['node_id'] != '')]
+        for node_id, count in failed_nodes.value_counts().items():
+            analysis['node_performance'][node_id]['failed'] = int(count)
+    
+    def _aggregate_tasks_python(self, analysis: Dict[str, Any]):
+        """Aggregate task statistics client-side for backends without SQL"""
+        completed_tasks = self.db.iter_tasks_by_status(
+            'completed', limit=10000, columns=['task_type', 'execution_time', 'node_id', 'created_at'])
+        failed_tasks = self.db.iter_tasks_by_status(
+            'failed', limit=1000, columns=['error_message', 'node_id'])
+        time_totals = defaultdict(lambda: [0.0, 0])
+        
+        # Analyze completed tasks; rows are (task_type, execution_time, node_id, created_at) tuples
+        for task_type, execution_time, node_id, created_at in completed_tasks:
+            task_type = task_type or 'unknown'
+            execution_time = execution_time or 0
             
             analysis['task_types'][task_type] += 1
+            analysis['total_completed'] += 1
             
             if execution_time:
-                analysis['execution_times'][task_type].append(execution_time)
+                time_totals[task_type][0] += execution_time
+                time_totals[task_type][1] += 1
+                analysis['execution_time_histograms'][task_type][
+                    bisect.bisect_right(EXECUTION_TIME_BUCKETS, execution_time)] += 1
             
             if node_id:
                 analysis['node_performance'][node_id]['completed'] += 1
                 analysis['node_performance'][node_id]['total_time'] += execution_time
             
             # Extract hour from created_at for peak analysis
-            created_at = task.get('created_at')
-            if created_at:
-                try:
-                    if isinstance(created_at, str):
-                        created_time = datetime.fromisoformat(created_at)
-                    else:
-                        created_time = created_at
-                    analysis['peak_hours'][created_time.hour] += 1
-                except:
-                    pass
+            hour = _utc_hour(created_at)
+            if hour is not None:
+                analysis['peak_hours'][hour] += 1
+        
+        for task_type, (total, count) in time_totals.items():
+            analysis['avg_execution_times'][task_type] = total / count
         
         # Analyze failed tasks
-        for task in failed_tasks:
-            error_message = task.get('error_message', 'unknown error')
-            node_id = task.get('node_id')
+        for error_message, node_id in failed_tasks:
+            error_message = error_message or 'unknown error'
             
             analysis['failure_patterns'][error_message] += 1
+            analysis['total_failed'] += 1
             
             if node_id:
                 analysis['node_performance'][node_id]['failed'] += 1
-        
-        # Generate recommendations
-        analysis['recommendations'] = self._generate_performance_recommendations(analysis)
-        
-        return analysis
     
     def _generate_performance_recommendations(self, analysis: Dict[str, Any]) -> List[str]:
         """Generate performance optimization recommendations"""
         recommendations = []
         
         # Check for slow task types
-        for task_type, times in analysis['execution_times'].items():
-            if times:
-                avg_time = sum(times) / len(times)
-                if avg_time > 300:  # 5 minutes
-                    recommendations.append(
-                        f"Task type '{task_type}' has high average execution time ({avg_time:.1f}s). "
-                        f"Consider optimizing or adding more specialized nodes."
-                    )
+        for task_type, avg_time in analysis['avg_execution_times'].items():
+            if avg_time > 300:  # 5 minutes
+                recommendations.append(
+                    f"Task type '{task_type}' has high average execution time ({avg_time:.1f}s). "
+                    f"Consider optimizing or adding more specialized nodes."
+                )
         
         # Check for high failure rates
-        total_tasks = sum(analysis['task_types'].values())
-        total_failures = sum(count for count in analysis['failure_patterns'].values())
-        
-        if total_tasks > 0:
-            failure_rate = total_failures / total_tasks
+        if analysis['total_completed'] > 0:
+            failure_rate = analysis['total_failed'] / analysis['total_completed']
             if failure_rate > 0.1:  # 10% failure rate
                 recommendations.append(
                     f"High task failure rate ({failure_rate:.1%}). "
@@ -807,17 +1905,17 @@ class PerformanceOptimizer:
                 )
         
         # Check for unbalanced node performance
-        node_performances = {}
-        for node_id, stats in analysis['node_performance'].items():
+        active_nodes, max_success, min_success = 0, 0.0, 1.0
+        for stats in analysis['node_performance'].values():
             total_tasks = stats['completed'] + stats['failed']
             if total_tasks > 10:  # Only consider nodes with significant activity
                 success_rate = stats['completed'] / total_tasks
-                avg_time = stats['total_time'] / stats['completed'] if stats['completed'] > 0 else 0
-                node_performances[node_id] = {'success_rate': success_rate, 'avg_time': avg_time}
+                active_nodes += 1
+                max_success = max(max_success, success_rate)
+                min_success = min(min_success, success_rate)
         
-        if len(node_performances) > 1:
-            success_rates = [p['success_rate'] for p in node_performances.values()]
-            if max(success_rates) - min(success_rates) > 0.2:  # 20% difference
+        if active_nodes > 1:
+            if max_success - min_success > 0.2:  # 20% difference
                 recommendations.append(
                     "Significant performance variation between nodes detected. "
                     "Consider load rebalancing or node health investigation."
@@ -825,10 +1923,14 @@ class PerformanceOptimizer:
         
         # Check for peak hour patterns
         if analysis['peak_hours']:
-            max_hour = max(analysis['peak_hours'], key=analysis['peak_hours'].get)
-            min_hour = min(analysis['peak_hours'], key=analysis['peak_hours'].get)
+            max_hour, max_count, min_count = None, -1, float('inf')
+            for hour, count in analysis['peak_hours'].items():
+                if count > max_count:
+                    max_hour, max_count = hour, count
+                if count < min_count:
+                    min_count = count
             
-            if analysis['peak_hours'][max_hour] > analysis['peak_hours'][min_hour] * 3:
+            if max_count > min_count * 3:
                 recommendations.append(
                     f"Peak usage detected at hour {max_hour}. "
                     f"Consider auto-scaling or pre-scaling resources during peak hours."
@@ -846,22 +1948,44 @@ class PerformanceOptimizer:
         
         if self.db.storage_type == 'postgresql':
             # Create additional indexes for common queries
+            # INCLUDE columns let the recent-tasks and analysis queries run as index-only scans
             indexes_to_create = [
-                "CREATE INDEX IF NOT EXISTS idx_tasks_status_created ON tasks(status, created_at DESC);",
-                "CREATE INDEX IF NOT EXISTS idx_tasks_node_status ON tasks(node_id, status);",
-                "CREATE INDEX IF NOT EXISTS idx_metrics_name_timestamp ON metrics(metric_name, timestamp DESC);",
-                "CREATE INDEX IF NOT EXISTS idx_nodes_status_heartbeat ON nodes(status, last_heartbeat);"
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_tasks_status_created_incl ON tasks(status, created_at DESC) "
+                "INCLUDE (node_id, task_type, execution_time);",
+                "DROP INDEX CONCURRENTLY IF EXISTS idx_tasks_status_created;",
+                "DROP INDEX CONCURRENTLY IF EXISTS idx_tasks_performance;",
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_tasks_status_node_type_exec ON tasks(status, node_id, task_type) "
+                "INCLUDE (execution_time, created_at);",
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_tasks_node_status ON tasks(node_id, status);",
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_tasks_created_id ON tasks(created_at, task_id);",
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_tasks_failed_error_code ON tasks(error_code_id) "
+                "WHERE status = 'failed';",
+                "DROP INDEX CONCURRENTLY IF EXISTS idx_tasks_failed_error;",
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_metrics_name_timestamp ON metrics(metric_name, timestamp DESC);",
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_nodes_status_heartbeat ON nodes(status, last_heartbeat);",
+                # Retention cleanup scans completed_at ranges; BRIN covers them at a fraction of a btree's size
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_tasks_completed_brin ON tasks USING BRIN(completed_at);",
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_tasks_created_brin ON tasks USING BRIN(created_at);",
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_metrics_timestamp_brin ON metrics USING BRIN(timestamp) "
+                "WITH (pages_per_range = 32);"
             ]
             
             try:
-                for index_sql in indexes_to_create:
-                    self.db.session.execute(index_sql)
-                    optimization_results['indexes_created'].append(index_sql)
-                
-                self.db.session.commit()
+                optimization_results['indexes_created'].extend(
+                    self.db.create_indexes_concurrently(indexes_to_create))
                 
             except Exception as e:
                 logger.error(f"Failed to create database indexes: {e}")
+            
+            # Indexes never scanned since the last stats reset only cost writes; surface them for review
+            try:
+                optimization_results['unused_indexes'] = self.db.session.execute(sa.text(
+                    "SELECT indexrelname FROM pg_stat_user_indexes s JOIN pg_index i USING (indexrelid) "
+                    "WHERE s.relname IN ('tasks', 'nodes', 'metrics') AND s.idx_scan = 0 "
+                    "AND NOT i.indisunique AND NOT i.indisprimary"
+                )).scalars().all()
+            except Exception as e:
+                logger.error(f"Failed to audit index usage: {e}")
         
         elif self.db.storage_type == 'mongodb':
             # MongoDB indexes are created in _create_mongodb_indexes
@@ -874,14 +1998,55 @@ class PerformanceOptimizer:
         except Exception as e:
             logger.error(f"Failed to cleanup old data: {e}")
         
+        if self.db.storage_type == 'postgresql':
+            self._record_optimization_audit(optimization_results)
+        
         return optimization_results
     
+    def run_maintenance(self, force: bool = False) -> Dict[str, Any]:
+        """Run index upkeep and retention cleanup at most once per maintenance_interval"""
+        now = time.monotonic()
+        if force or self._maintained_at is None or now - self._maintained_at >= self.maintenance_interval:
+            self._last_optimization = self.optimize_database_queries()
+            self._maintained_at = now
+        return self._last_optimization
+    
+    def _record_optimization_audit(self, optimization_results: Dict[str, Any]):
+        """Persist the applied DDL as audit rows in one batched INSERT"""
+        now = datetime.utcnow()
+        rows = [{'ts': now, 'op': ' '.join(sql.split()[:2]).lower(), 'sql': sql}
+                for sql in optimization_results['indexes_created']]
+        if optimization_results['storage_cleaned']:
+            rows.append({'ts': now, 'op': 'cleanup', 'sql': None})
+        if not rows:
+            return
+        
+        try:
+            # executemany goes through insertmanyvalues: one multi-row INSERT per page, not one per row
+            with self.db.engine.begin() as conn:
+                conn.execute(OptimizationAuditModel.__table__.insert(), rows)
+        except Exception as e:
+            logger.error(f"Failed to record optimization audit: {e}")
+    
     def generate_performance_report(self) -> Dict[str, Any]:
-        """Generate comprehensive performance report"""
+        """Generate comprehensive performance report, reusing the task analysis while tasks are unchanged
+        
+        The report's 'etag' only changes with the underlying tasks, for use in HTTP If-None-Match checks.
+        """
+        # Maintenance runs first: its cleanup may delete tasks, which the analysis must reflect
+        database_optimization = self.run_maintenance()
+        version = self.db.get_tasks_version()
+        if version is not None and self._report_cache and self._report_cache[0] == version:
+            task_analysis = self._report_cache[1]
+        else:
+            task_analysis = self.analyze_task_patterns()
+            self._report_cache = (version, task_analysis) if version is not None else None
+        
         report = {
             'timestamp': datetime.utcnow().isoformat(),
-            'task_analysis': self.analyze_task_patterns(),
-            'database_optimization': self.optimize_database_queries(),
+            'etag': hashlib.md5(repr(version).encode()).hexdigest() if version is not None else None,
+            'task_analysis': task_analysis,
+            'database_optimization': database_optimization,
             'system_health': self._check_system_health(),
             'recommendations': []
         }
@@ -892,16 +2057,27 @@ class PerformanceOptimizer:
         return report
     
     def _check_system_health(self) -> Dict[str, Any]:
-        """Check overall system health"""
-        import psutil
+        """Check overall system health, reusing snapshots taken in the last few seconds"""
+        if not PSUTIL_AVAILABLE:
+            logger.warning("psutil not installed, skipping system health probes")
+            return {}
+        
+        health = self._health_cache.get('health')
+        if health is not None:
+            return health
+        
+        network_connections = self._connections_cache.get('count')
+        if network_connections is None:
+            network_connections = self._connections_cache['count'] = len(psutil.net_connections())
         
-        return {
-            'cpu_usage': psutil.cpu_percent(interval=1),
+        health = self._health_cache['health'] = {
+            'cpu_usage': psutil.cpu_percent(interval=None),
             'memory_usage': psutil.virtual_memory().percent,
             'disk_usage': psutil.disk_usage('/').percent,
-            'network_connections': len(psutil.net_connections()),
+            'network_connections': network_connections,
             'processes': len(psutil.pids())
         }
+        return health
 
 # Database migration tools
 class MigrationManager:
@@ -913,6 +2089,10 @@ class MigrationManager:
             self._migration_001_initial_schema,
             self._migration_002_add_performance_indexes,
             self._migration_003_add_alert_tables,
+            self._migration_004_add_error_codes,
+            self._migration_005_add_task_perf_view,
+            self._migration_006_add_task_updated_at,
+            self._migration_007_backfill_error_codes,
         ]
     
     def run_migrations(self):
@@ -921,58 +2101,105 @@ class MigrationManager:
             logger.info("Migrations only supported for PostgreSQL")
             return
         
-        # Create migrations table if it doesn't exist
-        self.db.session.execute("""
-            CREATE TABLE IF NOT EXISTS schema_migrations (
-                version INTEGER PRIMARY KEY,
-                applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        self.db.session.commit()
-        
-        # Get applied migrations
-        result = self.db.session.execute("SELECT version FROM schema_migrations")
-        applied_versions = {row[0] for row in result}
-        
-        # Run pending migrations
-        for i, migration in enumerate(self.migrations, 1):
-            if i not in applied_versions:
-                try:
-                    logger.info(f"Running migration {i}")
-                    migration()
-                    
-                    # Mark migration as applied
-                    self.db.session.execute(
-                        "INSERT INTO schema_migrations (version) VALUES (%s)",
-                        (i,)
-                    )
-                    self.db.session.commit()
-                    logger.info(f"Migration {i} completed")
-                    
-                except Exception as e:
-                    logger.error(f"Migration {i} failed: {e}")
-                    self.db.session.rollback()
-                    raise
+        # One transaction under an advisory lock, so concurrent deployers run migrations once
+        with self.db.engine.begin() as conn:
+            conn.execute(sa.text("SELECT pg_advisory_xact_lock(hashtext('schema_migrations'))"))
+            conn.execute(sa.text("""
+                CREATE TABLE IF NOT EXISTS schema_migrations (
+                    version INTEGER PRIMARY KEY,
+                    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """))
+            
+            # Get applied migrations
+            applied_versions = set(conn.execute(sa.text("SELECT version FROM schema_migrations")).scalars())
+            
+            # Run pending migrations
+            newly_applied = []
+            for i, migration in enumerate(self.migrations, 1):
+                if i not in applied_versions:
+                    try:
+                        logger.info(f"Running migration {i}")
+                        migration(conn)
+                        newly_applied.append({'version': i})
+                        logger.info(f"Migration {i} completed")
+                        
+                    except Exception as e:
+                        logger.error(f"Migration {i} failed: {e}")
+                        raise
+            
+            # Mark migrations as applied in one batched statement
+            if newly_applied:
+                conn.execute(sa.text(
+                    "INSERT INTO schema_migrations (version) VALUES (:version) ON CONFLICT (version) DO NOTHING"
+                ), newly_applied)
     
-    def _migration_001_initial_schema(self):
+    def _migration_001_initial_schema(self, conn):
         """Initial schema creation"""
         # Tables are created by SQLAlchemy, this is a placeholder
         pass
     
-    def _migration_002_add_performance_indexes(self):
+    def _migration_002_add_performance_indexes(self, conn):
         """Add performance indexes"""
+        # tasks(status, created_at) lookups are covered by idx_tasks_status_created_incl
         indexes = [
-            "CREATE INDEX IF NOT EXISTS idx_tasks_performance ON tasks(status, created_at, execution_time);",
-            "CREATE INDEX IF NOT EXISTS idx_nodes_performance ON nodes(status, load_score, last_heartbeat);",
-            "CREATE INDEX IF NOT EXISTS idx_metrics_performance ON metrics(metric_name, timestamp, metric_value);"
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_nodes_performance ON nodes(status, load_score, last_heartbeat);",
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_metrics_performance ON metrics(metric_name, timestamp, metric_value);"
         ]
         
-        for index_sql in indexes:
-            self.db.session.execute(index_sql)
+        applied = self.db.create_indexes_concurrently(indexes)
+        if len(applied) != len(indexes):
+            raise RuntimeError(f"Only {len(applied)} of {len(indexes)} performance indexes were created")
     
-    def _migration_003_add_alert_tables(self):
+    def _migration_003_add_alert_tables(self, conn):
         """Add alert-related tables and indexes"""
         # Alert table is already created by SQLAlchemy
-        self.db.session.execute(
+        conn.execute(sa.text(
             "CREATE INDEX IF NOT EXISTS idx_alerts_status_severity ON alerts(status, severity, created_at);"
-        )
\ No newline at end of file
+        ))
+    
+    def _migration_004_add_error_codes(self, conn):
+        """Normalize task errors into error_codes and reference them from tasks"""
+        conn.execute(sa.text("""
+            CREATE TABLE IF NOT EXISTS error_codes (
+                id SERIAL PRIMARY KEY,
+                fingerprint VARCHAR(32) NOT NULL UNIQUE,
+                sample_message TEXT
+            )
+        """))
+        conn.execute(sa.text(
+            "ALTER TABLE tasks ADD COLUMN IF NOT EXISTS error_code_id INTEGER REFERENCES error_codes(id);"
+        ))
+    
+    def _migration_005_add_task_perf_view(self, conn):
+        """Add the hourly task performance rollup view"""
+        for view_sql in TASK_PERF_VIEW_SQL:
+            conn.execute(sa.text(view_sql))
+    
+    def _migration_006_add_task_updated_at(self, conn):
+        """Track task modification time for report freshness checks"""
+        conn.execute(sa.text("ALTER TABLE tasks ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP DEFAULT now();"))
+        # Not CONCURRENTLY: this transaction already holds the ALTER's lock on tasks, so a concurrent build would wait forever
+        conn.execute(sa.text("CREATE INDEX IF NOT EXISTS ix_task_updated ON tasks(updated_at);"))
+    
+    def _migration_007_backfill_error_codes(self, conn):
+        """Assign error codes to tasks whose errors were saved before error_codes existed"""
+        messages = conn.execute(sa.text(
+            "SELECT DISTINCT error_message FROM tasks WHERE error_code_id IS NULL AND error_message IS NOT NULL"
+        )).scalars().all()
+        if not messages:
+            return
+        
+        fingerprints = {message: DatabaseManager._error_fingerprint(message) for message in messages}
+        samples = {}
+        for message, fingerprint in fingerprints.items():
+            samples.setdefault(fingerprint, message)
+        
+        conn.execute(sa.text(
+            "INSERT INTO error_codes (fingerprint, sample_message) VALUES (:fingerprint, :sample_message) "
+            "ON CONFLICT (fingerprint) DO NOTHING"
+        ), [{'fingerprint': fingerprint, 'sample_message': message} for fingerprint, message in samples.items()])
+        conn.execute(sa.text(
+            "UPDATE tasks SET error_code_id = (SELECT id FROM error_codes WHERE fingerprint = :fingerprint) "
+            "WHERE error_message = :message AND error_code_id IS NULL"
+        ), [{'fingerprint': fingerprint, 'message': message} for message, fingerprint in fingerprints.items()])
@@ -5,105 +5,246 @@ This demonstrates a production-ready setup with all features enabled
 """
 
 import asyncio
+import contextlib
 import logging
 import signal
 import sys
 import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from graphlib import TopologicalSorter
 from typing import Dict, Any
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+import orjson
 
-# Import all orchestrator components
-from web4ai_orchestrator import Web4AIOrchestrator
-from orchestrator_api import OrchestratorAPI, OrchestratorConfig
-from security.auth_manager import SecurityManager
-from monitoring.alert_manager import MonitoringManager
-from database.schema import DatabaseManager
-from scaling.auto_scaler import AutoScaler
-from backup.backup_manager import BackupManager
-from analytics.analytics_engine import AnalyticsEngine
-from benchmarking.benchmark_suite import BenchmarkSuite
+# Orchestrator components are imported where they are used, so CLI commands
+# that don't need them (status, config) start without loading Flask, SQLAlchemy, etc.
+
+# uvloop (optional): libuv-based event loop with much lower per-callback overhead
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
 
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
     handlers=[
-        logging.FileHandler('orchestrator_complete.log'),
+        logging.FileHandler('orchestrator_complete.log', delay=True),
         logging.StreamHandler(sys.stdout)
     ]
 )
 logger = logging.getLogger(__name__)
 
+def run_async(coro, config: Dict[str, Any] = None):
+    """Run a coroutine to completion on uvloop unless config sets asyncio.loop to 'default'"""
+    loop_type = (config or {}).get('asyncio', {}).get('loop', 'uvloop')
+    if loop_type != 'uvloop' or not UVLOOP_AVAILABLE:
+        return asyncio.run(coro)
+    
+    if sys.version_info >= (3, 11):
+        with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+            return runner.run(coro)
+    
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return asyncio.run(coro)
+
+def available_cpus() -> int:
+    """CPUs this process may actually use: affinity mask, capped by any cgroup v2 CPU quota"""
+    if hasattr(os, 'sched_getaffinity'):
+        cpus = len(os.sched_getaffinity(0))
+    else:
+        try:
+            import psutil
+            cpus = len(psutil.Process().cpu_affinity())
+        except (ImportError, AttributeError, OSError):
+            cpus = os.cpu_count() or 1
+    
+    # Containers: 'max 100000' means unlimited, '200000 100000' means 2 CPUs
+    try:
+        with open('/sys/fs/cgroup/cpu.max') as f:
+            quota, period = f.read().split()[:2]
+        if quota != 'max':
+            cpus = min(cpus, max(1, int(quota) // int(period)))
+    except (OSError, ValueError):
+        pass
+    
+    return max(1, cpus)
+
+def _small_stack_executor(max_workers: int, stack_size: int = 256 * 1024) -> ThreadPoolExecutor:
+    """ThreadPoolExecutor whose worker threads all use a reduced stack size"""
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="orch")
+    
+    # Workers are spawned lazily on submit, so start them all while the smaller stack size is in effect
+    old_stack_size = threading.stack_size(stack_size)
+    try:
+        barrier = threading.Barrier(max_workers + 1)
+        for _ in range(max_workers):
+            executor.submit(barrier.wait)
+        barrier.wait()
+    finally:
+        threading.stack_size(old_stack_size)
+    return executor
+
+def _embedded_api_server(wsgi_app, host: str, port: int):
+    """uvicorn server for a WSGI app that runs inside an existing event loop
+    
+    Requests run on the loop's default executor: asgiref's WsgiToAsgi is thread
+    sensitive and would funnel them all through one shared thread. uvicorn's own
+    SIGINT/SIGTERM handling is disabled, since it would stop only the API;
+    the owner stops the server by setting should_exit.
+    Raises ImportError when uvicorn or asgiref is not installed.
+    """
+    import uvicorn
+    from asgiref.sync import sync_to_async
+    from asgiref.wsgi import WsgiToAsgi, WsgiToAsgiInstance
+    
+    run_wsgi_app = sync_to_async(WsgiToAsgiInstance.run_wsgi_app.__wrapped__, thread_sensitive=False)
+    
+    class PooledWsgiToAsgiInstance(WsgiToAsgiInstance):
+        async def run_wsgi_app(self, body):
+            await run_wsgi_app(self, body)
+    
+    class PooledWsgiToAsgi(WsgiToAsgi):
+        async def __call__(self, scope, receive, send):
+            await PooledWsgiToAsgiInstance(self.wsgi_application)(scope, receive, send)
+    
+    class EmbeddedServer(uvicorn.Server):
+        def install_signal_handlers(self):
+            pass  # uvicorn < 0.29
+        
+        @contextlib.contextmanager
+        def capture_signals(self):
+            yield  # uvicorn >= 0.29
+    
+    return EmbeddedServer(uvicorn.Config(PooledWsgiToAsgi(wsgi_app), host=host, port=port, log_level="info"))
+
+def _next_occurrence(now: datetime, hour: int, weekday: int = None) -> datetime:
+    """First time at or after now that falls on hour:00 (and weekday, if given)"""
+    due = now.replace(hour=hour, minute=0, second=0, microsecond=0)
+    if weekday is not None:
+        due += timedelta(days=(weekday - now.weekday()) % 7)
+    if due < now:
+        due += timedelta(weeks=1) if weekday is not None else timedelta(days=1)
+    return due
+
+class Components:
+    """Slotted container for the orchestrator components; unset components are None"""
+    __slots__ = ('database', 'orchestrator', 'security', 'monitoring',
+                 'autoscaler', 'backup', 'analytics', 'api')
+    
+    def __init__(self):
+        for name in self.__slots__:
+            setattr(self, name, None)
+
 class CompleteOrchestratorSystem:
     """Complete orchestrator system with all components integrated"""
     
     def __init__(self, config_file: str = "orchestrator_config.yaml"):
+        from orchestrator_api import OrchestratorConfig
+        
         self.config = OrchestratorConfig(config_file)
-        self.components = {}
+        self.components = Components()
         self.running = False
+        # Tasks spawned by start_system; on 3.12+ they start eagerly (see _spawn)
+        self._background_tasks = set()
+        self._api_server = None
+        self._api_task = None
+        self._shutdown_requested = False
+        self._stop_event = None  # asyncio.Event, created in start_system once a loop is running
+        self._periodic_tasks = []
+        self._service_tasks = []
+        self._shutdown_task = None  # stop_system task started by a signal handler
+        
+        # Report schedule table: [next due time (UTC), period, report coroutine]
+        now = datetime.utcnow()
+        self._schedule = [
+            [_next_occurrence(now, hour=0), timedelta(days=1), self._generate_daily_report],
+            [_next_occurrence(now, hour=1, weekday=6), timedelta(weeks=1), self._generate_weekly_report],
+        ]
+        
+        # Latest orchestrator network status from the monitoring loop, for get_system_status
+        self._loop = None
+        self._cached_status = {}
+        self._cached_status_ts = 0.0
+        self._status_ts_second = None
+        self._status_ts_iso = None
+        
+        # One bounded pool for all blocking work (to_thread, reports, backups), with small thread stacks
+        self._executor = _small_stack_executor(min(32, available_cpus() * 2 + 4))
         
         logger.info("🚀 Initializing Complete Orchestrator System")
         
         # Initialize all components
         self._initialize_components()
         
-        # Setup signal handlers for graceful shutdown
-        signal.signal(signal.SIGINT, self._signal_handler)
-        signal.signal(signal.SIGTERM, self._signal_handler)
+        # Until start_system installs loop signal handlers, a signal only cancels startup
+        signal.signal(signal.SIGINT, self._early_signal_handler)
+        signal.signal(signal.SIGTERM, self._early_signal_handler)
         
     def _initialize_components(self):
         """Initialize all orchestrator components"""
+        from web4ai_orchestrator import Web4AIOrchestrator
+        from orchestrator_api import OrchestratorAPI
+        from security.auth_manager import SecurityManager
+        from monitoring.alert_manager import MonitoringManager
+        from database.schema import DatabaseManager
+        from scaling.auto_scaler import AutoScaler
+        from backup.backup_manager import BackupManager
+        from analytics.analytics_engine import AnalyticsEngine
+        
         try:
-            # 1. Database Manager
-            logger.info("📊 Initializing Database Manager...")
-            self.components['database'] = DatabaseManager(self.config.config)
-            
-            # 2. Core Orchestrator
-            logger.info("🎛️ Initializing Core Orchestrator...")
-            self.components['orchestrator'] = Web4AIOrchestrator(
-                orchestrator_id=self.config.config.get('orchestrator', {}).get('id'),
-                config=self.config.config
-            )
-            
-            # 3. Security Manager
-            logger.info("🔐 Initializing Security Manager...")
-            self.components['security'] = SecurityManager(
-                self.config.config,
-                redis_client=getattr(self.components['database'], 'connection', None)
-            )
-            
-            # 4. Monitoring Manager
-            logger.info("📈 Initializing Monitoring Manager...")
-            self.components['monitoring'] = MonitoringManager(
-                self.config.config,
-                self.components['orchestrator']
-            )
-            
-            # 5. Auto Scaler
-            logger.info("⚖️ Initializing Auto Scaler...")
-            self.components['autoscaler'] = AutoScaler(
-                self.components['orchestrator'],
-                self.config.config
-            )
+            # Output directories, created once up front
+            paths = self.config.config.get('paths', {})
+            self.reports_dir = paths.get('reports', 'reports')
+            self.benchmarks_dir = paths.get('benchmarks', 'benchmarks')
+            for directory in (self.reports_dir, self.benchmarks_dir):
+                os.makedirs(directory, exist_ok=True)
+            
+            config = self.config.config
+            components = self.components
+            
+            # name -> (dependencies, log line, constructor); each dependency level is constructed concurrently
+            specs = {
+                'database': ((), "📊 Initializing Database Manager...",
+                             lambda: DatabaseManager(config)),
+                'orchestrator': ((), "🎛️ Initializing Core Orchestrator...",
+                                 lambda: Web4AIOrchestrator(
+                                     orchestrator_id=config.get('orchestrator', {}).get('id'),
+                                     config=config
+                                 )),
+                'security': (('database',), "🔐 Initializing Security Manager...",
+                             lambda: SecurityManager(
+                                 config,
+                                 redis_client=getattr(components.database, 'connection', None)
+                             )),
+                'monitoring': (('orchestrator',), "📈 Initializing Monitoring Manager...",
+                               lambda: MonitoringManager(config, components.orchestrator)),
+                'autoscaler': (('orchestrator',), "⚖️ Initializing Auto Scaler...",
+                               lambda: AutoScaler(components.orchestrator, config)),
+                'backup': (('database',), "💾 Initializing Backup Manager...",
+                           lambda: BackupManager(config, components.database)),
+                'analytics': (('orchestrator', 'database'), "🔍 Initializing Analytics Engine...",
+                              lambda: AnalyticsEngine(components.orchestrator, components.database)),
+                'api': (('orchestrator',), "🌐 Initializing API Server...",
+                        lambda: OrchestratorAPI(self.config)),
+            }
             
-            # 6. Backup Manager
-            logger.info("💾 Initializing Backup Manager...")
-            self.components['backup'] = BackupManager(
-                self.config.config,
-                self.components['database']
-            )
+            sorter = TopologicalSorter({name: spec[0] for name, spec in specs.items()})
+            sorter.prepare()
+            while sorter.is_active():
+                level = sorter.get_ready()
+                for name in level:
+                    logger.debug(specs[name][1])
+                for name, component in zip(level, self._executor.map(lambda name: specs[name][2](), level)):
+                    setattr(components, name, component)
+                sorter.done(*level)
             
-            # 7. Analytics Engine
-            logger.info("🔍 Initializing Analytics Engine...")
-            self.components['analytics'] = AnalyticsEngine(
-                self.components['orchestrator'],
-                self.components['database']
-            )
-            
-            # 8. API Server
-            logger.info("🌐 Initializing API Server...")
-            self.components['api'] = OrchestratorAPI(self.config)
-            self.components['api'].orchestrator = self.components['orchestrator']
+            components.api.orchestrator = components.orchestrator
             
             logger.info("✅ All components initialized successfully")
             
@@ -114,164 +255,262 @@ class CompleteOrchestratorSystem:
     async def start_system(self):
         """Start all orchestrator components"""
         try:
+            if self._shutdown_requested:
+                logger.info("🛑 Shutdown requested before startup, not starting")
+                return
+            
             logger.info("🎬 Starting Complete Orchestrator System...")
             self.running = True
+            self._stop_event = asyncio.Event()
+            loop = self._loop = asyncio.get_running_loop()
+            loop.set_default_executor(self._executor)
             
-            # 1. Start core orchestrator
-            logger.info("▶️ Starting Core Orchestrator...")
-            await self.components['orchestrator'].start_orchestrator()
+            # Handle shutdown signals on the loop itself, so stop_system starts on the next tick
+            for signum in (signal.SIGINT, signal.SIGTERM):
+                try:
+                    loop.add_signal_handler(signum, self._request_shutdown, signum)
+                except NotImplementedError:
+                    pass  # Windows: keep the early handler
             
-            # 2. Start monitoring
-            logger.info("▶️ Starting Monitoring...")
-            self.components['monitoring'].start_monitoring()
+            # Coroutines that finish without suspending skip a full event-loop hop
+            if sys.version_info >= (3, 12):
+                loop.set_task_factory(asyncio.eager_task_factory)
             
-            # 3. Start auto-scaling
-            logger.info("▶️ Starting Auto-scaling...")
-            asyncio.create_task(self.components['autoscaler'].start_auto_scaling())
+            # 1. Start core orchestrator
+            logger.debug("▶️ Starting Core Orchestrator...")
+            await self.components.orchestrator.start_orchestrator()
             
-            # 4. Start backup service
-            logger.info("▶️ Starting Backup Service...")
-            self.components['backup'].start_backup_service()
+            # 2-4. Monitoring, auto-scaling and backups run as tasks, so shutdown can cancel them together
+            logger.debug("▶️ Starting Monitoring, Auto-scaling and Backup Service...")
+            self._service_tasks = [
+                self._spawn(self.components.monitoring.run()),
+                self._spawn(self.components.autoscaler.start_auto_scaling()),
+                self._spawn(self.components.backup.run()),
+            ]
             
             # 5. Start API server in background
-            logger.info("▶️ Starting API Server...")
+            logger.debug("▶️ Starting API Server...")
             api_config = self.config.config.get('orchestrator', {})
             api_host = api_config.get('host', '0.0.0.0')
             api_port = api_config.get('port', 9000)
             
-            # Run API server in a separate thread
-            import threading
-            api_thread = threading.Thread(
-                target=lambda: self.components['api'].run(host=api_host, port=api_port),
-                daemon=True
-            )
-            api_thread.start()
+            # uvicorn + asgiref (optional): serve the Flask API on this event loop
+            api = self.components.api
+            try:
+                self._api_server = _embedded_api_server(api.app, api_host, api_port)
+            except ImportError:
+                self._api_server = None
+            
+            if self._api_server:
+                # Serve on this loop rather than a thread with its own loop; handlers run on self._executor
+                self._api_task = self._spawn(self._api_server.serve())
+                api.websocket_server = await api.start_websocket_server()
+            else:
+                # Run API server in a separate thread
+                api_thread = threading.Thread(
+                    target=partial(self.components.api.run, host=api_host, port=api_port),
+                    daemon=True,
+                    name="orch-api"
+                )
+                api_thread.start()
             
             logger.info("🎉 Complete Orchestrator System started successfully!")
-            logger.info(f"🌐 API available at http://{api_host}:{api_port}")
-            logger.info(f"📊 Dashboard: http://{api_host}:{api_port}")
-            logger.info(f"🔍 Health: http://{api_host}:{api_port}/api/v1/health")
+            logger.info("🌐 API available at http://%s:%s", api_host, api_port)
+            logger.info("📊 Dashboard: http://%s:%s", api_host, api_port)
+            logger.info("🔍 Health: http://%s:%s/api/v1/health", api_host, api_port)
+            
+            # Health checks and reports run on independent cadences, so a slow report never delays health
+            self._periodic_tasks = [
+                self._spawn(self._run_periodic(self._check_system_health, 60, "health check")),
+                self._spawn(self._run_periodic(self._generate_periodic_reports, 60, "report generation")),
+            ]
+            await asyncio.gather(*self._periodic_tasks, return_exceptions=True)
             
-            # Run system monitoring loop
-            await self._system_monitoring_loop()
+            # A signal-initiated shutdown must finish flushing before asyncio.run tears the loop down
+            if self._shutdown_task is not None:
+                await self._shutdown_task
             
         except Exception as e:
             logger.error(f"❌ Failed to start system: {e}")
             await self.stop_system()
             raise
     
+    def _spawn(self, coro) -> asyncio.Task:
+        """Start a background task and keep a reference so it isn't garbage collected
+        
+        Runs eagerly on 3.12+, where start_system installs asyncio.eager_task_factory.
+        """
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        return task
+    
     async def stop_system(self):
         """Stop all orchestrator components gracefully"""
+        shutdown_task = self._shutdown_task
+        if shutdown_task is not None and shutdown_task is not asyncio.current_task():
+            # Already stopping on a signal; wait for that shutdown instead of running a second one
+            await shutdown_task
+            return
+        
+        if self._stop_event:
+            self._stop_event.set()
         logger.info("🛑 Stopping Complete Orchestrator System...")
         self.running = False
         
         try:
-            # Stop components in reverse order
-            if 'backup' in self.components:
-                self.components['backup'].stop_backup_service()
+            # Cancel periodic work and services at once; each task unwinds concurrently
+            tasks = self._periodic_tasks + self._service_tasks
+            self._periodic_tasks, self._service_tasks = [], []
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
             
-            if 'autoscaler' in self.components:
-                self.components['autoscaler'].stop_auto_scaling()
+            # Stop components in reverse order
+            if self._api_server:
+                self._api_server.should_exit = True
+                await self._api_task
+                self._api_server = None
+                
+                api = self.components.api
+                if api.websocket_server:
+                    api.websocket_server.close()
+                    await api.websocket_server.wait_closed()
+                    api.websocket_server = None
             
-            if 'monitoring' in self.components:
-                self.components['monitoring'].stop_monitoring()
+            if self.components.orchestrator is not None:
+                await self.components.orchestrator.stop_orchestrator()
             
-            if 'orchestrator' in self.components:
-                await self.components['orchestrator'].stop_orchestrator()
+            if self.components.database is not None:
+                self.components.database.close()
             
-            if 'database' in self.components:
-                self.components['database'].close()
+            self._executor.shutdown(wait=True, cancel_futures=True)
             
             logger.info("✅ System stopped gracefully")
             
         except Exception as e:
             logger.error(f"❌ Error during shutdown: {e}")
     
-    async def _system_monitoring_loop(self):
-        """Main system monitoring loop"""
+    async def _run_periodic(self, func, interval: float, name: str):
+        """Run func every interval seconds until shutdown"""
         while self.running:
             try:
-                # Check system health
-                await self._check_system_health()
-                
-                # Generate periodic reports
-                await self._generate_periodic_reports()
-                
-                # Sleep for 60 seconds
-                await asyncio.sleep(60)
-                
+                await func()
             except Exception as e:
-                logger.error(f"❌ System monitoring error: {e}")
-                await asyncio.sleep(60)
+                logger.error(f"❌ {name.capitalize()} error: {e}")
+            
+            # Wait out the interval, waking immediately on shutdown
+            if await self._wait_for_stop(interval):
+                break
+    
+    async def _wait_for_stop(self, timeout: float) -> bool:
+        """Sleep for up to timeout seconds; True if shutdown was requested meanwhile"""
+        try:
+            await asyncio.wait_for(self._stop_event.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
     
     async def _check_system_health(self):
         """Check overall system health"""
         try:
             # Get network status
-            status = await self.components['orchestrator'].get_network_status()
+            status = await self.components.orchestrator.get_network_status()
+            self._cached_status, self._cached_status_ts = status, time.monotonic()
             
             # Log key metrics
-            active_nodes = status['nodes']['active']
-            pending_tasks = status['tasks']['pending']
-            utilization = status['performance']['network_utilization']
+            nodes, tasks, perf = status['nodes'], status['tasks'], status['performance']
+            active_nodes = nodes['active']
+            pending_tasks = tasks['pending']
+            utilization = perf['network_utilization']
             
+            # Collect every problem so a loaded system reports all of them, not just the first
+            warnings = []
             if active_nodes == 0:
-                logger.warning("⚠️ No active nodes available")
-            elif pending_tasks > 100:
-                logger.warning(f"⚠️ High task queue: {pending_tasks} pending tasks")
-            elif utilization > 0.9:
-                logger.warning(f"⚠️ High utilization: {utilization:.1%}")
+                warnings.append("No active nodes available")
+            if pending_tasks > 100:
+                warnings.append(f"High task queue: {pending_tasks} pending tasks")
+            if utilization > 0.9:
+                warnings.append(f"High utilization: {utilization:.1%}")
+            
+            if warnings:
+                logger.warning("⚠️ " + " | ".join(warnings))
             else:
-                logger.debug(f"✅ System healthy: {active_nodes} nodes, {pending_tasks} pending, {utilization:.1%} util")
+                logger.debug("✅ System healthy: %s nodes, %s pending, %.1f%% util", active_nodes, pending_tasks, utilization * 100)
                 
         except Exception as e:
             logger.error(f"❌ Health check failed: {e}")
     
     async def _generate_periodic_reports(self):
-        """Generate periodic analytics reports"""
-        try:
-            current_time = datetime.utcnow()
+        """Run every scheduled report that has come due"""
+        current_time = datetime.utcnow()
+        for entry in self._schedule:
+            due, period, generate = entry
+            if current_time < due:
+                continue
+            
+            # Advance past now first, so each window fires exactly once even if generation fails
+            while due <= current_time:
+                due += period
+            entry[0] = due
             
-            # Generate daily report at midnight
-            if current_time.hour == 0 and current_time.minute < 2:
-                logger.info("📊 Generating daily analytics report...")
-                report = self.components['analytics'].generate_comprehensive_report(days=1)
-                
-                # Save report
-                report_filename = f"daily_report_{current_time.strftime('%Y%m%d')}.json"
-                with open(f"reports/{report_filename}", 'w') as f:
-                    f.write(report.to_json())
-                
-                logger.info(f"📈 Daily report saved: {report_filename}")
-            
-            # Generate weekly report on Sundays
-            if current_time.weekday() == 6 and current_time.hour == 1:  # Sunday at 1 AM
-                logger.info("📊 Generating weekly analytics report...")
-                report = self.components['analytics'].generate_comprehensive_report(days=7)
-                
-                # Save and potentially email report
-                report_filename = f"weekly_report_{current_time.strftime('%Y%m%d')}.json"
-                with open(f"reports/{report_filename}", 'w') as f:
-                    f.write(report.to_json())
-                
-                logger.info(f"📈 Weekly report saved: {report_filename}")
-                
-        except Exception as e:
-            logger.error(f"❌ Report generation failed: {e}")
+            try:
+                await generate(current_time)
+            except Exception as e:
+                logger.error(f"❌ Report generation failed: {e}")
     
-    def _signal_handler(self, signum, frame):
-        """Handle shutdown signals"""
+    async def _generate_daily_report(self, current_time: datetime):
+        """Generate and save the daily analytics report"""
+        logger.info("📊 Generating daily analytics report...")
+        report = await asyncio.to_thread(self.components.analytics.generate_comprehensive_report, days=1)
+        
+        # Save report
+        report_filename = f"daily_report_{current_time.strftime('%Y%m%d')}.json"
+        await asyncio.to_thread(self._write_report, report, os.path.join(self.reports_dir, report_filename))
+        
+        logger.info(f"📈 Daily report saved: {report_filename}")
+    
+    async def _generate_weekly_report(self, current_time: datetime):
+        """Generate and save the weekly analytics report"""
+        logger.info("📊 Generating weekly analytics report...")
+        report = await asyncio.to_thread(self.components.analytics.generate_comprehensive_report, days=7)
+        
+        # Save and potentially email report
+        report_filename = f"weekly_report_{current_time.strftime('%Y%m%d')}.json"
+        await asyncio.to_thread(self._write_report, report, os.path.join(self.reports_dir, report_filename))
+        
+        logger.info(f"📈 Weekly report saved: {report_filename}")
+    
+    @staticmethod
+    def _write_report(report, path: str):
+        """Serialize and write a report; blocking, so run it off the event loop"""
+        with open(path, 'wb') as f:
+            report.to_json_stream(f)
+    
+    def _request_shutdown(self, signum):
+        """Handle shutdown signals delivered through the event loop"""
         logger.info(f"🛑 Received signal {signum}, initiating graceful shutdown...")
         self.running = False
+        if self._shutdown_task is None:
+            self._shutdown_task = self._spawn(self.stop_system())
+    
+    def _early_signal_handler(self, signum, frame):
+        """Handle shutdown signals outside the event loop (before startup, or where add_signal_handler is unsupported)"""
+        if self._loop is not None and self._loop.is_running():
+            # Hand off to the stored loop rather than asyncio.get_event_loop(), which may not be ours
+            self._loop.call_soon_threadsafe(self._request_shutdown, signum)
+            return
         
-        # Run shutdown in the event loop
-        loop = asyncio.get_event_loop()
-        loop.create_task(self.stop_system())
+        logger.info(f"🛑 Received signal {signum} before startup, cancelling start")
+        self._shutdown_requested = True
+        self.running = False
     
     def run_benchmark(self) -> Dict[str, Any]:
         """Run comprehensive benchmark suite"""
         logger.info("🏃 Running benchmark suite...")
         
+        from benchmarking.benchmark_suite import BenchmarkSuite
+        
         benchmark = BenchmarkSuite(
             orchestrator_url=f"http://localhost:{self.config.config.get('orchestrator', {}).get('port', 9000)}"
         )
@@ -280,22 +519,25 @@ class CompleteOrchestratorSystem:
         
         # Save benchmark results
         timestamp = datetime.utcnow().strftime('%Y%m%d_%H%M%S')
-        benchmark_file = f"benchmarks/benchmark_{timestamp}.json"
+        benchmark_file = os.path.join(self.benchmarks_dir, f"benchmark_{timestamp}.json")
         
-        os.makedirs('benchmarks', exist_ok=True)
-        with open(benchmark_file, 'w') as f:
-            json.dump(results, f, indent=2, default=str)
+        with open(benchmark_file, 'wb') as f:
+            f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY, default=str))
         
         logger.info(f"📊 Benchmark completed, results saved to {benchmark_file}")
         logger.info(f"🏆 Overall score: {results.get('overall_score', 0):.1f}/100")
         
         return results
     
+    async def run_benchmark_async(self) -> Dict[str, Any]:
+        """run_benchmark for callers on the event loop, executed in a worker thread"""
+        return await asyncio.to_thread(self.run_benchmark)
+    
     def create_backup(self) -> Dict[str, Any]:
         """Create system backup"""
         logger.info("💾 Creating system backup...")
         
-        backup_result = self.components['backup'].create_full_backup()
+        backup_result = self.components.backup.create_full_backup()
         
         if 'error' not in backup_result:
             logger.info(f"✅ Backup created: {backup_result.get('backup_id')}")
@@ -304,38 +546,36 @@ class CompleteOrchestratorSystem:
         
         return backup_result
     
+    async def create_backup_async(self) -> Dict[str, Any]:
+        """create_backup for callers on the event loop, executed in a worker thread"""
+        return await asyncio.to_thread(self.create_backup)
+    
     def get_system_status(self) -> Dict[str, Any]:
         """Get comprehensive system status"""
         try:
             # Get status from all components
             status = {
-                'timestamp': datetime.utcnow().isoformat(),
+                'timestamp': self._status_timestamp(),
                 'system_running': self.running,
                 'components': {}
             }
             
             # Orchestrator status
-            if 'orchestrator' in self.components:
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                orchestrator_status = loop.run_until_complete(
-                    self.components['orchestrator'].get_network_status()
-                )
-                loop.close()
-                status['components']['orchestrator'] = orchestrator_status
+            if self.components.orchestrator is not None:
+                status['components']['orchestrator'] = self._get_orchestrator_status()
             
             # Monitoring status
-            if 'monitoring' in self.components:
-                monitoring_data = self.components['monitoring'].get_monitoring_dashboard_data()
+            if self.components.monitoring is not None:
+                monitoring_data = self.components.monitoring.get_monitoring_dashboard_data()
                 status['components']['monitoring'] = {
                     'active_alerts': len(monitoring_data.get('alerts', {}).get('active', [])),
                     'health_checks': monitoring_data.get('health_checks', {})
                 }
             
             # Database status
-            if 'database' in self.components:
+            if self.components.database is not None:
                 status['components']['database'] = {
-                    'type': self.components['database'].storage_type,
+                    'type': self.components.database.storage_type,
                     'connected': True  # Simplified check
                 }
             
@@ -345,6 +585,38 @@ class CompleteOrchestratorSystem:
             logger.error(f"❌ Failed to get system status: {e}")
             return {'error': str(e)}
 
+    def _status_timestamp(self) -> str:
+        """Current UTC time in naive utcnow().isoformat() form; the date/time part is formatted once per second"""
+        now = time.time()
+        second = int(now)
+        if second != self._status_ts_second:
+            self._status_ts_iso = datetime.fromtimestamp(second, timezone.utc).replace(tzinfo=None).isoformat()
+            self._status_ts_second = second
+        microsecond = int((now - second) * 1e6)
+        # isoformat() omits the fraction when it is zero
+        return f"{self._status_ts_iso}.{microsecond:06d}" if microsecond else self._status_ts_iso
+    
+    def _get_orchestrator_status(self, max_age: float = 5.0) -> Dict[str, Any]:
+        """Orchestrator network status, served from the monitoring loop's cache while fresh"""
+        if self._cached_status and time.monotonic() - self._cached_status_ts < max_age:
+            return self._cached_status
+        
+        coro = self.components.orchestrator.get_network_status()
+        if self._loop and self._loop.is_running():
+            try:
+                if asyncio.get_running_loop() is self._loop:
+                    # Blocking here would deadlock the loop; a stale status is the best we can do
+                    coro.close()
+                    return self._cached_status
+            except RuntimeError:
+                pass  # Called from another thread
+            status = asyncio.run_coroutine_threadsafe(coro, self._loop).result(timeout=2)
+        else:
+            status = asyncio.run(coro)
+        
+        self._cached_status, self._cached_status_ts = status, time.monotonic()
+        return status
+
 # CLI Interface
 class OrchestratorCLI:
     """Command-line interface for orchestrator management"""
@@ -415,10 +687,10 @@ class OrchestratorCLI:
                 # Run as daemon
                 import daemon
                 with daemon.DaemonContext():
-                    asyncio.run(self.system.start_system())
+                    run_async(self.system.start_system(), self.system.config.config)
             else:
                 # Run in foreground
-                asyncio.run(self.system.start_system())
+                run_async(self.system.start_system(), self.system.config.config)
                 
         except KeyboardInterrupt:
             print("\n🛑 Shutdown requested by user")
@@ -480,32 +752,34 @@ class OrchestratorCLI:
         
         print(f"📊 Generating {args.days}-day report in {args.format} format...")
         
-        report = self.system.components['analytics'].generate_comprehensive_report(args.days)
+        report = self.system.components.analytics.generate_comprehensive_report(args.days)
         
         timestamp = datetime.utcnow().strftime('%Y%m%d_%H%M%S')
         
         if args.format == 'json':
             filename = f"report_{timestamp}.json"
-            with open(filename, 'w') as f:
-                f.write(report.to_json())
+            with open(filename, 'wb') as f:
+                report.to_json_stream(f)
             print(f"📈 Report saved: {filename}")
         
         elif args.format == 'html':
             filename = f"report_{timestamp}.html"
-            html_content = self.system.components['analytics'].export_report_html(report)
+            html_content = self.system.components.analytics.export_report_html(report)
             with open(filename, 'w') as f:
                 f.write(html_content)
             print(f"📈 Report saved: {filename}")
         
         elif args.format == 'pdf':
             filename = f"report_{timestamp}.pdf"
-            pdf_content = self.system.components['analytics'].export_report_pdf(report)
+            pdf_content = self.system.components.analytics.export_report_pdf(report)
             with open(filename, 'wb') as f:
                 f.write(pdf_content)
             print(f"📈 Report saved: {filename}")
     
     def _manage_config(self, args):
         """Manage configuration"""
+        from orchestrator_api import OrchestratorConfig
+        
         if args.generate:
             print("🔧 Generating default configuration...")
             config = OrchestratorConfig()
@@ -539,7 +813,7 @@ def example_basic_usage():
         finally:
             await system.stop_system()
     
-    asyncio.run(basic_example())
+    run_async(basic_example())
 
 def example_programmatic_control():
     """Example: Programmatic control of orchestrator"""
@@ -550,9 +824,8 @@ def example_programmatic_control():
     system = CompleteOrchestratorSystem()
     
     # Start in background thread
-    import threading
     system_thread = threading.Thread(
-        target=lambda: asyncio.run(system.start_system()),
+        target=lambda: run_async(system.start_system(), system.config.config),
         daemon=True
     )
     system_thread.start()
@@ -590,7 +863,7 @@ def example_programmatic_control():
     
     # Get analytics
     time.sleep(30)  # Wait for some data
-    report = system.components['analytics'].generate_comprehensive_report(days=1)
+    report = system.components.analytics.generate_comprehensive_report(days=1)
     print(f"Analytics report generated: {report.title}")
 
 def example_custom_integration():
@@ -639,7 +912,7 @@ def example_custom_integration():
         
         async def _register_existing_node(self, node_config):
             """Register existing compute node"""
-            orchestrator = self.orchestrator_system.components['orchestrator']
+            orchestrator = self.orchestrator_system.components.orchestrator
             
             node_data = {
                 'node_id': node_config['id'],
@@ -654,7 +927,7 @@ def example_custom_integration():
         
         def _setup_monitoring_integration(self):
             """Setup integration with existing monitoring"""
-            monitoring = self.orchestrator_system.components['monitoring']
+            monitoring = self.orchestrator_system.components.monitoring
             
             # Add custom alert callback that integrates with existing alerting system
             def custom_alert_handler(alert):
@@ -665,7 +938,7 @@ def example_custom_integration():
         
         def _setup_custom_alerts(self):
             """Setup custom alerting rules"""
-            monitoring = self.orchestrator_system.components['monitoring']
+            monitoring = self.orchestrator_system.components.monitoring
             
             # Add custom thresholds based on existing SLAs
             monitoring.threshold_monitor.add_threshold(
@@ -800,15 +800,32 @@ class MonitoringManager:
         
         logger.info("Monitoring manager stopped")
     
+    async def run(self):
+        """Run monitoring as a cancellable asyncio task (alternative to start_monitoring)"""
+        self.running = True
+        logger.info("Monitoring manager started")
+        try:
+            while self.running:
+                try:
+                    await asyncio.to_thread(self._monitoring_cycle)
+                except Exception as e:
+                    logger.error(f"Monitoring loop error: {e}")
+                
+                await asyncio.sleep(60)  # Check every minute
+        finally:
+            self.running = False
+            logger.info("Monitoring manager stopped")
+    
+    def _monitoring_cycle(self):
+        """Collect current metrics and check thresholds once"""
+        self._collect_orchestrator_metrics()
+        self.threshold_monitor.check_thresholds()
+    
     def _monitoring_loop(self):
         """Background monitoring loop"""
         while self.running:
             try:
-                # Collect current metrics
-                self._collect_orchestrator_metrics()
-                
-                # Check thresholds
-                self.threshold_monitor.check_thresholds()
+                self._monitoring_cycle()
                 
                 # Wait before next iteration
                 time.sleep(60)  # Check every minute
@@ -4,7 +4,7 @@ Web4AI Orchestrator API Server - COMPLETE VERSION WITH AGENT FIXES
 RESTful API interface and configuration management for the orchestrator
 """
 
-from flask import Flask, request, jsonify, g, send_from_directory, render_template
+from flask import Flask, request, jsonify, g, send_from_directory, Response
 from flask_cors import CORS
 import asyncio
 import threading
@@ -15,10 +15,11 @@ import argparse
 import signal
 import websockets
 import time  # Added missing import
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Dict, Any, Optional
 import logging
 from functools import wraps
+from itertools import islice
 import traceback
 import psutil
 import random
@@ -132,6 +133,10 @@ class OrchestratorAPI:
         self.app = Flask(__name__, template_folder=template_dir)
         CORS(self.app)
         
+        # Always emit compact JSON, even when running with debug enabled
+        self.app.config['JSONIFY_PRETTYPRINT_REGULAR'] = False
+        self.app.json.compact = True
+        
         # API statistics
         self.api_stats = {
             'requests_total': 0,
@@ -256,7 +261,10 @@ class OrchestratorAPI:
         def dashboard():
             """Serve the advanced dashboard"""
             try:
-                return render_template('web4ai_advanced_dashboard.html')
+                # The dashboard is static HTML: serve it with ETag/Last-Modified
+                # so browser refreshes get a 304 instead of a re-render
+                return send_from_directory(self.app.template_folder, 'web4ai_advanced_dashboard.html',
+                                           conditional=True, max_age=300)
             except Exception as e:
                 logger.error(f"Dashboard template error: {e}")
                 return self._create_basic_dashboard(), 200, {'Content-Type': 'text/html'}
@@ -277,63 +285,14 @@ class OrchestratorAPI:
         @self.app.route('/api/v1/dashboard/alerts')
         def dashboard_alerts():
             """Get active alerts for dashboard"""
-            alerts = []
-            
             if self.orchestrator:
-                # Check for system alerts
-                network_metrics = self.orchestrator.network_metrics
-                
-                # No active nodes alert
-                if network_metrics.get('active_nodes', 0) == 0:
-                    alerts.append({
-                        'id': 'no_nodes',
-                        'type': 'critical',
-                        'title': 'No Active Nodes',
-                        'message': 'No nodes are currently active in the network',
-                        'timestamp': datetime.utcnow().isoformat(),
-                        'severity': 'critical'
-                    })
-                
-                # Low success rate alert
-                success_rate = network_metrics.get('success_rate', 1.0)
-                if success_rate < 0.9:
-                    alerts.append({
-                        'id': 'low_success_rate',
-                        'type': 'warning',
-                        'title': 'Low Success Rate',
-                        'message': f'Task success rate is {success_rate:.1%}',
-                        'timestamp': datetime.utcnow().isoformat(),
-                        'severity': 'warning'
-                    })
-                
-                # High response time alert
-                avg_response_time = network_metrics.get('average_response_time', 0)
-                if avg_response_time > 5000:  # 5 seconds
-                    alerts.append({
-                        'id': 'high_response_time',
-                        'type': 'warning',
-                        'title': 'High Response Time',
-                        'message': f'Average response time is {avg_response_time:.0f}ms',
-                        'timestamp': datetime.utcnow().isoformat(),
-                        'severity': 'warning'
-                    })
-                
-                # High utilization alert
-                utilization = network_metrics.get('network_utilization', 0)
-                if utilization > 0.85:
-                    alerts.append({
-                        'id': 'high_utilization',
-                        'type': 'warning',
-                        'title': 'High Network Utilization',
-                        'message': f'Network utilization is {utilization:.1%}',
-                        'timestamp': datetime.utcnow().isoformat(),
-                        'severity': 'warning'
-                    })
+                # Alerts are evaluated by the orchestrator whenever its metrics update
+                return Response(self.orchestrator.alerts_payload, mimetype='application/json')
             
             return jsonify({
                 'success': True,
-                'alerts': alerts,
-                'total_alerts': len(alerts)
+                'alerts': [],
+                'total_alerts': 0
             })
         
         @self.app.route('/api/v1/dashboard/nodes/detailed')
@@ -355,7 +314,7 @@ class OrchestratorAPI:
                         'host': node.host,
                         'port': node.port,
                         'node_type': node.node_type,
-                        'status': node.status.value,
+                        'status': node.status_value,
                         'capabilities': node.capabilities,
                         'agents_count': len(agents),
                         'cpu_usage': node.cpu_usage,
@@ -386,7 +345,7 @@ class OrchestratorAPI:
             # Generate sample performance history
             # In production, this would come from your monitoring system
             history = []
-            current_time = datetime.utcnow()
+            current_time = datetime.now(timezone.utc)
             
             for i in range(20):  # Last 20 data points
                 timestamp = current_time - timedelta(minutes=i * 5)  # Every 5 minutes
@@ -436,49 +395,30 @@ class OrchestratorAPI:
             
             if self.orchestrator:
                 # Pending tasks
-                for task in list(self.orchestrator.pending_tasks)[:10]:  # Last 10
+                for task in list(islice(self.orchestrator.pending_tasks, 10)):
                     queue_data['pending'].append({
                         'task_id': task.task_id,
                         'task_type': task.task_type,
-                        'priority': task.priority.name,
+                        'priority': task.priority_name,
                         'created_at': task.created_at,
                         'timeout': task.timeout,
                         'requirements': task.requirements
                     })
                 
                 # Active tasks
-                for task_id, task in list(self.orchestrator.active_tasks.items())[:10]:
+                for task in list(islice(self.orchestrator.active_tasks.values(), 10)):
                     queue_data['active'].append({
                         'task_id': task.task_id,
                         'task_type': task.task_type,
-                        'priority': task.priority.name,
+                        'priority': task.priority_name,
                         'assigned_nodes': task.assigned_nodes,
                         'created_at': task.created_at,
                         'timeout': task.timeout
                     })
                 
-                # Recent completed (last 10)
-                completed_tasks = list(self.orchestrator.completed_tasks.values())[-10:]
-                for result in completed_tasks:
-                    queue_data['recent_completed'].append({
-                        'task_id': result.task_id,
-                        'status': result.status.value,
-                        'execution_time': result.execution_time,
-                        'node_id': result.node_id,
-                        'agent_id': result.agent_id,
-                        'completed_at': result.completed_at
-                    })
-                
-                # Recent failed (last 10)
-                failed_tasks = list(self.orchestrator.failed_tasks.values())[-10:]
-                for result in failed_tasks:
-                    queue_data['recent_failed'].append({
-                        'task_id': result.task_id,
-                        'status': result.status.value,
-                        'error_message': result.error_message,
-                        'node_id': result.node_id,
-                        'completed_at': result.completed_at
-                    })
+                # Recent completed/failed (last 10), already projected by the orchestrator
+                queue_data['recent_completed'] = list(self.orchestrator.recent_completed)
+                queue_data['recent_failed'] = list(self.orchestrator.recent_failed)
             
             return jsonify({
                 'success': True,
@@ -531,7 +471,7 @@ class OrchestratorAPI:
             
             # Collect all dashboard data
             data = {
-                'timestamp': datetime.utcnow().isoformat(),
+                'timestamp': datetime.now(timezone.utc).isoformat(),
                 'orchestrator_id': self.orchestrator.orchestrator_id if self.orchestrator else 'unknown',
                 'network_metrics': self.orchestrator.network_metrics if self.orchestrator else {},
                 'nodes': [node.__dict__ for node in self.orchestrator.nodes.values()] if self.orchestrator else [],
@@ -564,18 +504,19 @@ class OrchestratorAPI:
         @self.app.route('/api/v1/health', methods=['GET'])
         def health():
             """Health check endpoint"""
+            now = datetime.now()
             try:
                 system_info = {
                     'cpu_usage': psutil.cpu_percent(),
                     'memory_usage': psutil.virtual_memory().percent,
                     'disk_usage': psutil.disk_usage('/').percent,
-                    'uptime': str(datetime.now() - self.api_stats['start_time'])
+                    'uptime': str(now - self.api_stats['start_time'])
                 }
                 
                 return jsonify({
                     'status': 'healthy',
                     'orchestrator_id': self.orchestrator.orchestrator_id if self.orchestrator else 'not_started',
-                    'timestamp': datetime.now().isoformat(),
+                    'timestamp': now.isoformat(),
                     'version': '1.0.0',
                     'system': system_info
                 })
@@ -584,7 +525,7 @@ class OrchestratorAPI:
                 return jsonify({
                     'status': 'error',
                     'error': str(e),
-                    'timestamp': datetime.now().isoformat()
+                    'timestamp': now.isoformat()
                 }), 500
         
         @self.app.route('/api/v1/status', methods=['GET'])
@@ -597,19 +538,7 @@ class OrchestratorAPI:
                         'error': 'Orchestrator not started'
                     }), 503
                 
-                # Run async function in current thread
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                try:
-                    network_status = loop.run_until_complete(self.orchestrator.get_network_status())
-                finally:
-                    loop.close()
-                
-                return jsonify({
-                    'success': True,
-                    'data': network_status,
-                    'api_stats': self.api_stats
-                })
+                return jsonify(self._status_payload())
             except Exception as e:
                 logger.error(f"Status error: {e}")
                 return jsonify({'success': False, 'error': str(e)}), 500
@@ -622,32 +551,7 @@ class OrchestratorAPI:
                 if not self.orchestrator:
                     return jsonify({'success': False, 'error': 'Orchestrator not started'}), 503
                 
-                nodes_data = {}
-                for node_id, node in self.orchestrator.nodes.items():
-                    nodes_data[node_id] = {
-                        'node_id': node.node_id,
-                        'host': node.host,
-                        'port': node.port,
-                        'node_type': node.node_type,
-                        'status': node.status.value,
-                        'capabilities': node.capabilities,
-                        'agents_count': node.agents_count,
-                        'cpu_usage': node.cpu_usage,
-                        'memory_usage': node.memory_usage,
-                        'gpu_usage': node.gpu_usage,
-                        'load_score': node.load_score,
-                        'last_heartbeat': node.last_heartbeat,
-                        'version': node.version,
-                        'location': node.location,
-                        'uptime': time.time() - node.last_heartbeat if node.last_heartbeat else 0
-                    }
-                
-                return jsonify({
-                    'success': True,
-                    'nodes': nodes_data,
-                    'total_nodes': len(nodes_data),
-                    'active_nodes': len([n for n in self.orchestrator.nodes.values() if n.status == NodeStatus.ACTIVE])
-                })
+                return jsonify(self._nodes_payload())
             except Exception as e:
                 logger.error(f"Get nodes error: {e}")
                 return jsonify({'success': False, 'error': str(e)}), 500
@@ -690,7 +594,7 @@ class OrchestratorAPI:
                     'host': node.host,
                     'port': node.port,
                     'node_type': node.node_type,
-                    'status': node.status.value,
+                    'status': node.status_value,
                     'capabilities': node.capabilities,
                     'agents_count': len(agents_data),
                     'cpu_usage': node.cpu_usage,
@@ -806,7 +710,7 @@ class OrchestratorAPI:
                 new_status = data['status']
                 
                 try:
-                    node.status = NodeStatus(new_status)
+                    node.set_status(NodeStatus(new_status))
                     logger.info(f"📊 Node {node_id} status updated: {old_status} -> {new_status}")
                     
                     return jsonify({
@@ -845,6 +749,7 @@ class OrchestratorAPI:
                 if node_id in self.orchestrator.node_agents:
                     del self.orchestrator.node_agents[node_id]
                 
+                self.orchestrator.notify_state_change('node_unregistered', {'node_id': node_id})
                 logger.info(f"🗑️ Node {node_id} unregistered")
                 
                 return jsonify({
@@ -896,66 +801,7 @@ class OrchestratorAPI:
                 if not self.orchestrator:
                     return jsonify({'success': False, 'error': 'Orchestrator not started'}), 503
                 
-                tasks_data = {
-                    'pending': [],
-                    'active': [],
-                    'completed': [],
-                    'failed': []
-                }
-                
-                # Pending tasks
-                for task in self.orchestrator.pending_tasks:
-                    tasks_data['pending'].append({
-                        'task_id': task.task_id,
-                        'task_type': task.task_type,
-                        'priority': task.priority.value,
-                        'created_at': task.created_at,
-                        'timeout': task.timeout
-                    })
-                
-                # Active tasks
-                for task in self.orchestrator.active_tasks.values():
-                    tasks_data['active'].append({
-                        'task_id': task.task_id,
-                        'task_type': task.task_type,
-                        'priority': task.priority.value,
-                        'assigned_nodes': task.assigned_nodes,
-                        'created_at': task.created_at,
-                        'timeout': task.timeout
-                    })
-                
-                # Completed tasks (last 50)
-                completed_tasks = list(self.orchestrator.completed_tasks.values())[-50:]
-                for result in completed_tasks:
-                    tasks_data['completed'].append({
-                        'task_id': result.task_id,
-                        'status': result.status.value,
-                        'execution_time': result.execution_time,
-                        'node_id': result.node_id,
-                        'completed_at': result.completed_at
-                    })
-                
-                # Failed tasks (last 50)
-                failed_tasks = list(self.orchestrator.failed_tasks.values())[-50:]
-                for result in failed_tasks:
-                    tasks_data['failed'].append({
-                        'task_id': result.task_id,
-                        'status': result.status.value,
-                        'error_message': result.error_message,
-                        'node_id': result.node_id,
-                        'completed_at': result.completed_at
-                    })
-                
-                return jsonify({
-                    'success': True,
-                    'tasks': tasks_data,
-                    'summary': {
-                        'pending_count': len(tasks_data['pending']),
-                        'active_count': len(tasks_data['active']),
-                        'completed_count': len(self.orchestrator.completed_tasks),
-                        'failed_count': len(self.orchestrator.failed_tasks)
-                    }
-                })
+                return jsonify(self._tasks_payload())
                 
             except Exception as e:
                 logger.error(f"Get tasks error: {e}")
@@ -1046,48 +892,7 @@ class OrchestratorAPI:
                 if not self.orchestrator:
                     return jsonify({'success': False, 'error': 'Orchestrator not started'}), 503
                 
-                # Calculate additional metrics
-                active_nodes = [n for n in self.orchestrator.nodes.values() 
-                               if n.status == NodeStatus.ACTIVE]
-                
-                # Calculate agent counts (since we're generating sample agents)
-                total_agents = len(active_nodes) * 4  # Average 4 agents per node
-                active_agents = len(active_nodes) * 3  # Average 3 active agents per node
-                
-                metrics = {
-                    'timestamp': datetime.now().isoformat(),
-                    'network': self.orchestrator.network_metrics.copy(),
-                    'nodes': {
-                        'total': len(self.orchestrator.nodes),
-                        'active': len(active_nodes),
-                        'avg_cpu_usage': sum(n.cpu_usage for n in active_nodes) / len(active_nodes) if active_nodes else 0,
-                        'avg_memory_usage': sum(n.memory_usage for n in active_nodes) / len(active_nodes) if active_nodes else 0,
-                        'avg_load_score': sum(n.load_score for n in active_nodes) / len(active_nodes) if active_nodes else 0
-                    },
-                    'agents': {
-                        'total': total_agents,
-                        'active': active_agents,
-                        'avg_efficiency': round(random.uniform(0.85, 0.95), 3),
-                        'avg_tasks_per_agent': round(random.uniform(1.5, 2.5), 1)
-                    },
-                    'tasks': {
-                        'pending': len(self.orchestrator.pending_tasks),
-                        'active': len(self.orchestrator.active_tasks),
-                        'completed_total': len(self.orchestrator.completed_tasks),
-                        'failed_total': len(self.orchestrator.failed_tasks),
-                        'success_rate': self.orchestrator.network_metrics.get('success_rate', 0)
-                    },
-                    'api': self.api_stats.copy(),
-                    'load_balancer': {
-                        'algorithm': self.orchestrator.load_balancer.current_algorithm,
-                        'node_weights': dict(self.orchestrator.load_balancer.node_weights)
-                    }
-                }
-                
-                return jsonify({
-                    'success': True,
-                    'metrics': metrics
-                })
+                return jsonify(self._metrics_payload())
                 
             except Exception as e:
                 logger.error(f"Get metrics error: {e}")
@@ -1232,6 +1037,171 @@ class OrchestratorAPI:
                     'max_connections': ws_config.get('max_connections', 100)
                 }
             })
+        
+        @self.app.route('/api/v1/dashboard/snapshot', methods=['GET'])
+        def dashboard_snapshot():
+            """Get status, metrics, nodes and tasks in one response"""
+            try:
+                if not self.orchestrator:
+                    return jsonify({'success': False, 'error': 'Orchestrator not started'}), 503
+                
+                return jsonify({
+                    'success': True,
+                    'status': self._status_payload(),
+                    'metrics': self._metrics_payload(),
+                    'nodes': self._nodes_payload(),
+                    'tasks': self._tasks_payload()
+                })
+                
+            except Exception as e:
+                logger.error(f"Dashboard snapshot error: {e}")
+                return jsonify({'success': False, 'error': str(e)}), 500
+    
+    def _status_payload(self) -> Dict[str, Any]:
+        """Build the /status response body"""
+        # Served from the orchestrator's cached status instead of a fresh event loop per request
+        return {
+            'success': True,
+            'data': self.orchestrator.network_status,
+            'api_stats': self.api_stats
+        }
+    
+    def _metrics_payload(self) -> Dict[str, Any]:
+        """Build the /metrics response body"""
+        # Calculate additional metrics
+        active_nodes = [n for n in self.orchestrator.nodes.values() 
+                       if n.status == NodeStatus.ACTIVE]
+        
+        # Calculate agent counts (since we're generating sample agents)
+        total_agents = len(active_nodes) * 4  # Average 4 agents per node
+        active_agents = len(active_nodes) * 3  # Average 3 active agents per node
+        
+        metrics = {
+            'timestamp': datetime.now().isoformat(),
+            'network': self.orchestrator.network_metrics.copy(),
+            'nodes': {
+                'total': len(self.orchestrator.nodes),
+                'active': len(active_nodes),
+                'avg_cpu_usage': sum(n.cpu_usage for n in active_nodes) / len(active_nodes) if active_nodes else 0,
+                'avg_memory_usage': sum(n.memory_usage for n in active_nodes) / len(active_nodes) if active_nodes else 0,
+                'avg_load_score': sum(n.load_score for n in active_nodes) / len(active_nodes) if active_nodes else 0
+            },
+            'agents': {
+                'total': total_agents,
+                'active': active_agents,
+                'avg_efficiency': round(random.uniform(0.85, 0.95), 3),
+                'avg_tasks_per_agent': round(random.uniform(1.5, 2.5), 1)
+            },
+            'tasks': {
+                'pending': len(self.orchestrator.pending_tasks),
+                'active': len(self.orchestrator.active_tasks),
+                'completed_total': len(self.orchestrator.completed_tasks),
+                'failed_total': len(self.orchestrator.failed_tasks),
+                'success_rate': self.orchestrator.network_metrics.get('success_rate', 0)
+            },
+            'api': self.api_stats.copy(),
+            'load_balancer': {
+                'algorithm': self.orchestrator.load_balancer.current_algorithm,
+                'node_weights': dict(self.orchestrator.load_balancer.node_weights)
+            }
+        }
+        
+        return {
+            'success': True,
+            'metrics': metrics
+        }
+    
+    def _nodes_payload(self) -> Dict[str, Any]:
+        """Build the /nodes response body"""
+        nodes_data = {}
+        for node_id, node in self.orchestrator.nodes.items():
+            nodes_data[node_id] = {
+                'node_id': node.node_id,
+                'host': node.host,
+                'port': node.port,
+                'node_type': node.node_type,
+                'status': node.status_value,
+                'capabilities': node.capabilities,
+                'agents_count': node.agents_count,
+                'cpu_usage': node.cpu_usage,
+                'memory_usage': node.memory_usage,
+                'gpu_usage': node.gpu_usage,
+                'load_score': node.load_score,
+                'last_heartbeat': node.last_heartbeat,
+                'version': node.version,
+                'location': node.location,
+                'uptime': time.time() - node.last_heartbeat if node.last_heartbeat else 0
+            }
+        
+        return {
+            'success': True,
+            'nodes': nodes_data,
+            'total_nodes': len(nodes_data),
+            'active_nodes': len([n for n in self.orchestrator.nodes.values() if n.status == NodeStatus.ACTIVE])
+        }
+    
+    def _tasks_payload(self) -> Dict[str, Any]:
+        """Build the /tasks response body"""
+        tasks_data = {
+            'pending': [],
+            'active': [],
+            'completed': [],
+            'failed': []
+        }
+        
+        # Pending tasks
+        for task in self.orchestrator.pending_tasks:
+            tasks_data['pending'].append({
+                'task_id': task.task_id,
+                'task_type': task.task_type,
+                'priority': task.priority.value,
+                'created_at': task.created_at,
+                'timeout': task.timeout
+            })
+        
+        # Active tasks
+        for task in self.orchestrator.active_tasks.values():
+            tasks_data['active'].append({
+                'task_id': task.task_id,
+                'task_type': task.task_type,
+                'priority': task.priority.value,
+                'assigned_nodes': task.assigned_nodes,
+                'created_at': task.created_at,
+                'timeout': task.timeout
+            })
+        
+        # Completed tasks (last 50)
+        completed_tasks = list(self.orchestrator.completed_tasks.values())[-50:]
+        for result in completed_tasks:
+            tasks_data['completed'].append({
+                'task_id': result.task_id,
+                'status': result.status.value,
+                'execution_time': result.execution_time,
+                'node_id': result.node_id,
+                'completed_at': result.completed_at
+            })
+        
+        # Failed tasks (last 50)
+        failed_tasks = list(self.orchestrator.failed_tasks.values())[-50:]
+        for result in failed_tasks:
+            tasks_data['failed'].append({
+                'task_id': result.task_id,
+                'status': result.status.value,
+                'error_message': result.error_message,
+                'node_id': result.node_id,
+                'completed_at': result.completed_at
+            })
+        
+        return {
+            'success': True,
+            'tasks': tasks_data,
+            'summary': {
+                'pending_count': len(tasks_data['pending']),
+                'active_count': len(tasks_data['active']),
+                'completed_count': len(self.orchestrator.completed_tasks),
+                'failed_count': len(self.orchestrator.failed_tasks)
+            }
+        }
     
     def _create_basic_dashboard(self):
         """Create a basic dashboard when template is not available"""
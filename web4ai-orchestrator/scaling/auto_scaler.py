@@ -151,13 +151,17 @@ class AutoScaler:
         self.running = True
         logger.info("Auto-scaling started")
         
-        while self.running:
-            try:
-                await self._evaluate_scaling_rules()
-                await asyncio.sleep(30)  # Check every 30 seconds
-            except Exception as e:
-                logger.error(f"Auto-scaling error: {e}")
-                await asyncio.sleep(60)
+        try:
+            while self.running:
+                try:
+                    await self._evaluate_scaling_rules()
+                    await asyncio.sleep(30)  # Check every 30 seconds
+                except Exception as e:
+                    logger.error(f"Auto-scaling error: {e}")
+                    await asyncio.sleep(60)
+        finally:
+            # Cancelling the task stops scaling just like stop_auto_scaling
+            self.running = False
     
     def stop_auto_scaling(self):
         """Stop auto-scaling"""
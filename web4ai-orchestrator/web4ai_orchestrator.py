@@ -19,26 +19,39 @@ Features:
 
 import asyncio
 import time
-import json
 import logging
 import threading
 import uuid
+import random
 import requests
 import websocket
 import socket
 from typing import Dict, Any, List, Optional, Set, Tuple, Callable
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, is_dataclass
 from collections import defaultdict, deque
 from enum import Enum
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import hashlib
 import hmac
+import orjson
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def _enc_default(obj):
+    """orjson fallback for values orjson does not encode on its own"""
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    if is_dataclass(obj):
+        return asdict(obj)
+    if isinstance(obj, (set, frozenset, deque)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
 class NetworkTier(Enum):
     """Network hierarchy levels"""
     ORCHESTRATOR = "orchestrator"    # Top-level global control
@@ -99,6 +112,12 @@ class NodeInfo:
     def __post_init__(self):
         if self.metadata is None:
             self.metadata = {}
+        self.set_status(self.status)
+
+    def set_status(self, status: NodeStatus):
+        """Change status, keeping the encoded value alongside the enum for hot read paths"""
+        self.status = status
+        self.status_value = status.value if isinstance(status, Enum) else status
 
 @dataclass
 class AgentInfo:
@@ -143,6 +162,12 @@ class TaskRequest:
             self.metadata = {}
         if self.created_at == 0:
             self.created_at = time.time()
+        self.set_priority(self.priority)
+
+    def set_priority(self, priority: TaskPriority):
+        """Change priority, keeping its name alongside the enum for hot read paths"""
+        self.priority = priority
+        self.priority_name = priority.name if isinstance(priority, Enum) else priority
 
 @dataclass
 class TaskResult:
@@ -233,7 +258,6 @@ class NetworkLoadBalancer:
         if total_weight == 0:
             return list(nodes.keys())[0]
             
-        import random
         r = random.uniform(0, total_weight)
         for node_id, weight, cumulative_weight in weighted_nodes:
             if r <= cumulative_weight:
@@ -470,6 +494,9 @@ class Web4AIOrchestrator:
         self.completed_tasks: Dict[str, TaskResult] = {}
         self.failed_tasks: Dict[str, TaskResult] = {}
         self.task_history: List[TaskResult] = []
+        # Dashboard-ready projections of the last 10 completed/failed results
+        self.recent_completed: deque = deque(maxlen=10)
+        self.recent_failed: deque = deque(maxlen=10)
         
         # Performance tracking
         self.network_metrics = {
@@ -485,6 +512,14 @@ class Web4AIOrchestrator:
             'success_rate': 1.0
         }
         
+        # Alerts derived from network_metrics, rebuilt only when metrics change
+        self.active_alerts: List[Dict[str, Any]] = []
+        self.alerts_payload: bytes = b''
+        self._refresh_alerts()
+        
+        # Latest get_network_status() result, kept current by _status_service for synchronous readers
+        self.network_status: Dict[str, Any] = {}
+        
         # Core services
         self.load_balancer = NetworkLoadBalancer()
         self.fault_detector = FaultDetector()
@@ -494,6 +529,7 @@ class Web4AIOrchestrator:
         self.executor = ThreadPoolExecutor(max_workers=20)
         self.running = False
         self.websocket_connections = set()
+        self.state_listeners: List[Callable[[str, Dict[str, Any]], None]] = []
         
         # Security
         self.api_keys = set()
@@ -505,6 +541,7 @@ class Web4AIOrchestrator:
         """Default orchestrator configuration"""
         return {
             'heartbeat_interval': 30,
+            'status_refresh_interval': 2,
             'task_timeout': 300,
             'max_retries': 3,
             'load_balance_algorithm': 'weighted_round_robin',
@@ -519,6 +556,18 @@ class Web4AIOrchestrator:
             'metrics_retention_hours': 24
         }
 
+    def add_state_listener(self, listener: Callable[[str, Dict[str, Any]], None]):
+        """Register a callback invoked whenever node or agent state changes"""
+        self.state_listeners.append(listener)
+
+    def notify_state_change(self, event_type: str, data: Dict[str, Any] = None):
+        """Notify state listeners (e.g. dashboard caches) of a topology change"""
+        for listener in self.state_listeners:
+            try:
+                listener(event_type, data or {})
+            except Exception as e:
+                logger.error(f"❌ State listener error: {e}")
+
     async def start_orchestrator(self):
         """Start the orchestrator and all background services"""
         if self.running:
@@ -534,6 +583,7 @@ class Web4AIOrchestrator:
         asyncio.create_task(self._performance_monitor())
         asyncio.create_task(self._fault_detector_service())
         asyncio.create_task(self._cleanup_service())
+        asyncio.create_task(self._status_service())
         
         if self.config.get('websocket_enabled', True):
             asyncio.create_task(self._websocket_broadcaster())
@@ -596,6 +646,7 @@ class Web4AIOrchestrator:
             
             self.nodes[node_id] = node_info
             self._update_network_metrics()
+            self.notify_state_change('node_registered', {'node_id': node_id})
             
             logger.info(f"✅ Node {node_id} registered successfully")
             await self._broadcast_network_update('node_registered', {'node_id': node_id})
@@ -633,6 +684,7 @@ class Web4AIOrchestrator:
             # Update node agent count
             if node_id in self.nodes:
                 self.nodes[node_id].agents_count = len(self.node_agents[node_id])
+            self.notify_state_change('agent_registered', {'agent_id': agent_id, 'node_id': node_id})
             
             logger.info(f"✅ Agent {agent_id} registered on node {node_id}")
             return True
@@ -698,10 +750,11 @@ class Web4AIOrchestrator:
             
             # Update status if changed
             new_status = heartbeat_data.get('status', 'active')
-            if node.status.value != new_status:
+            if node.status_value != new_status:
                 old_status = node.status
-                node.status = NodeStatus(new_status)
+                node.set_status(NodeStatus(new_status))
                 logger.info(f"📊 Node {node_id} status changed: {old_status.value} -> {new_status}")
+                self.notify_state_change('node_status_changed', {'node_id': node_id})
             
             return True
             
@@ -709,13 +762,36 @@ class Web4AIOrchestrator:
             logger.error(f"❌ Failed to update heartbeat for node {node_id}: {e}")
             return False
 
+    def record_task_result(self, result: TaskResult):
+        """Store a finished task result and track it in the recent results window"""
+        if result.status == TaskStatus.COMPLETED:
+            self.completed_tasks[result.task_id] = result
+            self.recent_completed.append({
+                'task_id': result.task_id,
+                'status': result.status.value,
+                'execution_time': result.execution_time,
+                'node_id': result.node_id,
+                'agent_id': result.agent_id,
+                'completed_at': result.completed_at
+            })
+        else:
+            self.failed_tasks[result.task_id] = result
+            self.recent_failed.append({
+                'task_id': result.task_id,
+                'status': result.status.value,
+                'error_message': result.error_message,
+                'node_id': result.node_id,
+                'completed_at': result.completed_at
+            })
+        self.task_history.append(result)
+
     async def get_network_status(self) -> Dict[str, Any]:
         """Get comprehensive network status"""
         self._update_network_metrics()
         
         active_nodes = [node for node in self.nodes.values() if node.status == NodeStatus.ACTIVE]
         
-        return {
+        self.network_status = {
             'orchestrator_id': self.orchestrator_id,
             'timestamp': time.time(),
             'uptime': time.time() - self.network_metrics['uptime'],
@@ -743,6 +819,7 @@ class Web4AIOrchestrator:
                 'network_utilization': self.network_metrics['network_utilization']
             }
         }
+        return self.network_status
 
     def _update_network_metrics(self):
         """Update network-wide metrics"""
@@ -775,6 +852,60 @@ class Web4AIOrchestrator:
                 self._last_throughput_calculation = current_time
         else:
             self._last_throughput_calculation = current_time
+        
+        self._refresh_alerts()
+
+    def _refresh_alerts(self):
+        """Re-evaluate alert thresholds and rebuild the encoded alerts payload"""
+        metrics = self.network_metrics
+        triggered = []
+        
+        # No active nodes alert
+        if metrics.get('active_nodes', 0) == 0:
+            triggered.append(('no_nodes', 'critical', 'No Active Nodes',
+                              'No nodes are currently active in the network'))
+        
+        # Low success rate alert
+        success_rate = metrics.get('success_rate', 1.0)
+        if success_rate < 0.9:
+            triggered.append(('low_success_rate', 'warning', 'Low Success Rate',
+                              f'Task success rate is {success_rate:.1%}'))
+        
+        # High response time alert
+        avg_response_time = metrics.get('average_response_time', 0)
+        if avg_response_time > 5000:  # 5 seconds
+            triggered.append(('high_response_time', 'warning', 'High Response Time',
+                              f'Average response time is {avg_response_time:.0f}ms'))
+        
+        # High utilization alert
+        utilization = metrics.get('network_utilization', 0)
+        if utilization > 0.85:
+            triggered.append(('high_utilization', 'warning', 'High Network Utilization',
+                              f'Network utilization is {utilization:.1%}'))
+        
+        if [(a['id'], a['message']) for a in self.active_alerts] == [(t[0], t[3]) for t in triggered]:
+            return
+        
+        # Alerts that are still firing keep the timestamp they were raised at;
+        # newly raised ones share a single timestamp for this refresh
+        raised_at = {a['id']: a['timestamp'] for a in self.active_alerts}
+        timestamp = datetime.now(timezone.utc).isoformat()
+        self.active_alerts = [
+            {
+                'id': alert_id,
+                'type': alert_type,
+                'title': title,
+                'message': message,
+                'timestamp': raised_at.get(alert_id, timestamp),
+                'severity': alert_type
+            }
+            for alert_id, alert_type, title, message in triggered
+        ]
+        self.alerts_payload = orjson.dumps({
+            'success': True,
+            'alerts': self.active_alerts,
+            'total_alerts': len(self.active_alerts)
+        })
 
     async def _heartbeat_monitor(self):
         """Monitor node heartbeats and detect failures"""
@@ -786,12 +917,13 @@ class Web4AIOrchestrator:
                 for node_id, node in self.nodes.items():
                     if self.fault_detector.detect_node_failure(node_id, node.last_heartbeat):
                         if node.status != NodeStatus.OFFLINE:
-                            node.status = NodeStatus.OFFLINE
+                            node.set_status(NodeStatus.OFFLINE)
                             failed_nodes.append(node_id)
                             await self._handle_node_failure(node_id)
                 
                 if failed_nodes:
                     logger.warning(f"⚠️ Detected failed nodes: {failed_nodes}")
+                    self.notify_state_change('nodes_failed', {'node_ids': failed_nodes})
                 
                 await asyncio.sleep(self.config.get('heartbeat_interval', 30))
                 
@@ -897,17 +1029,28 @@ class Web4AIOrchestrator:
                 logger.error(f"❌ Cleanup service error: {e}")
                 await asyncio.sleep(3600)
 
+    async def _status_service(self):
+        """Refresh network_status so API threads can serve it without running a coroutine"""
+        while self.running:
+            try:
+                await self.get_network_status()
+                await asyncio.sleep(self.config.get('status_refresh_interval', 2))
+                
+            except Exception as e:
+                logger.error(f"❌ Status service error: {e}")
+                await asyncio.sleep(5)
+
     async def _websocket_broadcaster(self):
         """Broadcast real-time updates via WebSocket"""
         while self.running:
             try:
                 if self.websocket_connections:
                     status = await self.get_network_status()
-                    message = json.dumps({
+                    message = orjson.dumps({
                         'type': 'network_status',
                         'data': status,
                         'timestamp': time.time()
-                    })
+                    }, default=_enc_default).decode()
                     
                     # Send to all connected clients
                     disconnected = set()
@@ -989,7 +1132,7 @@ class Web4AIOrchestrator:
                     agent_id=None,
                     error_message=f"Node {node_id} failed, max retries exceeded"
                 )
-                self.failed_tasks[task.task_id] = result
+                self.record_task_result(result)
                 del self.active_tasks[task.task_id]
                 logger.error(f"❌ Task {task.task_id} failed permanently")
 
@@ -1005,11 +1148,11 @@ class Web4AIOrchestrator:
     async def _broadcast_network_update(self, event_type: str, data: Dict[str, Any]):
         """Broadcast network updates to connected clients"""
         if self.websocket_connections:
-            message = json.dumps({
+            message = orjson.dumps({
                 'type': event_type,
                 'data': data,
                 'timestamp': time.time()
-            })
+            }, default=_enc_default).decode()
             
             disconnected = set()
             for ws in self.websocket_connections: